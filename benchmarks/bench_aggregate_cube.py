@@ -0,0 +1,84 @@
+"""Benchmark slices of `AggregateCube` against computing them from the raw transactions.
+
+Usage:
+    python benchmarks/bench_aggregate_cube.py [--rows 1000000] [--years 10]
+"""
+
+import argparse
+from pathlib import Path
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from budgething.pipeline.models import Currency
+from budgething.pipeline.process.aggregate_cube import AggregateCube, Period, Sign
+from budgething.pipeline.transform.currency import convert_currency, load_rates
+
+
+def raw_monthly_spending(data: pd.DataFrame) -> pd.DataFrame:
+    """Monthly spending per category, computed from the transactions on every call."""
+    converted = convert_currency(data, Currency.PLN)
+    expenses = converted[converted["amount"] < 0]
+    months = expenses["date"].dt.to_period("M").dt.start_time.rename("date")
+    return expenses.groupby([months, "category"])["amount"].agg(["sum", "count"])
+
+
+def make_transactions(rows: int, years: int) -> pd.DataFrame:
+    """Transactions of a few accounts in three currencies, at random times."""
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2010-01-01").value
+    span = pd.Timedelta(days=365 * years).value
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(np.sort(rng.integers(start, start + span, rows))),
+            "amount": rng.uniform(-200, 100, rows).round(2),
+            "currency": rng.choice(["PLN", "GBP", "EUR"], rows),
+            "account": rng.choice(["pekao24", "revolut", "savings"], rows),
+            "category": rng.choice([f"category_{i}" for i in range(20)], rows),
+            "payment_type": rng.choice(["card", "transfer", "cash"], rows),
+        }
+    )
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32}{elapsed:>8.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    data = make_transactions(args.rows, args.years)
+    new = make_transactions(1_000, 1).assign(date=lambda df: df["date"] + pd.DateOffset(years=9))
+    load_rates()
+    print(f"{args.rows} transactions, {args.years} years")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cube = AggregateCube(Path(directory), Currency.PLN)
+        timed("rebuild", lambda: cube.rebuild(data))
+        timed("update (1000 rows)", lambda: cube.update(new))
+        cube = AggregateCube(Path(directory), Currency.PLN)
+        timed("first query (load)", lambda: cube.query(Period.DAY))
+
+        baseline = timed("raw monthly spending", lambda: raw_monthly_spending(data))
+        elapsed = timed(
+            "cube monthly spending",
+            lambda: cube.query(Period.MONTH, by=["category"], sign=Sign.EXPENSE),
+        )
+        print(f"{'':<32}speedup x{baseline / elapsed:.2f}")
+        timed(
+            "cube weekly slice",
+            lambda: cube.query(Period.WEEK, by=["sign"], account="revolut", start="2015-01-01"),
+        )
+
+
+if __name__ == "__main__":
+    main()
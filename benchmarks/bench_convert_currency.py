@@ -0,0 +1,63 @@
+"""Benchmark `convert_currency` against the `CurrencyConverter` + `df.apply` it replaced.
+
+Usage:
+    python benchmarks/bench_convert_currency.py [--rows 100000]
+"""
+
+import argparse
+import time
+
+from currency_converter import CurrencyConverter  # type: ignore[import-untyped]
+import numpy as np
+import pandas as pd
+
+from budgething.pipeline.models import Currency
+from budgething.pipeline.transform.currency import convert_currency, convert_to_all, load_rates
+
+
+def row_by_row(df: pd.DataFrame, target_currency: Currency) -> pd.Series:
+    """The previous `convert_currency`, without mutating `df`."""
+    c = CurrencyConverter(fallback_on_missing_rate=True)
+    return df.apply(
+        lambda row: c.convert(row["amount"], row["currency"], target_currency, row["date"].date()),
+        axis=1,
+    )
+
+
+def make_transactions(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "date": pd.Timestamp("2020-01-01")
+            + pd.to_timedelta(rng.integers(0, 1500 * 86400, rows), "s"),
+            "amount": rng.uniform(-500, 500, rows).round(2),
+            "currency": rng.choice([currency.value for currency in Currency], rows),
+        }
+    )
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24}{elapsed:>8.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df = make_transactions(args.rows)
+    print(f"{args.rows} rows")
+
+    baseline = timed("apply + converter", lambda: row_by_row(df, Currency.PLN))
+    elapsed = timed("convert_currency", lambda: convert_currency(df, Currency.PLN))
+    print(f"{'':<24}speedup x{baseline / elapsed:.2f}")
+    timed("  (rates cached)", lambda: convert_currency(df, Currency.PLN, rates=load_rates()))
+    timed("convert_to_all", lambda: convert_to_all(df))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark `CSVDataReader.get_all` serially and with process/thread pools.
+
+Usage:
+    python benchmarks/bench_csv_get_all.py [--files 200] [--rows 5000] [--workers 2 4 8]
+
+Pools larger than the number of CPUs are still timed, to show their overhead.
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+from pathlib import Path
+import random
+import tempfile
+import time
+
+from budgething.data_io.csv_data_reader import CSVDataReader
+
+HEADER = (
+    "Type, Product, Started Date, Completed Date, Description, Amount, Fee, Currency, State, "
+    "Balance"
+)
+
+
+def write_statements(target: Path, files: int, rows: int) -> None:
+    rng = random.Random(0)
+    for i in range(files):
+        lines = [HEADER]
+        for j in range(rows):
+            amount = rng.uniform(-200, 200)
+            lines.append(
+                f"CARD_PAYMENT, Current, 2024-{i % 12 + 1:02d}-{j % 28 + 1:02d} 12:00:00, "
+                f"2024-{i % 12 + 1:02d}-{j % 28 + 1:02d} 13:00:00, Shop {j % 50}, "
+                f"{amount:.2f}, 0.00, GBP, COMPLETED, {1000 + amount:.2f}"
+            )
+        (target / f"statement_{i:04d}.csv").write_text("\n".join(lines), encoding="utf-8")
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    rows = len(func())
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24}{elapsed:>8.3f}s  ({rows} rows)")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp)
+        write_statements(target, args.files, args.rows)
+        reader = CSVDataReader(target, schema=None, skip_hashes=set())
+        print(f"{args.files} files x {args.rows} rows, {os.cpu_count()} CPUs")
+
+        baseline = timed("serial", lambda: reader.get_all(add_meta=True, strip=True))
+        for workers in args.workers:
+            elapsed = timed(
+                f"processes={workers}",
+                lambda: reader.get_all(add_meta=True, strip=True, workers=workers),
+            )
+            print(f"{'':<24}speedup x{baseline / elapsed:.2f}")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                elapsed = timed(
+                    f"threads={workers}",
+                    lambda: reader.get_all(add_meta=True, strip=True, executor=executor),
+                )
+            print(f"{'':<24}speedup x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
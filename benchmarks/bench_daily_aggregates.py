@@ -0,0 +1,88 @@
+"""Benchmark the daily aggregates of `pipeline.transform` against their `datetime.date` versions.
+
+Usage:
+    python benchmarks/bench_daily_aggregates.py [--rows 1000000] [--years 10]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from budgething.pipeline.transform.amount import aggregate_daily_net_amounts
+from budgething.pipeline.transform.balance import extract_eod_balance, reconstruct_eod_balance
+
+
+def object_daily_net_amounts(data: pd.DataFrame) -> pd.DataFrame:
+    """The previous `aggregate_daily_net_amounts`, grouping by `datetime.date` objects."""
+    data = data[["date", "amount"]].copy()
+    data["date"] = data["date"].dt.date
+    return data.groupby("date").sum().rename(columns={"amount": "daily_net_amount"})
+
+
+def object_eod_balance(data: pd.DataFrame) -> pd.Series:
+    """The previous `extract_eod_balance`, grouping by `datetime.date` objects."""
+    data = data[["date", "balance"]].copy()
+    data["date"] = data["date"].dt.date
+    return (
+        data.sort_values("date")
+        .groupby("date")
+        .tail(1)
+        .set_index("date")["balance"]
+        .rename("eod_balance")
+    )
+
+
+def object_reconstruct(data: pd.DataFrame, latest_balance: float) -> pd.Series:
+    """The previous `reconstruct_eod_balance`, indexing by `datetime.date` objects."""
+    data = data.reset_index()
+    data["date"] = pd.to_datetime(data["date"])
+    data = data[["date", "daily_net_amount"]].copy()
+    data["date"] = data["date"].dt.date
+    data = data.set_index("date", verify_integrity=True).sort_index(ascending=False)
+    reverse_cumsum = data["daily_net_amount"].cumsum().shift(fill_value=0)
+    return (latest_balance - reverse_cumsum).iloc[::-1].rename("eod_balance")
+
+
+def make_transactions(rows: int, years: int) -> pd.DataFrame:
+    """Transactions at random times, with the balance after each."""
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2015-01-01").value
+    span = pd.Timedelta(days=365 * years).value
+    dates = pd.to_datetime(np.sort(rng.integers(start, start + span, rows)))
+    amounts = rng.uniform(-100, 100, rows).round(2)
+    return pd.DataFrame({"date": dates, "amount": amounts, "balance": amounts.cumsum()})
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32}{elapsed:>8.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    data = make_transactions(args.rows, args.years)
+    print(f"{args.rows} transactions, {args.years} years")
+
+    baseline = timed("daily net amount (date)", lambda: object_daily_net_amounts(data))
+    baseline += timed("eod balance (date)", lambda: object_eod_balance(data))
+    daily = object_daily_net_amounts(data)
+    baseline += timed("reconstruct (date)", lambda: object_reconstruct(daily, 0.0))
+
+    elapsed = timed("daily net amount (datetime64)", lambda: aggregate_daily_net_amounts(data))
+    elapsed += timed("eod balance (datetime64)", lambda: extract_eod_balance(data))
+    daily = aggregate_daily_net_amounts(data)
+    elapsed += timed("reconstruct (datetime64)", lambda: reconstruct_eod_balance(daily, 0.0))
+    print(f"{'':<32}speedup x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
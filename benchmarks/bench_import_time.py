@@ -0,0 +1,74 @@
+"""Measure the cold import time of the CLI and fail if it exceeds a budget.
+
+Every run imports `budgething.runner` in a fresh interpreter, so nothing is cached in
+`sys.modules`. Exits with status 1 if the median import time is over `--budget` seconds, and
+lists the modules that took longest to import (`python -X importtime`) to show what regressed.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5] [--budget 1.0] [--module budgething.runner]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+IMPORT_TIME_BUDGET = 1.0
+"""Seconds a cold `import budgething.runner` may take, pandas and pyarrow included."""
+
+_MEASURE = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+
+def import_time(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", _MEASURE.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.splitlines()[-1])
+
+
+def slowest_imports(module: str, count: int) -> list[tuple[int, str]]:
+    """Cumulative time in microseconds of the `count` slowest imports made by `module` itself."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    # Lines look like "import time: <self> | <cumulative> | <indent><name>", the indent growing
+    # by two spaces per level of nesting
+    for line in result.stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        if len(name) - len(name.lstrip()) == 3:
+            times.append((int(cumulative), name.strip()))
+    return sorted(times, reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=IMPORT_TIME_BUDGET)
+    parser.add_argument("--module", default="budgething.runner")
+    args = parser.parse_args()
+
+    times = [import_time(args.module) for _ in range(args.runs)]
+    median = statistics.median(times)
+    print(f"import {args.module}: median {median:.3f}s over {args.runs} run(s)")
+    print(f"budget {args.budget:.3f}s")
+    for cumulative, name in slowest_imports(args.module, 10):
+        print(f"  {name:<36}{cumulative / 1e6:>8.3f}s")
+    if median > args.budget:
+        print(f"Import time over budget by {median - args.budget:.3f}s", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark `parse_amounts` against the chained `str.replace` + `astype(float)` it replaced.
+
+Usage:
+    python benchmarks/bench_parse_amounts.py [--rows 1000000] [--distinct 50000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from budgething.pipeline.parsers.helpers import AmountFormat, parse_amounts
+
+
+def chained_replace(sr: pd.Series) -> pd.Series:
+    """The previous `asfloat` helper."""
+    return sr.str.replace(",", ".").str.replace(" ", "").astype(float)
+
+
+def make_amounts(rows: int, distinct: int) -> pd.Series:
+    rng = np.random.default_rng(0)
+    values = rng.uniform(-5000, 5000, distinct).round(2)
+    text = pd.Series([f"{value:,.2f}".replace(",", " ").replace(".", ",") for value in values])
+    return text.sample(rows, replace=True, random_state=0).reset_index(drop=True)
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24}{elapsed:>8.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=50_000)
+    args = parser.parse_args()
+
+    amounts = make_amounts(args.rows, args.distinct)
+    fmt = AmountFormat(decimal=",")
+    print(f"{args.rows} rows, {args.distinct} distinct amounts")
+    assert np.allclose(chained_replace(amounts), parse_amounts(amounts, fmt))
+
+    baseline = timed("str.replace + astype", lambda: chained_replace(amounts))
+    elapsed = timed("parse_amounts", lambda: parse_amounts(amounts, fmt))
+    print(f"{'':<24}speedup x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
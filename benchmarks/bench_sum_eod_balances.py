@@ -0,0 +1,58 @@
+"""Benchmark `sum_eod_balances` against the `pd.concat(axis=1)` implementation it replaced.
+
+Usage:
+    python benchmarks/bench_sum_eod_balances.py [--accounts 40] [--years 30]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from budgething.pipeline.process.eod_balance import sum_eod_balances
+
+
+def concat_sum(data: list[pd.DataFrame]) -> pd.Series:
+    """The previous `sum_eod_balances`, without the unused date skeleton."""
+    total = pd.concat(data, axis=1)
+    return total.filter(like="eod_balance").sum(axis=1).rename("eod_balance")
+
+
+def make_balances(accounts: int, years: int) -> list[pd.DataFrame]:
+    """End of day balances of accounts opened at random times, on random days only."""
+    rng = np.random.default_rng(0)
+    days = pd.date_range(end="2025-01-01", periods=365 * years, freq="D", name="date")
+    balances = []
+    for _ in range(accounts):
+        opened = rng.integers(0, len(days) // 2)
+        active = np.sort(rng.choice(np.arange(opened, len(days)), len(days) // 3, replace=False))
+        values = rng.uniform(-100, 100, len(active)).cumsum().round(2)
+        balances.append(pd.DataFrame({"eod_balance": values}, index=days[active]))
+    return balances
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24}{elapsed:>8.3f}s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, default=40)
+    parser.add_argument("--years", type=int, default=30)
+    args = parser.parse_args()
+
+    balances = make_balances(args.accounts, args.years)
+    print(f"{args.accounts} accounts, {args.years} years")
+
+    baseline = timed("pd.concat + sum", lambda: concat_sum(balances))
+    elapsed = timed("BalanceMatrix", lambda: sum_eod_balances(balances))
+    print(f"{'':<24}speedup x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,21 @@
 from pathlib import Path
 
 DATA_PATH = Path(__file__).resolve().parent.parent.parent / "data"
+MANIFEST_PATH = DATA_PATH / "manifest.json"
+STORE_PATH = DATA_PATH / "store"
+FINGERPRINTS_PATH = DATA_PATH / "fingerprints.npy"
+SNAPSHOT_PATH = DATA_PATH / "snapshots"
+PDF_CACHE_PATH = DATA_PATH / "pdf_cache"
+JSON_PATH = DATA_PATH / "json"
+RATES_CACHE_PATH = DATA_PATH / "rates.npz"
 
 DEBUG = True
+
+# Carry amounts and balances as exact Int64 minor units (grosze, pence, cents) instead of float64.
+# Stored data keeps the unit it was ingested with, so re-ingest into a new store after switching.
+MINOR_UNITS = False
+
+# Balance at the end of the day of the most recent transaction stored when an account is first
+# seen, for accounts whose statements report no balance (in minor units with MINOR_UNITS). Their
+# end of day balance is rebuilt from it once, then kept up to date with new transactions.
+LATEST_BALANCES: dict[str, float | int] = {"pekao24": 4158.68}
@@ -1,11 +1,21 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
 import csv
 from enum import Enum
+from functools import partial
+import mmap
+import multiprocessing
+import os
 from pathlib import Path
 import hashlib
-from typing import NamedTuple
+from typing import Any, Iterable, Literal, Mapping, NamedTuple
 
 import pandas as pd
 
+from budgething.data_io.manifest import FileKey, FileManifest, ManifestEntry
+
+
+CSVEngine = Literal["c", "pyarrow"]
+
 
 class UnknownDelimiterError(Exception):
     """Raised when the CSV dialect cannot be determined."""
@@ -34,27 +44,72 @@ class MetaColName(Enum):
         return cls.SOURCE.value, cls.LINENO.value
 
 
+class ReadSpec(NamedTuple):
+    """Columns a consumer needs from a CSV file, plus optional dtypes for some of them.
+
+    Column names are given stripped of whitespace, as they appear in `CSVFile.schema`.
+    """
+
+    usecols: frozenset[str]
+    dtype: Mapping[str, Any] | None = None
+
+
+class CSVReadResult(NamedTuple):
+    """Everything `CSVFile.load` learns about a file in a single pass.
+
+    `dialect` is None when the delimiter was already known, as the file is then not sniffed.
+    """
+
+    sha256: str
+    dialect: type[csv.Dialect] | None
+    data: pd.DataFrame
+
+
 class CSVFile:
+    HASH_CHUNK_SIZE = 1 << 20
+
     def __init__(self, filepath: Path, delimiter: str | None = None, encoding: str = "utf-8"):
         if filepath.suffix.lower() != ".csv":
             raise ValueError(f"Expected a CSV file, got: {filepath}")
         self.filepath = filepath
         self._delimiter = delimiter
         self.encoding = encoding
+        self._sha256: str | None = None
+        self._header: tuple[str, ...] | None = None
+
+    @classmethod
+    def from_manifest_entry(cls, filepath: Path, entry: ManifestEntry) -> "CSVFile":
+        """Create a `CSVFile` with its hash, delimiter and header already known."""
+        csv_file = cls(filepath, delimiter=entry.delimiter, encoding=entry.encoding)
+        csv_file._sha256 = entry.sha256
+        csv_file._header = entry.header
+        return csv_file
+
+    def manifest_entry(self) -> ManifestEntry:
+        """Describe the file for `FileManifest`."""
+        return ManifestEntry(
+            sha256=self.sha256,
+            delimiter=self.delimiter,
+            encoding=self.encoding,
+            header=self.header,
+        )
 
     @property
     def sha256(self) -> str:
         """Calculate SHA-256 hash of the file content."""
-        with open(self.filepath, "rb") as file:
-            return hashlib.sha256(file.read()).hexdigest()
+        if self._sha256 is None:
+            with open(self.filepath, "rb") as file:
+                self._sha256 = hashlib.file_digest(file, "sha256").hexdigest()
+        return self._sha256
 
     @property
     def dialect(self) -> type[csv.Dialect] | None:
         """Determine the CSV dialect using `csv.Sniffer`."""
-        with self.filepath.open("r", encoding="utf-8") as file:
+        with self.filepath.open("r", encoding=self.encoding) as file:
             sample = file.readline()
-            file.seek(0)
+        return self._sniff(sample)
 
+    def _sniff(self, sample: str) -> type[csv.Dialect] | None:
         if sample.strip() != "":
             try:
                 return csv.Sniffer().sniff(sample)
@@ -69,34 +124,123 @@ class CSVFile:
         if self._delimiter is not None:
             return self._delimiter
         if (dialect := self.dialect) is not None:
-            return dialect.delimiter
+            self._delimiter = dialect.delimiter
+            return self._delimiter
         raise UnknownDelimiterError(self.filepath)
 
+    @property
+    def header(self) -> tuple[str, ...]:
+        """Return the raw (unstripped) column names of the CSV file."""
+        if self._header is None:
+            with self.filepath.open("r", encoding=self.encoding) as file:
+                reader = csv.reader(file, delimiter=self.delimiter)
+                self._header = tuple(next(reader, ()))
+        return self._header
+
     @property
     def schema(self) -> set[str]:
         """Return the schema (column names) of the CSV file."""
-        with self.filepath.open("r", encoding=self.encoding) as file:
-            reader = csv.reader(file, delimiter=self.delimiter)
-            header = next(reader, None)
-            if header is None:
-                return set()
-            return {col.strip() for col in header}
+        return {col.strip() for col in self.header}
 
     def read(
-        self, *, add_meta: bool, strip: bool, meta_source_col: str, meta_lineno_col: str
+        self,
+        *,
+        add_meta: bool = False,
+        strip: bool = False,
+        meta_source_col: str = MetaColName.SOURCE.value,
+        meta_lineno_col: str = MetaColName.LINENO.value,
+        spec: ReadSpec | None = None,
+        engine: CSVEngine = "c",
     ) -> pd.DataFrame:
         """Read the CSV file content into a DataFrame."""
-        with self.filepath.open("r", encoding=self.encoding) as file:
-            df = pd.read_csv(file, delimiter=self.delimiter)
-            if strip:
-                df = self._strip_all(df)
-            if add_meta:
-                df = self._add_meta(
-                    df,
-                    meta_source_col=meta_source_col,
-                    meta_lineno_col=meta_lineno_col,
-                )
-            return df
+        return self.load(
+            add_meta=add_meta,
+            strip=strip,
+            meta_source_col=meta_source_col,
+            meta_lineno_col=meta_lineno_col,
+            spec=spec,
+            engine=engine,
+        ).data
+
+    def load(
+        self,
+        *,
+        add_meta: bool = False,
+        strip: bool = False,
+        meta_source_col: str = MetaColName.SOURCE.value,
+        meta_lineno_col: str = MetaColName.LINENO.value,
+        spec: ReadSpec | None = None,
+        engine: CSVEngine = "c",
+    ) -> CSVReadResult:
+        """Hash, sniff and parse the file in one pass over a memory-mapped buffer.
+
+        The file is opened once; hashlib, `csv.Sniffer` and `pd.read_csv` all consume the same
+        mapped bytes. The hash, delimiter and header are cached on the instance, so accessing
+        `sha256`, `delimiter` or `schema` afterwards does not touch the disk again.
+
+        If `spec` is given, only its columns are parsed (with its dtypes), so the remaining
+        columns of a wide export are never materialized.
+
+        `engine="pyarrow"` parses with the pyarrow CSV reader instead of pandas' C parser and
+        returns text columns as `string[pyarrow]`.
+        """
+        with self.filepath.open("rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                raise UnknownDelimiterError(self.filepath)
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if self._sha256 is None:
+                    self._sha256 = self._hash_buffer(buffer)
+                dialect = None
+                if self._delimiter is None or self._header is None:
+                    first_line = buffer.readline().decode(self.encoding)
+                if self._delimiter is None:
+                    dialect = self._sniff(first_line)
+                    if dialect is not None:
+                        self._delimiter = dialect.delimiter
+                if self._header is None:
+                    self._header = tuple(next(csv.reader([first_line], delimiter=self.delimiter)))
+                buffer.seek(0)
+                if engine == "pyarrow":
+                    df = self._read_arrow(strip=strip, spec=spec)
+                else:
+                    df = pd.read_csv(
+                        buffer,
+                        delimiter=self.delimiter,
+                        encoding=self.encoding,
+                        **self._read_csv_options(spec),
+                    )
+                    if strip:
+                        df = strip_all(df)
+
+        if add_meta:
+            df = self._add_meta(
+                df,
+                meta_source_col=meta_source_col,
+                meta_lineno_col=meta_lineno_col,
+            )
+        return CSVReadResult(self._sha256, dialect, df)
+
+    def _read_csv_options(self, spec: ReadSpec | None) -> dict[str, Any]:
+        """Translate `spec` into `pd.read_csv` options using the raw (unstripped) header."""
+        if spec is None:
+            return {}
+        raw_names = {col.strip(): col for col in self.header}
+        options: dict[str, Any] = {
+            "usecols": [raw for col, raw in raw_names.items() if col in spec.usecols]
+        }
+        if spec.dtype:
+            options["dtype"] = {
+                raw_names[col]: dtype for col, dtype in spec.dtype.items() if col in raw_names
+            }
+        return options
+
+    def _hash_buffer(self, buffer: mmap.mmap) -> str:
+        digest = hashlib.sha256()
+        with memoryview(buffer) as view:
+            for start in range(0, len(view), self.HASH_CHUNK_SIZE):
+                digest.update(view[start : start + self.HASH_CHUNK_SIZE])
+        return digest.hexdigest()
 
     def _add_meta(
         self,
@@ -108,11 +252,43 @@ class CSVFile:
         """Add `line_number` and `source` (where the data came from) columns."""
         return data.assign(**{meta_source_col: self.filepath}).reset_index(names=meta_lineno_col)
 
-    def _strip_all(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Strip all string columns (from whitespaces) in the DataFrame."""
-        data = data.rename(columns=lambda c: c.strip())
-        data = data.apply(lambda col: col.astype(str).str.strip() if col.dtype == "object" else col)
-        return data
+    def _read_arrow(self, *, strip: bool, spec: ReadSpec | None) -> pd.DataFrame:
+        """Parse the file with the pyarrow CSV reader into `string[pyarrow]` columns.
+
+        Arrow maps the file itself (sharing the page cache with `load`'s mapping, so the bytes
+        are not read from disk twice) because Arrow may keep references to its input buffer,
+        which would prevent the Python mapping from being closed. Whitespace is trimmed with
+        Arrow compute kernels, so no Python string objects are created for the cells.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pa_csv
+
+        convert_options = pa_csv.ConvertOptions(strings_can_be_null=True)
+        if spec is not None:
+            options = self._read_csv_options(spec)
+            convert_options.include_columns = options["usecols"]
+            convert_options.column_types = {
+                col: pa.string() for col, dtype in options.get("dtype", {}).items() if dtype is str
+            }
+        with pa.memory_map(str(self.filepath)) as source:
+            table = pa_csv.read_csv(
+                source,
+                read_options=pa_csv.ReadOptions(encoding=self.encoding),
+                parse_options=pa_csv.ParseOptions(delimiter=self.delimiter),
+                convert_options=convert_options,
+            )
+
+        if strip:
+            columns = []
+            for column in table.columns:
+                if pa.types.is_string(column.type):
+                    column = pc.utf8_trim_whitespace(column)
+                    column = pc.if_else(pc.equal(column, ""), pa.scalar(None, pa.string()), column)
+                columns.append(column)
+            table = pa.table(columns, names=[name.strip() for name in table.column_names])
+
+        return table.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
 
     def __repr__(self) -> str:
         return (
@@ -128,35 +304,78 @@ class CSVFile:
 
 class CSVDataReader:
 
-    def __init__(self, target: Path, schema: set[str], skip_hashes: set[str]):
+    def __init__(
+        self,
+        target: Path,
+        schema: set[str] | None,
+        skip_hashes: set[str],
+        manifest: FileManifest | None = None,
+    ):
         """
         Args:
             target (Path):
                 Path to a directory containing CSV files.
-            schema (set[str]):
+            schema (set[str] | None):
                 Set of column names that the CSV files should contain.
             skip_hashes (set[str]):
                 Set of file hashes to skip reading.
+            manifest (FileManifest | None):
+                Optional cache of file hashes and headers. Files it marks as ingested are
+                skipped, and unchanged files are neither re-hashed nor re-sniffed.
         """
         if not target.exists() or not target.is_dir():
             raise InputDirectoryNotFoundError(target)
         self.target = target
         self.schema = schema
         self.skip_hashes = skip_hashes
+        self.manifest = manifest
 
     @property
     def files(self) -> list[CSVFile]:
         """List of CSVs in the `self.target` directory."""
+        return self.files_from(self.target.iterdir())
+
+    def files_from(self, paths: Iterable[Path]) -> list[CSVFile]:
+        """Apply the reader's filters (CSV suffix, hashes, schema) to the given paths only."""
+        skip_hashes = self.skip_hashes
+        if self.manifest is not None:
+            skip_hashes = skip_hashes | self.manifest.ingested_hashes
         files = []
-        for path in self.target.iterdir():
+        for path in sorted(paths):
             if path.is_file() and path.suffix.lower() == ".csv":
-                csv_file = CSVFile(path)
-                if csv_file.sha256 not in self.skip_hashes and (
-                    self.schema is None or self.schema.issubset(csv_file.schema)
+                csv_file = self._open(path)
+                if csv_file.sha256 not in skip_hashes and (
+                    self.schema is None or self._matches_schema(csv_file)
                 ):
                     files.append(csv_file)
         return files
 
+    def _open(self, path: Path) -> CSVFile:
+        """Create a `CSVFile`, reusing (and filling) the manifest if there is one.
+
+        Files whose header cannot be read (empty, or no sniffable delimiter) are returned
+        without being cached, so whoever uses them (e.g. `dispatch_files`) reports them, and
+        they are looked at again once they change.
+        """
+        if self.manifest is None:
+            return CSVFile(path)
+        key = FileKey.from_path(path)
+        if (entry := self.manifest.get(key)) is not None:
+            return CSVFile.from_manifest_entry(path, entry)
+        csv_file = CSVFile(path)
+        try:
+            entry = csv_file.manifest_entry()
+        except (UnknownDelimiterError, OSError, UnicodeDecodeError):
+            return csv_file
+        self.manifest.put(key, entry)
+        return csv_file
+
+    def _matches_schema(self, csv_file: CSVFile) -> bool:
+        try:
+            return self.schema is None or self.schema.issubset(csv_file.schema)
+        except (UnknownDelimiterError, OSError, UnicodeDecodeError):
+            return False
+
     def get_all(
         self,
         *,
@@ -164,17 +383,97 @@ class CSVDataReader:
         strip: bool = False,
         meta_source_col: str = MetaColName.SOURCE.value,
         meta_lineno_col: str = MetaColName.LINENO.value,
+        spec: ReadSpec | None = None,
+        engine: CSVEngine = "c",
+        workers: int = 1,
+        executor: Executor | None = None,
     ) -> pd.DataFrame:
-        """Read all CSV files and concatenate them into a single DataFrame."""
-        dfs = []
-        for csv_file in self.files:
-            df = csv_file.read(
-                add_meta=add_meta,
-                strip=strip,
-                meta_source_col=meta_source_col,
-                meta_lineno_col=meta_lineno_col,
-            )
-            if df is not None:
-                dfs.append(df)
-        result = pd.concat(dfs, axis=0, ignore_index=not add_meta) if dfs else pd.DataFrame()
-        return result
+        """Read all CSV files and concatenate them into a single DataFrame.
+
+        Files are always concatenated in `self.files` order (sorted by path), so the result is
+        identical whether they were read serially or in parallel.
+
+        Args:
+            spec (ReadSpec | None):
+                Columns and dtypes to read; see `CSVFile.load`. All columns if None.
+            engine (CSVEngine):
+                CSV parser to use; see `CSVFile.load`.
+            workers (int):
+                Number of processes used to read the files. `1` reads them in this process.
+            executor (Executor | None):
+                Executor to read the files with, e.g. a `ThreadPoolExecutor`. Takes precedence
+                over `workers` and is not shut down afterwards.
+        """
+        return read_csv_files(
+            self.files,
+            add_meta=add_meta,
+            strip=strip,
+            meta_source_col=meta_source_col,
+            meta_lineno_col=meta_lineno_col,
+            spec=spec,
+            engine=engine,
+            workers=workers,
+            executor=executor,
+        )
+
+
+def read_csv_files(
+    files: list[CSVFile],
+    *,
+    add_meta: bool = False,
+    strip: bool = False,
+    meta_source_col: str = MetaColName.SOURCE.value,
+    meta_lineno_col: str = MetaColName.LINENO.value,
+    spec: ReadSpec | None = None,
+    engine: CSVEngine = "c",
+    workers: int = 1,
+    executor: Executor | None = None,
+) -> pd.DataFrame:
+    """Read the given CSV files and concatenate them, in order, into a single DataFrame.
+
+    See `CSVDataReader.get_all` for the meaning of `spec`, `engine`, `workers` and `executor`.
+    """
+    read = partial(
+        _read_csv_file,
+        add_meta=add_meta,
+        strip=strip,
+        meta_source_col=meta_source_col,
+        meta_lineno_col=meta_lineno_col,
+        spec=spec,
+        engine=engine,
+    )
+    if executor is not None:
+        dfs = list(executor.map(read, files))
+    elif workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(files)), mp_context=_process_pool_context()
+        ) as pool:
+            dfs = list(pool.map(read, files))
+    else:
+        dfs = [read(csv_file) for csv_file in files]
+    return pd.concat(dfs, axis=0, ignore_index=not add_meta) if dfs else pd.DataFrame()
+
+
+def strip_all(data: pd.DataFrame) -> pd.DataFrame:
+    """Strip all string columns (from whitespaces) in the DataFrame.
+
+    Missing values are kept as missing, and cells that only contained whitespace become
+    missing too, just like empty cells.
+    """
+    data = data.rename(columns=lambda c: c.strip())
+    for col in data.columns[data.dtypes == "object"]:
+        stripped = data[col].str.strip()
+        data[col] = stripped.mask(stripped == "")
+    return data
+
+
+def _process_pool_context() -> multiprocessing.context.BaseContext:
+    """Prefer `forkserver`, as forking a process that already runs threads can deadlock."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context()
+
+
+def _read_csv_file(csv_file: CSVFile, **kwargs) -> pd.DataFrame:
+    """Module-level wrapper around `CSVFile.read`, so it can be sent to a process pool."""
+    return csv_file.read(**kwargs)
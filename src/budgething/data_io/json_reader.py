@@ -0,0 +1,188 @@
+from datetime import datetime
+import json
+import logging
+from pathlib import Path
+import re
+from typing import Any, Iterable, Iterator, NamedTuple
+
+import pandas as pd
+
+from budgething.data_io.base import ReaderBase
+
+_SNAPSHOT_NAME = re.compile(r"^(?P<family>.+)_(?P<timestamp>\d{8}_\d{6})\.json$", re.IGNORECASE)
+_DELIMITERS = frozenset(" \t\r\n,]")
+
+
+class JSONSnapshotError(Exception):
+    """Raised when a JSON snapshot is not a complete JSON array."""
+
+    def __init__(self, filepath: Path, reason: str):
+        super().__init__(f"Invalid JSON snapshot '{filepath}': {reason}")
+        self.filepath = filepath
+
+
+class JSONSnapshot(NamedTuple):
+    """A timestamped JSON file, e.g. `transactions_20250516_004009.json`."""
+
+    family: str
+    timestamp: datetime
+    path: Path
+
+    @classmethod
+    def from_path(cls, path: Path) -> "JSONSnapshot | None":
+        """Parse the family and timestamp from the file name. None if it is not a snapshot."""
+        if (match := _SNAPSHOT_NAME.match(path.name)) is None:
+            return None
+        timestamp = datetime.strptime(match["timestamp"], "%Y%m%d_%H%M%S")
+        return cls(match["family"], timestamp, path)
+
+
+def iter_json_array(path: Path, *, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the items of a JSON array file one by one, holding about one item in memory.
+
+    The file is read in `chunk_size` pieces, and each item is decoded with
+    `json.JSONDecoder.raw_decode` as soon as it is complete.
+    """
+    decoder = json.JSONDecoder()
+    with path.open("r", encoding="utf-8") as file:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, pos, eof
+            chunk = file.read(chunk_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            eof = chunk == ""
+            return not eof
+
+        def next_token() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    raise JSONSnapshotError(path, "unexpected end of file")
+
+        if next_token() != "[":
+            raise JSONSnapshotError(path, "expected a JSON array")
+        pos += 1
+        if next_token() == "]":
+            return
+        while True:
+            next_token()
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if fill():
+                    continue
+                raise JSONSnapshotError(path, str(e)) from e
+            # A number cut off by the end of the buffer (e.g. "-4." of "-4.5") decodes fine too,
+            # so a number only counts once the delimiter after it was read
+            is_number = isinstance(item, (int, float)) and not isinstance(item, bool)
+            if is_number and (end == len(buffer) or buffer[end] not in _DELIMITERS) and fill():
+                continue
+            pos = end
+            yield item
+            token = next_token()
+            pos += 1
+            if token == "]":
+                return
+            if token != ",":
+                raise JSONSnapshotError(path, f"expected ',' or ']', got {token!r}")
+
+
+class JSONTransactionReader(ReaderBase):
+    """Read the timestamped JSON transaction snapshots of a directory.
+
+    Snapshots of one family (e.g. all `transactions_<YYYYMMDD_HHMMSS>.json` files) are full
+    copies of the same data, so only the newest readable one of each family is used. Files are
+    streamed in batches of `batch_size` records and never loaded as a whole, so iterating with
+    `iter_batches` uses the same memory no matter how large a snapshot grows.
+
+    ## Example
+
+    >>> reader = JSONTransactionReader(JSON_PATH)
+    >>> for batch in reader.iter_batches(columns=["date", "amount"]):
+    ...     process(batch)
+    """
+
+    BATCH_SIZE = 10_000
+
+    def __init__(self, directory: Path, batch_size: int = BATCH_SIZE):
+        """
+        Args:
+            directory (Path):
+                Directory holding the snapshots.
+            batch_size (int):
+                Number of records per DataFrame batch.
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+
+    def snapshots(self) -> dict[str, list[JSONSnapshot]]:
+        """Snapshots by family, newest first."""
+        families: dict[str, list[JSONSnapshot]] = {}
+        for path in self.directory.glob("*.json"):
+            if (snapshot := JSONSnapshot.from_path(path)) is not None:
+                families.setdefault(snapshot.family, []).append(snapshot)
+        return {
+            family: sorted(snapshots, key=lambda s: s.timestamp, reverse=True)
+            for family, snapshots in sorted(families.items())
+        }
+
+    def iter_batches(
+        self, family: str = "transactions", *, columns: Iterable[str] | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Stream the newest snapshot of `family` as DataFrames of at most `batch_size` rows.
+
+        Raises:
+            JSONSnapshotError: If the snapshot turns out to be truncated or invalid, possibly
+                after some batches were already yielded.
+        """
+        snapshots = self.snapshots().get(family)
+        if not snapshots:
+            return
+        yield from self._iter_batches(snapshots[0].path, columns)
+
+    def read(
+        self, family: str = "transactions", *, columns: Iterable[str] | None = None
+    ) -> pd.DataFrame:
+        """Read the newest complete snapshot of `family`.
+
+        A snapshot that is invalid (e.g. still being written) is skipped with a warning in
+        favour of the next newest one.
+        """
+        columns = None if columns is None else list(columns)
+        for snapshot in self.snapshots().get(family, []):
+            try:
+                batches = list(self._iter_batches(snapshot.path, columns))
+            except (JSONSnapshotError, UnicodeDecodeError) as e:
+                logging.warning(f"Skipping {e}")
+                continue
+            if batches:
+                return pd.concat(batches, ignore_index=True)
+            return pd.DataFrame(columns=columns)
+        return pd.DataFrame(columns=columns)
+
+    def get_all(self, *, columns: Iterable[str] | None = None) -> pd.DataFrame:
+        """Read the newest complete snapshot of every family, concatenated."""
+        columns = None if columns is None else list(columns)
+        dfs = [self.read(family, columns=columns) for family in self.snapshots()]
+        dfs = [df for df in dfs if not df.empty]
+        return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame(columns=columns)
+
+    def _iter_batches(self, path: Path, columns: list[str] | None) -> Iterator[pd.DataFrame]:
+        batch: list[dict[str, Any]] = []
+        for record in iter_json_array(path):
+            if not isinstance(record, dict):
+                raise JSONSnapshotError(path, f"expected an object, got {type(record).__name__}")
+            batch.append(record)
+            if len(batch) == self.batch_size:
+                yield pd.DataFrame.from_records(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=columns)
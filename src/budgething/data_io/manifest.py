@@ -0,0 +1,115 @@
+import json
+import os
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+
+class FileKey(NamedTuple):
+    """Identity of a file on disk. Any change to it invalidates the cached manifest entry."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+
+    @classmethod
+    def from_path(cls, path: Path) -> "FileKey":
+        stat = path.stat()
+        return cls(str(path.resolve()), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+class ManifestEntry(NamedTuple):
+    """Everything we learned about a file the last time it was opened."""
+
+    sha256: str
+    delimiter: str | None
+    encoding: str
+    header: tuple[str, ...]
+    ingested: bool = False
+
+
+class FileManifest:
+    """On-disk cache of file hashes, dialects and headers.
+
+    Entries are looked up by `FileKey`, so a file is only re-hashed and re-sniffed when its size,
+    modification time or inode changes. The `ingested` flag is tracked per content hash, which
+    means a file that was moved or copied is still recognised as already ingested.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path (Path):
+                Location of the JSON manifest file. It does not have to exist yet.
+        """
+        self.path = path
+        self._entries: dict[str, tuple[FileKey, ManifestEntry]] = {}
+        self._ingested: set[str] = set()
+        if path.exists():
+            self._load()
+
+    def get(self, key: FileKey) -> ManifestEntry | None:
+        """Return the cached entry for `key` or None if the file is new or has changed."""
+        cached = self._entries.get(key.path)
+        if cached is None or cached[0] != key:
+            return None
+        return cached[1]
+
+    def put(self, key: FileKey, entry: ManifestEntry) -> None:
+        """Store `entry` for `key`, replacing whatever was cached for the same path."""
+        if entry.sha256 in self._ingested:
+            entry = entry._replace(ingested=True)
+        elif entry.ingested:
+            self._ingested.add(entry.sha256)
+        self._entries[key.path] = (key, entry)
+
+    @property
+    def ingested_hashes(self) -> frozenset[str]:
+        """Hashes of all files that have already been ingested."""
+        return frozenset(self._ingested)
+
+    def mark_ingested(self, hashes: Iterable[str]) -> None:
+        """Flag all entries with one of the given content hashes as ingested."""
+        hashes = set(hashes) - self._ingested
+        if not hashes:
+            return
+        self._ingested |= hashes
+        for path, (key, entry) in self._entries.items():
+            if entry.sha256 in hashes and not entry.ingested:
+                self._entries[path] = (key, entry._replace(ingested=True))
+
+    def save(self) -> None:
+        """Write the manifest to disk atomically."""
+        payload = {
+            "version": self.VERSION,
+            "files": [
+                {**key._asdict(), **entry._asdict(), "header": list(entry.header)}
+                for key, entry in self._entries.values()
+            ],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        payload = json.loads(self.path.read_text(encoding="utf-8"))
+        if payload.get("version") != self.VERSION:
+            return
+        for record in payload["files"]:
+            key = FileKey(*(record[field] for field in FileKey._fields))
+            entry = ManifestEntry(
+                sha256=record["sha256"],
+                delimiter=record["delimiter"],
+                encoding=record["encoding"],
+                header=tuple(record["header"]),
+                ingested=record["ingested"],
+            )
+            self._entries[key.path] = (key, entry)
+            if entry.ingested:
+                self._ingested.add(entry.sha256)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,202 @@
+from datetime import datetime
+from pathlib import Path
+import shutil
+from typing import Iterable, Iterator
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from budgething.data_io.base import ReaderBase, WriterBase
+from budgething.data_io.transaction_schema import (
+    TRANSACTION_COLUMNS,
+    TRANSACTION_DTYPES,
+    normalize_transactions,
+)
+
+Partition = tuple[str, str]
+"""(account, year-month) pair, e.g. `("revolut", "2024-05")`."""
+
+
+class ParquetTransactionStore(ReaderBase, WriterBase):
+    """Columnar store of normalized transactions, partitioned by account and year-month.
+
+    Data lives in hive-style directories (`account=revolut/month=2024-05/part-<id>.parquet`),
+    so reads filtered by account or date only open the partitions that can match.
+
+    ## Example
+
+    >>> store = ParquetTransactionStore(DATA_PATH / "store")
+    >>> store.create(parsed)
+    >>> store.read(columns=["date", "amount"], accounts=["revolut"], start="2024-05-01")
+    """
+
+    PARTITION_COLUMNS = ("account", "month")
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root (Path):
+                Directory holding the partitions. Created if it does not exist.
+        """
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def create(self, data: pd.DataFrame) -> list[Partition]:
+        """Append transactions, adding one new file to every partition they fall into.
+
+        Returns:
+            list[Partition]: Partitions the data was written to.
+        """
+        written = []
+        for partition, part in self._split(data):
+            self._write_part(partition, part)
+            written.append(partition)
+        return written
+
+    def update(self, data: pd.DataFrame) -> list[Partition]:
+        """Replace the whole content of every partition the transactions fall into.
+
+        Returns:
+            list[Partition]: Partitions that were replaced.
+        """
+        written = []
+        for partition, part in self._split(data):
+            old_files = list(self._partition_dir(partition).glob("*.parquet"))
+            self._write_part(partition, part)
+            for path in old_files:
+                path.unlink()
+            written.append(partition)
+        return written
+
+    def delete(
+        self,
+        *,
+        accounts: Iterable[str] | None = None,
+        months: Iterable[str] | None = None,
+    ) -> list[Partition]:
+        """Delete whole partitions. Passing neither `accounts` nor `months` deletes everything.
+
+        Args:
+            accounts (Iterable[str] | None):
+                Only delete partitions of these accounts.
+            months (Iterable[str] | None):
+                Only delete partitions of these year-months ("YYYY-MM").
+
+        Returns:
+            list[Partition]: Partitions that were deleted.
+        """
+        accounts = None if accounts is None else {str(account) for account in accounts}
+        months = None if months is None else set(months)
+        deleted = []
+        for partition in self.partitions():
+            account, month = partition
+            if (accounts is None or account in accounts) and (months is None or month in months):
+                shutil.rmtree(self._partition_dir(partition))
+                deleted.append(partition)
+        return deleted
+
+    def read(
+        self,
+        *,
+        columns: Iterable[str] | None = None,
+        accounts: Iterable[str] | None = None,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+    ) -> pd.DataFrame:
+        """Read transactions, loading only the requested columns and matching partitions.
+
+        Args:
+            columns (Iterable[str] | None):
+                Columns to load. All transaction columns if None.
+            accounts (Iterable[str] | None):
+                Only load these accounts.
+            start (datetime | str | None):
+                Only load transactions on or after this date.
+            end (datetime | str | None):
+                Only load transactions before this date.
+        """
+        columns = list(TRANSACTION_COLUMNS if columns is None else columns)
+        if not self.partitions():
+            return normalize_transactions(pd.DataFrame())[columns]
+
+        partition_schema = pa.schema([(col, pa.string()) for col in self.PARTITION_COLUMNS])
+        # An explicit schema reads columns that older files lack as missing values
+        stored = normalize_transactions(pd.DataFrame()).drop(columns="account")
+        dataset = ds.dataset(
+            self.root,
+            schema=pa.unify_schemas(
+                [pa.Schema.from_pandas(stored, preserve_index=False), partition_schema]
+            ),
+            format="parquet",
+            partitioning=ds.partitioning(partition_schema, flavor="hive"),
+        )
+        data = dataset.to_table(
+            columns=columns, filter=self._filter(accounts=accounts, start=start, end=end)
+        ).to_pandas()
+        if "date" in data.columns:
+            data = data.sort_values("date", kind="stable", ignore_index=True)
+        return data.astype({col: TRANSACTION_DTYPES[col] for col in columns})
+
+    def get_all(self, *, columns: Iterable[str] | None = None) -> pd.DataFrame:
+        """Read all stored transactions."""
+        return self.read(columns=columns)
+
+    def partitions(self) -> list[Partition]:
+        """List (account, year-month) partitions that currently hold data."""
+        partitions = []
+        for account_dir in sorted(self.root.glob("account=*")):
+            for month_dir in sorted(account_dir.glob("month=*")):
+                if any(month_dir.glob("*.parquet")):
+                    partitions.append(
+                        (account_dir.name.partition("=")[2], month_dir.name.partition("=")[2])
+                    )
+        return partitions
+
+    def _filter(
+        self,
+        *,
+        accounts: Iterable[str] | None,
+        start: datetime | str | None,
+        end: datetime | str | None,
+    ) -> ds.Expression | None:
+        conditions = []
+        if accounts is not None:
+            conditions.append(ds.field("account").isin([str(account) for account in accounts]))
+        if start is not None:
+            start = pd.Timestamp(start)
+            conditions.append(ds.field("month") >= start.strftime("%Y-%m"))
+            conditions.append(ds.field("date") >= pa.scalar(start, pa.timestamp("ns")))
+        if end is not None:
+            end = pd.Timestamp(end)
+            conditions.append(ds.field("month") <= end.strftime("%Y-%m"))
+            conditions.append(ds.field("date") < pa.scalar(end, pa.timestamp("ns")))
+        if not conditions:
+            return None
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+    def _split(self, data: pd.DataFrame) -> Iterator[tuple[Partition, pd.DataFrame]]:
+        """Split normalized transactions into per-partition frames (without partition keys)."""
+        data = normalize_transactions(data)
+        months = data["date"].dt.strftime("%Y-%m")
+        for (account, month), part in data.groupby([data["account"], months], sort=True):
+            yield (account, month), part.drop(columns="account")
+
+    def _partition_dir(self, partition: Partition) -> Path:
+        account, month = partition
+        return self.root / f"account={account}" / f"month={month}"
+
+    def _write_part(self, partition: Partition, data: pd.DataFrame) -> Path:
+        directory = self._partition_dir(partition)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"part-{uuid.uuid4().hex}.parquet"
+        # Dot-prefixed files are ignored by `ds.dataset`, so readers never see a partial write
+        tmp_path = directory / f".{path.name}.tmp"
+        pq.write_table(pa.Table.from_pandas(data, preserve_index=False), tmp_path)
+        tmp_path.rename(path)
+        return path
@@ -0,0 +1,364 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+from budgething.data_io.csv_data_reader import (
+    CSVEngine,
+    CSVFile,
+    InputDirectoryNotFoundError,
+    MetaColName,
+    ReadSpec,
+    _process_pool_context,
+    strip_all,
+)
+from budgething.data_io.manifest import FileKey, FileManifest, ManifestEntry
+
+Table = list[list[str | None]]
+
+
+class PDFExtractionError(Exception):
+    """Raised when no transaction table can be extracted from a PDF."""
+
+    def __init__(self, filepath: Path, reason: str):
+        super().__init__(f"Could not extract a table from '{filepath}': {reason}")
+        self.filepath = filepath
+
+
+class PDFFile:
+    """A PDF statement, read as the table spanning its pages.
+
+    Offers the same `sha256`, `schema` and `read` interface as `CSVFile`, so PDF statements are
+    dispatched to parsers and ingested exactly like CSV ones. Extraction is the expensive part;
+    its result is kept on the instance and, with a `cache_dir`, on disk under the file's
+    SHA-256, so a given PDF is only ever extracted once.
+    """
+
+    PAGES_PER_TASK = 4
+
+    def __init__(self, filepath: Path, cache_dir: Path | None = None):
+        if filepath.suffix.lower() != ".pdf":
+            raise ValueError(f"Expected a PDF file, got: {filepath}")
+        self.filepath = filepath
+        self.cache_dir = cache_dir
+        self._sha256: str | None = None
+        self._header: tuple[str, ...] | None = None
+        self._table: pd.DataFrame | None = None
+
+    @classmethod
+    def from_manifest_entry(
+        cls, filepath: Path, entry: ManifestEntry, cache_dir: Path | None = None
+    ) -> "PDFFile":
+        """Create a `PDFFile` with its hash and header already known."""
+        pdf_file = cls(filepath, cache_dir)
+        pdf_file._sha256 = entry.sha256
+        pdf_file._header = entry.header
+        return pdf_file
+
+    def manifest_entry(self) -> ManifestEntry:
+        """Describe the file for `FileManifest`."""
+        return ManifestEntry(sha256=self.sha256, delimiter=None, encoding="", header=self.header)
+
+    @property
+    def sha256(self) -> str:
+        """Calculate SHA-256 hash of the file content."""
+        if self._sha256 is None:
+            with open(self.filepath, "rb") as file:
+                self._sha256 = hashlib.file_digest(file, "sha256").hexdigest()
+        return self._sha256
+
+    @property
+    def cache_path(self) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{self.sha256}.parquet"
+
+    @property
+    def header(self) -> tuple[str, ...]:
+        """Return the raw (unstripped) column names of the extracted table."""
+        if self._header is None:
+            self._header = tuple(self.extract().columns)
+        return self._header
+
+    @property
+    def schema(self) -> set[str]:
+        """Return the schema (column names) of the extracted table."""
+        return {col.strip() for col in self.header}
+
+    def extract(self) -> pd.DataFrame:
+        """Extracted table with all cells as raw strings, from the cache if possible."""
+        if self._table is None and not self._load_cached():
+            extract_pdf_tables([self])
+        assert self._table is not None
+        return self._table
+
+    def read(
+        self,
+        *,
+        add_meta: bool = False,
+        strip: bool = False,
+        meta_source_col: str = MetaColName.SOURCE.value,
+        meta_lineno_col: str = MetaColName.LINENO.value,
+        spec: ReadSpec | None = None,
+        engine: CSVEngine = "c",
+    ) -> pd.DataFrame:
+        """Read the extracted table into a DataFrame, like `CSVFile.read`.
+
+        `engine` is accepted for compatibility with `read_csv_files` and ignored. The line
+        number of a row is its position in the table, counting rows of all pages.
+        """
+        data = self.extract()
+        if spec is not None:
+            data = data[[col for col in data.columns if col.strip() in spec.usecols]]
+            dtype = {
+                col: spec.dtype[col.strip()]
+                for col in data.columns
+                if spec.dtype and spec.dtype.get(col.strip(), str) is not str
+            }
+            data = data.astype(dtype)
+        if strip:
+            data = strip_all(data)
+        if add_meta:
+            data = data.assign(**{meta_source_col: self.filepath}).reset_index(
+                names=meta_lineno_col
+            )
+        return data
+
+    def _load_cached(self) -> bool:
+        if self._table is None and (path := self.cache_path) is not None and path.exists():
+            self._set_table(pd.read_parquet(path))
+        return self._table is not None
+
+    def _store(self, tables: list[Table]) -> None:
+        table = _merge_tables(self.filepath, tables)
+        if (path := self.cache_path) is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            table.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        self._set_table(table)
+
+    def _set_table(self, table: pd.DataFrame) -> None:
+        self._table = table
+        self._header = tuple(table.columns)
+
+    def _page_ranges(self) -> list[range]:
+        import pdfplumber
+
+        try:
+            with pdfplumber.open(self.filepath) as pdf:
+                pages = len(pdf.pages)
+        except Exception as e:
+            raise PDFExtractionError(self.filepath, str(e)) from e
+        return [
+            range(start, min(start + self.PAGES_PER_TASK, pages))
+            for start in range(0, pages, self.PAGES_PER_TASK)
+        ]
+
+    def __repr__(self) -> str:
+        return f"PDFFile(filepath={self.filepath})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PDFFile):
+            return NotImplemented
+        return self.filepath == other.filepath
+
+
+InputFile = CSVFile | PDFFile
+"""Any statement file that can be dispatched to a parser."""
+
+
+class PDFDataReader:
+    def __init__(
+        self,
+        target: Path,
+        schema: set[str] | None,
+        skip_hashes: set[str],
+        manifest: FileManifest | None = None,
+        cache_dir: Path | None = None,
+        workers: int = 1,
+    ):
+        """
+        Args:
+            target (Path):
+                Path to a directory containing PDF files.
+            schema (set[str] | None):
+                Set of column names that the extracted tables should contain.
+            skip_hashes (set[str]):
+                Set of file hashes to skip reading.
+            manifest (FileManifest | None):
+                Optional cache of file hashes and headers. Files it marks as ingested are
+                skipped, and unchanged files are not re-hashed.
+            cache_dir (Path | None):
+                Directory of the extraction cache. Extracted tables are only kept in memory if
+                None.
+            workers (int):
+                Number of processes extracting pages of new PDFs.
+        """
+        if not target.exists() or not target.is_dir():
+            raise InputDirectoryNotFoundError(target)
+        self.target = target
+        self.schema = schema
+        self.skip_hashes = skip_hashes
+        self.manifest = manifest
+        self.cache_dir = cache_dir
+        self.workers = workers
+
+    @property
+    def files(self) -> list[PDFFile]:
+        """List of PDFs in the `self.target` directory."""
+        return self.files_from(self.target.iterdir())
+
+    def files_from(self, paths: Iterable[Path]) -> list[PDFFile]:
+        """Apply the reader's filters (PDF suffix, hashes, schema) to the given paths only.
+
+        All new files are extracted together, so their pages share one process pool.
+        """
+        skip_hashes = self.skip_hashes
+        if self.manifest is not None:
+            skip_hashes = skip_hashes | self.manifest.ingested_hashes
+        files = [
+            pdf_file
+            for path in sorted(paths)
+            if path.is_file() and path.suffix.lower() == ".pdf"
+            if (pdf_file := self._open(path)).sha256 not in skip_hashes
+        ]
+        pending = [pdf_file for pdf_file in files if pdf_file._header is None]
+        extract_pdf_tables(pending, workers=self.workers, skip_errors=True)
+        files = [pdf_file for pdf_file in files if pdf_file._header is not None]
+        if self.manifest is not None:
+            for pdf_file in pending:
+                if pdf_file._header is not None:
+                    key = FileKey.from_path(pdf_file.filepath)
+                    self.manifest.put(key, pdf_file.manifest_entry())
+        return [
+            pdf_file
+            for pdf_file in files
+            if self.schema is None or self.schema.issubset(pdf_file.schema)
+        ]
+
+    def _open(self, path: Path) -> PDFFile:
+        if self.manifest is not None and (
+            entry := self.manifest.get(FileKey.from_path(path))
+        ) is not None:
+            return PDFFile.from_manifest_entry(path, entry, self.cache_dir)
+        return PDFFile(path, self.cache_dir)
+
+    def get_all(
+        self,
+        *,
+        add_meta: bool = False,
+        strip: bool = False,
+        meta_source_col: str = MetaColName.SOURCE.value,
+        meta_lineno_col: str = MetaColName.LINENO.value,
+        spec: ReadSpec | None = None,
+    ) -> pd.DataFrame:
+        """Read all PDF files and concatenate them into a single DataFrame."""
+        dfs = [
+            pdf_file.read(
+                add_meta=add_meta,
+                strip=strip,
+                meta_source_col=meta_source_col,
+                meta_lineno_col=meta_lineno_col,
+                spec=spec,
+            )
+            for pdf_file in self.files
+        ]
+        return pd.concat(dfs, axis=0, ignore_index=not add_meta) if dfs else pd.DataFrame()
+
+
+def extract_pdf_tables(
+    files: Iterable[PDFFile],
+    *,
+    workers: int = 1,
+    executor: Executor | None = None,
+    skip_errors: bool = False,
+) -> None:
+    """Extract the tables of all `files` that are not cached yet.
+
+    The pages of all files are split into chunks of `PDFFile.PAGES_PER_TASK`, so a single large
+    statement is spread over the workers too.
+
+    Args:
+        workers (int):
+            Number of processes extracting pages. `1` extracts them in this process.
+        executor (Executor | None):
+            Executor to extract pages with. Takes precedence over `workers` and is not shut down
+            afterwards.
+        skip_errors (bool):
+            Log files that cannot be extracted (leaving them unextracted) instead of raising
+            `PDFExtractionError`.
+    """
+    pending: list[PDFFile] = []
+    tasks: list[tuple[PDFFile, range]] = []
+    for pdf_file in files:
+        if pdf_file._load_cached():
+            continue
+        try:
+            tasks.extend((pdf_file, pages) for pages in pdf_file._page_ranges())
+        except PDFExtractionError as e:
+            if not skip_errors:
+                raise
+            logging.warning(e)
+        else:
+            pending.append(pdf_file)
+
+    args = [(pdf_file.filepath, pages) for pdf_file, pages in tasks]
+    if executor is not None:
+        results = list(executor.map(_extract_pages, args))
+    elif workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(args)), mp_context=_process_pool_context()
+        ) as pool:
+            results = list(pool.map(_extract_pages, args))
+    else:
+        results = [_extract_pages(arg) for arg in args]
+
+    tables: dict[Path, list[Table]] = {}
+    for (pdf_file, _), result in zip(tasks, results):
+        tables.setdefault(pdf_file.filepath, []).extend(result)
+    for pdf_file in pending:
+        try:
+            pdf_file._store(tables.get(pdf_file.filepath, []))
+        except PDFExtractionError as e:
+            if not skip_errors:
+                raise
+            logging.warning(e)
+
+
+def _extract_pages(args: tuple[Path, range]) -> list[Table]:
+    """Tables found on a range of pages. Module-level, so it can be sent to a process pool."""
+    import pdfplumber
+
+    filepath, pages = args
+    with pdfplumber.open(filepath) as pdf:
+        return [table for number in pages for table in pdf.pages[number].extract_tables()]
+
+
+def _merge_tables(filepath: Path, tables: list[Table]) -> pd.DataFrame:
+    """Join the tables of all pages into one, using the first row of the first one as header.
+
+    Statements repeat the header on every page, so rows equal to it are dropped. Rows with a
+    different number of cells (e.g. page footers or summaries) are not part of the transaction
+    table and are dropped too.
+    """
+    rows = [[_clean(cell) for cell in row] for table in tables for row in table if any(row)]
+    if not rows:
+        raise PDFExtractionError(filepath, "no tables found")
+    header = [cell or f"column_{i}" for i, cell in enumerate(rows[0])]
+    header = [
+        name if header.index(name) == i else f"{name}_{i}" for i, name in enumerate(header)
+    ]
+    body = [row for row in rows[1:] if len(row) == len(header) and row != rows[0]]
+    if skipped := len(rows) - 1 - len(body):
+        logging.debug(f"'{filepath}': dropped {skipped} header or non-table row(s)")
+    return pd.DataFrame(body, columns=header, dtype=object)
+
+
+def _clean(cell: str | None) -> str | None:
+    """Undo line wrapping within a table cell. Empty cells are missing, as in `pd.read_csv`."""
+    return " ".join(cell.splitlines()) or None if cell else None
@@ -0,0 +1,153 @@
+import json
+import os
+from pathlib import Path
+from typing import Iterable
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+_SUFFIX = ".arrow"
+_GENERATION_KEY = b"budgething.snapshot_generation"
+MAX_SEGMENTS = 32
+"""Appended segments a table may have before `append_snapshot` merges them into one file."""
+
+
+def write_snapshot(directory: Path, **tables: pd.DataFrame | pd.Series) -> list[Path]:
+    """Write each table to `<directory>/<name>.arrow` as an uncompressed Arrow IPC file.
+
+    Uncompressed IPC files can be memory-mapped and read without deserializing, see
+    `read_snapshot`. Each file is replaced atomically, so readers that already mapped the old
+    version keep a consistent view. Rows appended to the old version are dropped.
+
+    ## Example
+
+    >>> write_snapshot(SNAPSHOT_PATH, transactions=transactions, eod_balance=eod_balance)
+    >>> read_snapshot(SNAPSHOT_PATH, "transactions", columns=["date", "amount"])
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, data in tables.items():
+        if isinstance(data, pd.Series):
+            data = data.to_frame()
+        generation = uuid.uuid4().hex
+        table = pa.Table.from_pandas(data)
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), _GENERATION_KEY: generation.encode()}
+        )
+        path = directory / f"{name}{_SUFFIX}"
+        _write_atomically(table, path)
+        # Segments of the old version belong to another generation and are no longer read
+        for segment in _segment_dir(directory, name).glob(f"*{_SUFFIX}"):
+            segment.unlink(missing_ok=True)
+        paths.append(path)
+    return paths
+
+
+def append_snapshot(directory: Path, name: str, data: pd.DataFrame) -> Path:
+    """Append rows to a snapshot table, creating it if it does not exist yet.
+
+    The rows are written as a segment file next to the table, which `read_snapshot` reads
+    along with it, so appending costs as much as writing the new rows, however long the table
+    is. Only the schema of the table is read. Once it has `MAX_SEGMENTS` segments, or the rows
+    have other columns, the table is rewritten as a single file instead.
+
+    Returns:
+        Path: The file the rows were written to.
+    """
+    path = directory / f"{name}{_SUFFIX}"
+    if not path.exists():
+        return write_snapshot(directory, **{name: data})[0]
+    schema = pa.ipc.open_file(pa.memory_map(str(path))).schema
+    generation = (schema.metadata or {}).get(_GENERATION_KEY, b"").decode()
+    segments = _segments(directory, name, generation) if generation else []
+    table = pa.Table.from_pandas(data, preserve_index=bool(_index_columns(schema)))
+    if (
+        not generation
+        or len(segments) >= MAX_SEGMENTS
+        or set(table.schema.names) != set(schema.names)
+    ):
+        existing = read_snapshot(directory, name)
+        data = pd.concat([existing, data.astype(existing.dtypes.to_dict())], ignore_index=True)
+        return write_snapshot(directory, **{name: data})[0]
+    segment = _segment_dir(directory, name) / f"{generation}-{len(segments):06d}{_SUFFIX}"
+    segment.parent.mkdir(exist_ok=True)
+    _write_atomically(table.select(schema.names).cast(schema), segment)
+    return segment
+
+
+def read_snapshot(
+    directory: Path, name: str, *, columns: Iterable[str] | None = None
+) -> pd.DataFrame:
+    """Memory-map a snapshot table and load only the requested columns.
+
+    Numeric columns without missing values are handed to pandas without copying, and text
+    columns stay in Arrow memory as `string[pyarrow]`, so loading cost barely depends on the
+    size of the history. Segments written by `append_snapshot` are read after the table.
+
+    Args:
+        directory (Path):
+            Directory given to `write_snapshot`.
+        name (str):
+            Name of the table, e.g. "transactions".
+        columns (Iterable[str] | None):
+            Columns to load. All columns if None. The index, if one was written, is always
+            restored.
+    """
+    source = pa.memory_map(str(directory / f"{name}{_SUFFIX}"))
+    table = pa.ipc.open_file(source).read_all()
+    generation = (table.schema.metadata or {}).get(_GENERATION_KEY)
+    if generation is not None and (segments := _segments(directory, name, generation.decode())):
+        tables = [table]
+        for segment in segments:
+            tables.append(pa.ipc.open_file(pa.memory_map(str(segment))).read_all())
+        table = _without_range_index(pa.concat_tables(tables))
+    if columns is not None:
+        index_columns = _index_columns(table)
+        table = table.select([*index_columns, *(c for c in columns if c not in index_columns)])
+    return table.to_pandas(
+        split_blocks=True,
+        types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get,
+    )
+
+
+def list_snapshots(directory: Path) -> list[str]:
+    """Names of the tables stored in `directory`."""
+    return sorted(path.stem for path in directory.glob(f"*{_SUFFIX}"))
+
+
+def _index_columns(table: pa.Table | pa.Schema) -> list[str]:
+    """Names of the columns holding a serialized pandas index."""
+    schema = table if isinstance(table, pa.Schema) else table.schema
+    metadata = schema.pandas_metadata or {}
+    return [col for col in metadata.get("index_columns", []) if isinstance(col, str)]
+
+
+def _segment_dir(directory: Path, name: str) -> Path:
+    return directory / f"{name}.segments"
+
+
+def _segments(directory: Path, name: str, generation: str) -> list[Path]:
+    """Segment files appended to the `generation` of a table, in order."""
+    return sorted(_segment_dir(directory, name).glob(f"{generation}-*{_SUFFIX}"))
+
+
+def _write_atomically(table: pa.Table, path: Path) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    # A single record batch keeps every column contiguous, which zero-copy reads need
+    feather.write_feather(
+        table, tmp_path, compression="uncompressed", chunksize=max(table.num_rows, 1)
+    )
+    os.replace(tmp_path, path)
+
+
+def _without_range_index(table: pa.Table) -> pa.Table:
+    """`table` without the stored RangeIndex of its first part, which no longer fits its rows."""
+    metadata = table.schema.pandas_metadata
+    if not metadata:
+        return table
+    metadata["index_columns"] = [col for col in metadata["index_columns"] if isinstance(col, str)]
+    return table.replace_schema_metadata(
+        {**table.schema.metadata, b"pandas": json.dumps(metadata).encode()}
+    )
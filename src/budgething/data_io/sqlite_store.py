@@ -0,0 +1,213 @@
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+import sqlite3
+from typing import Any, Iterable, Literal
+
+import pandas as pd
+
+from budgething.data_io.base import ReaderBase, WriterBase
+from budgething.data_io.transaction_schema import (
+    TRANSACTION_COLUMNS,
+    TRANSACTION_DTYPES,
+    normalize_transactions,
+)
+
+Frequency = Literal["day", "month", "year"]
+
+# Fixed-width microseconds keep the text sorting chronologically and round trips lossless
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+_DATE_COLUMNS = frozenset({"date", "balance_date"})
+# Length of the ISO date prefix identifying a period, e.g. "2024-05" for a month
+_PERIOD_PREFIX: dict[Frequency, int] = {"day": 10, "month": 7, "year": 4}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    date TEXT NOT NULL,
+    balance_date TEXT,
+    amount NUMERIC,
+    currency TEXT,
+    balance NUMERIC,
+    category TEXT,
+    payment_type TEXT,
+    account TEXT NOT NULL,
+    source TEXT NOT NULL,
+    line_number INTEGER NOT NULL,
+    PRIMARY KEY (source, line_number)
+);
+CREATE INDEX IF NOT EXISTS ix_transactions_account_date
+    ON transactions (account, date, amount);
+CREATE INDEX IF NOT EXISTS ix_transactions_category_date
+    ON transactions (category, date, amount);
+"""
+
+
+class SQLiteTransactionStore(ReaderBase, WriterBase):
+    """Transaction store backed by a single SQLite file.
+
+    Rows are identified by (`source`, `line_number`). Dates are kept as ISO 8601 text, so they
+    sort chronologically, and both indexes also cover `amount`, which lets per-account and
+    per-category sums over a date range be answered from the index alone. The database runs in
+    WAL mode, so a dashboard process can read while ingest writes.
+    """
+
+    BATCH_SIZE = 50_000
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path (Path):
+                Location of the database file. Created (with its schema) if it does not exist.
+        """
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(transactions)")}
+        if "balance_date" not in columns:
+            # Databases created before transactions kept the date they changed the balance
+            self.connection.execute("ALTER TABLE transactions ADD COLUMN balance_date TEXT")
+
+    def create(self, data: pd.DataFrame) -> int:
+        """Insert new transactions. Fails if any of them is already stored.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        return self._insert(data, "INSERT")
+
+    def update(self, data: pd.DataFrame) -> int:
+        """Insert transactions, replacing stored rows with the same `source` and `line_number`.
+
+        Returns:
+            int: Number of inserted or replaced rows.
+        """
+        return self._insert(data, "INSERT OR REPLACE")
+
+    def delete(
+        self,
+        *,
+        accounts: Iterable[str] | None = None,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+    ) -> int:
+        """Delete transactions matching all given conditions (everything if none are given).
+
+        Returns:
+            int: Number of deleted rows.
+        """
+        where, params = self._where(accounts=accounts, start=start, end=end)
+        with self.connection:
+            cursor = self.connection.execute(f"DELETE FROM transactions{where}", params)
+        return cursor.rowcount
+
+    def read(
+        self,
+        *,
+        columns: Iterable[str] | None = None,
+        accounts: Iterable[str] | None = None,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+    ) -> pd.DataFrame:
+        """Read transactions ordered by date.
+
+        Args:
+            columns (Iterable[str] | None):
+                Columns to load. All transaction columns if None.
+            accounts (Iterable[str] | None):
+                Only load these accounts.
+            start (datetime | str | None):
+                Only load transactions on or after this date.
+            end (datetime | str | None):
+                Only load transactions before this date.
+        """
+        columns = list(TRANSACTION_COLUMNS if columns is None else columns)
+        unknown = set(columns) - set(TRANSACTION_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns: {sorted(unknown)}")
+
+        where, params = self._where(accounts=accounts, start=start, end=end)
+        data = pd.read_sql_query(
+            f"SELECT {', '.join(columns)} FROM transactions{where} ORDER BY date, rowid",
+            self.connection,
+            params=params,
+        )
+        for column in _DATE_COLUMNS.intersection(data.columns):
+            data[column] = pd.to_datetime(data[column], format=_DATE_FORMAT)
+        return data.astype({col: TRANSACTION_DTYPES[col] for col in columns})
+
+    def get_all(self, *, columns: Iterable[str] | None = None) -> pd.DataFrame:
+        """Read all stored transactions."""
+        return self.read(columns=columns)
+
+    def aggregate(
+        self,
+        *,
+        by: Literal["account", "category"] = "account",
+        freq: Frequency = "month",
+        accounts: Iterable[str] | None = None,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+    ) -> pd.DataFrame:
+        """Sum amounts per `by` value and period, without loading the transactions.
+
+        Returns:
+            pd.DataFrame: Columns `by`, "period" (e.g. "2024-05" for months), "amount" and
+            "count", ordered by `by` and period.
+        """
+        if by not in ("account", "category"):
+            raise ValueError(f"Cannot aggregate by '{by}'")
+        where, params = self._where(accounts=accounts, start=start, end=end)
+        period = f"substr(date, 1, {_PERIOD_PREFIX[freq]})"
+        return pd.read_sql_query(
+            f"SELECT {by}, {period} AS period, SUM(amount) AS amount, COUNT(*) AS count "
+            f"FROM transactions{where} GROUP BY {by}, period ORDER BY {by}, period",
+            self.connection,
+            params=params,
+        ).astype({"amount": TRANSACTION_DTYPES["amount"]})
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "SQLiteTransactionStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _insert(self, data: pd.DataFrame, statement: str) -> int:
+        data = normalize_transactions(data)
+        for column in _DATE_COLUMNS:
+            data[column] = data[column].dt.strftime(_DATE_FORMAT)
+        rows = data.astype(object).where(data.notna(), None).itertuples(index=False, name=None)
+        sql = (
+            f"{statement} INTO transactions ({', '.join(TRANSACTION_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(TRANSACTION_COLUMNS))})"
+        )
+        with self.connection:
+            while batch := list(islice(rows, self.BATCH_SIZE)):
+                self.connection.executemany(sql, batch)
+        return len(data)
+
+    @staticmethod
+    def _where(
+        *,
+        accounts: Iterable[str] | None,
+        start: datetime | str | None,
+        end: datetime | str | None,
+    ) -> tuple[str, list[Any]]:
+        conditions: list[str] = []
+        params: list[Any] = []
+        if accounts is not None:
+            accounts = [str(account) for account in accounts]
+            conditions.append(f"account IN ({', '.join('?' * len(accounts))})")
+            params.extend(accounts)
+        if start is not None:
+            conditions.append("date >= ?")
+            params.append(pd.Timestamp(start).strftime(_DATE_FORMAT))
+        if end is not None:
+            conditions.append("date < ?")
+            params.append(pd.Timestamp(end).strftime(_DATE_FORMAT))
+        return (f" WHERE {' AND '.join(conditions)}" if conditions else ""), params
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from budgething.config import MINOR_UNITS
+from budgething.data_io.csv_data_reader import MetaColName
+
+MONEY_DTYPE = "Int64" if MINOR_UNITS else "float64"
+"""Dtype of amounts and balances, see `config.MINOR_UNITS`."""
+
+TRANSACTION_DTYPES: dict[str, str] = {
+    "date": "datetime64[ns]",
+    # When the bank applied the transaction to the balance, if not at "date" (e.g. Revolut)
+    "balance_date": "datetime64[ns]",
+    "amount": MONEY_DTYPE,
+    "currency": "string",
+    "balance": MONEY_DTYPE,
+    "category": "string",
+    "payment_type": "string",
+    "account": "string",
+    MetaColName.SOURCE.value: "string",
+    MetaColName.LINENO.value: "int64",
+}
+TRANSACTION_COLUMNS = tuple(TRANSACTION_DTYPES)
+
+
+def normalize_transactions(data: pd.DataFrame) -> pd.DataFrame:
+    """Bring parser output into the common transaction schema used by the stores.
+
+    Columns a parser does not produce (e.g. `balance` for Pekao24 or `category` for Revolut) are
+    added as missing values, extra columns are dropped and every column is cast to its
+    `TRANSACTION_DTYPES` dtype.
+    """
+    data = data.reindex(columns=list(TRANSACTION_COLUMNS))
+    source = MetaColName.SOURCE.value
+    if not pd.api.types.is_string_dtype(data[source]):
+        data[source] = data[source].map(str, na_action="ignore")
+    return data.astype(TRANSACTION_DTYPES)
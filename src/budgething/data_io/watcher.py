@@ -0,0 +1,178 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+from pathlib import Path
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Iterator, Literal, Protocol
+
+from budgething.data_io.manifest import FileKey
+
+WatcherBackend = Literal["auto", "inotify", "polling"]
+
+
+class _Backend(Protocol):
+    def wait(self, timeout: float) -> set[Path]:
+        """Block for at most `timeout` seconds and return the paths that changed meanwhile."""
+        ...
+
+    def close(self) -> None: ...
+
+
+class _InotifyBackend:
+    """Linux inotify through libc, reporting files that were closed after writing or moved in."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        watch = libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), self.IN_CLOSE_WRITE | self.IN_MOVED_TO
+        )
+        if watch < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for '{directory}'")
+
+    def wait(self, timeout: float) -> set[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        buffer = os.read(self._fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(buffer):
+            _, _, _, length = self._EVENT.unpack_from(buffer, offset)
+            offset += self._EVENT.size
+            name = buffer[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                changed.add(self.directory / os.fsdecode(name))
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """Portable fallback comparing (size, mtime, inode) of the directory entries."""
+
+    def __init__(self, directory: Path, interval: float):
+        self.directory = directory
+        self.interval = interval
+        self._state = self._scan()
+
+    def wait(self, timeout: float) -> set[Path]:
+        deadline = time.monotonic() + timeout
+        while True:
+            state = self._scan()
+            changed = {path for path, key in state.items() if self._state.get(path) != key}
+            self._state = state
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+    def _scan(self) -> dict[Path, FileKey]:
+        state = {}
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                path = Path(entry.path)
+                try:
+                    state[path] = FileKey.from_path(path)
+                except FileNotFoundError:
+                    continue
+        return state
+
+
+class DirectoryWatcher:
+    """Watch a directory and report new or changed files in debounced batches.
+
+    Uses inotify on Linux and falls back to polling elsewhere (or if inotify is unavailable).
+    A batch is only reported once no further changes were seen for `debounce` seconds, so a
+    file that is still being written, or a group of files dropped together, is handled once.
+
+    ## Example
+
+    >>> with DirectoryWatcher(DATA_PATH / "input", suffixes={".csv"}) as watcher:
+    ...     for paths in watcher.batches():
+    ...         ingest(paths)
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        suffixes: set[str] | None = None,
+        debounce: float = 0.2,
+        poll_interval: float = 0.5,
+        backend: WatcherBackend = "auto",
+    ):
+        """
+        Args:
+            directory (Path):
+                Directory to watch (not recursively).
+            suffixes (set[str] | None):
+                Only report files with these (case-insensitive) suffixes, e.g. {".csv"}.
+            debounce (float):
+                Seconds without new changes before a batch is reported.
+            poll_interval (float):
+                Seconds between directory scans of the polling backend.
+            backend (WatcherBackend):
+                "inotify", "polling", or "auto" to prefer inotify when available.
+        """
+        self.directory = directory
+        self.suffixes = None if suffixes is None else {suffix.lower() for suffix in suffixes}
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._backend = self._create_backend(backend)
+
+    def batches(self, stop: threading.Event | None = None) -> Iterator[set[Path]]:
+        """Yield sets of changed files until `stop` is set (or forever)."""
+        pending: set[Path] = set()
+        while stop is None or not stop.is_set():
+            changed = self._backend.wait(self.debounce if pending else self.poll_interval)
+            pending |= {path for path in changed if self._accepts(path)}
+            if pending and not changed:
+                batch = {path for path in pending if path.exists()}
+                pending = set()
+                if batch:
+                    yield batch
+
+    def close(self) -> None:
+        self._backend.close()
+
+    def __enter__(self) -> "DirectoryWatcher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _accepts(self, path: Path) -> bool:
+        return self.suffixes is None or path.suffix.lower() in self.suffixes
+
+    def _create_backend(self, backend: WatcherBackend) -> _Backend:
+        if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+            try:
+                return _InotifyBackend(self.directory)
+            except OSError as e:
+                if backend == "inotify":
+                    raise
+                logging.warning(f"inotify unavailable ({e}), falling back to polling")
+        elif backend == "inotify":
+            raise OSError("inotify is only available on Linux")
+        return _PollingBackend(self.directory, self.poll_interval)
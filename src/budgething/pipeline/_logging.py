@@ -2,11 +2,6 @@ import logging
 import os
 import sys
 
-# For cross-platform color support
-import colorama
-
-colorama.init()
-
 
 class CustomFormatter(logging.Formatter):
     COLORS = {
@@ -39,9 +34,15 @@ class CustomFormatter(logging.Formatter):
 
 
 def configure_logging(level: int = logging.DEBUG) -> None:
+    # For cross-platform color support
+    import colorama
+
+    colorama.init()
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(CustomFormatter())
 
     root = logging.getLogger()
     root.setLevel(level)
     root.handlers = [handler]
+    # pdfminer logs every parsed PDF object at DEBUG level
+    logging.getLogger("pdfminer").setLevel(max(level, logging.INFO))
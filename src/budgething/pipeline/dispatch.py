@@ -0,0 +1,55 @@
+import logging
+from typing import Iterable, NamedTuple
+
+from budgething.data_io.csv_data_reader import UnknownDelimiterError
+from budgething.data_io.pdf_data_reader import InputFile, PDFExtractionError
+from budgething.pipeline.parsers.registry import Parser, load_parsers
+
+
+class DispatchResult(NamedTuple):
+    """Input files grouped by the parser that can handle them."""
+
+    routed: dict[Parser, list[InputFile]]
+    ambiguous: list[InputFile]
+    unmatched: list[InputFile]
+
+
+def dispatch_files(
+    files: Iterable[InputFile],
+    registry: list[tuple[set[str], Parser]] | None = None,
+) -> DispatchResult:
+    """Route every file to the single parser whose required fields are a subset of its header.
+
+    Each file's header is read only once, no matter how many parsers are registered. Files that
+    match more than one parser are reported as ambiguous, files that match none (or whose header
+    cannot be read) as unmatched, and neither kind is routed anywhere. `registry` defaults to
+    all parsers of `PARSER_MODULES`.
+    """
+    if registry is None:
+        registry = load_parsers()
+    routed: dict[Parser, list[InputFile]] = {}
+    ambiguous: list[InputFile] = []
+    unmatched: list[InputFile] = []
+
+    for csv_file in files:
+        try:
+            schema = csv_file.schema
+        except (UnknownDelimiterError, PDFExtractionError, OSError, UnicodeDecodeError) as e:
+            logging.warning(f"Skipping '{csv_file.filepath}': {e}")
+            unmatched.append(csv_file)
+            continue
+
+        matches = [parser for required, parser in registry if required.issubset(schema)]
+        if len(matches) == 1:
+            routed.setdefault(matches[0], []).append(csv_file)
+        elif matches:
+            logging.warning(
+                f"'{csv_file.filepath}' matches several parsers: "
+                f"{', '.join(parser.__name__ for parser in matches)}"
+            )
+            ambiguous.append(csv_file)
+        else:
+            logging.warning(f"No parser found for '{csv_file.filepath}'")
+            unmatched.append(csv_file)
+
+    return DispatchResult(routed, ambiguous, unmatched)
@@ -0,0 +1,139 @@
+import logging
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+from budgething.data_io.csv_data_reader import read_csv_files
+from budgething.data_io.manifest import FileManifest
+from budgething.data_io.parquet_store import ParquetTransactionStore
+from budgething.data_io.pdf_data_reader import InputFile
+from budgething.data_io.snapshot import append_snapshot, list_snapshots, write_snapshot
+from budgething.data_io.transaction_schema import normalize_transactions
+from budgething.pipeline.dispatch import dispatch_files
+from budgething.pipeline.process.aggregate_cube import AggregateCube
+from budgething.pipeline.process.eod_book import EODBalanceBook
+from budgething.pipeline.parsers.registry import PARSER_READ_SPECS
+from budgething.pipeline.pretransform.deduplicate import (
+    FingerprintSet,
+    drop_duplicate_transactions,
+)
+from budgething.pipeline.pretransform.recostruct_balance import find_balance_breaks
+
+
+class Ingestor:
+    """Parse input files and merge only their new transactions into storage.
+
+    Shared by the batch run and watch mode: every call touches just the given files and the
+    transactions they add, never the rest of the history.
+    """
+
+    SNAPSHOT_NAME = "transactions"
+
+    def __init__(
+        self,
+        *,
+        manifest: FileManifest,
+        store: ParquetTransactionStore,
+        fingerprints: FingerprintSet,
+        snapshot_path: Path,
+        eod_balances: EODBalanceBook | None = None,
+        cube: AggregateCube | None = None,
+    ):
+        self.manifest = manifest
+        self.store = store
+        self.fingerprints = fingerprints
+        self.snapshot_path = snapshot_path
+        self.eod_balances = eod_balances
+        self.cube = cube
+
+    def ingest(self, files: Iterable[InputFile]) -> pd.DataFrame:
+        """Parse, deduplicate and store `files`, then refresh the data derived from them.
+
+        Returns:
+            pd.DataFrame: Normalized transactions that were not stored before.
+        """
+        dispatched = dispatch_files(files)
+        new = []
+        try:
+            for parser, parser_files in dispatched.routed.items():
+                data = read_csv_files(
+                    parser_files, add_meta=True, strip=True, spec=PARSER_READ_SPECS[parser]
+                )
+                new.append(self.store_parsed(parser(data), parser_files))
+                logging.info(
+                    f"{parser.__name__}: {len(new[-1])} new transaction(s) "
+                    f"from {len(parser_files)} file(s)"
+                )
+        except Exception:
+            # Whatever was stored before the failure still has to reach the derived data
+            self.finish(new)
+            raise
+        return self.finish(new)
+
+    def store_parsed(self, parsed: pd.DataFrame, files: Iterable[InputFile]) -> pd.DataFrame:
+        """Store the not yet seen part of parser output and mark its source files as ingested.
+
+        Returns:
+            pd.DataFrame: Normalized transactions that were not stored before.
+        """
+        new = drop_duplicate_transactions(parsed, self.fingerprints)
+        if not (breaks := find_balance_breaks(new)).empty:
+            logging.warning(
+                f"{len(breaks)} transaction(s) do not add up to their reported balance\n{breaks}"
+            )
+        transactions = normalize_transactions(new)
+        self.store.create(transactions)
+        self.manifest.mark_ingested(csv_file.sha256 for csv_file in files)
+        return transactions
+
+    def finish(self, new: list[pd.DataFrame]) -> pd.DataFrame:
+        """Persist the state, then refresh derived data with everything `store_parsed` returned.
+
+        The fingerprints and manifest are saved first, so a failing refresh cannot make the next
+        run store the same transactions again.
+
+        Returns:
+            pd.DataFrame: All new transactions, concatenated.
+        """
+        new_transactions = normalize_transactions(
+            pd.concat(new, ignore_index=True) if new else pd.DataFrame()
+        )
+        self.fingerprints.save()
+        self.manifest.save()
+        if not new_transactions.empty:
+            self.refresh(new_transactions)
+        if self.eod_balances is not None:
+            self.seed_eod_balances()
+        return new_transactions
+
+    def seed_eod_balances(self) -> None:
+        """Rebuild the end of day balances the book has a latest balance, but no checkpoint for.
+
+        Each is rebuilt from all stored transactions of its account. Accounts without stored
+        transactions are left for a later call.
+        """
+        for account, latest_balance in self.eod_balances.latest_balances.items():
+            if account in self.eod_balances:
+                continue
+            transactions = self.store.read(columns=["date", "amount"], accounts=[account])
+            if transactions.empty:
+                continue
+            self.eod_balances.rebuild(account, transactions, latest_balance)
+            logging.info(f"{account}: end of day balance rebuilt from the latest balance")
+
+    def refresh(self, new_transactions: pd.DataFrame) -> None:
+        """Update the data derived from stored transactions with newly stored ones."""
+        if self.SNAPSHOT_NAME in list_snapshots(self.snapshot_path):
+            append_snapshot(self.snapshot_path, self.SNAPSHOT_NAME, new_transactions)
+        else:
+            write_snapshot(self.snapshot_path, **{self.SNAPSHOT_NAME: self.store.get_all()})
+        if self.eod_balances is not None:
+            for account, transactions in new_transactions.groupby("account", observed=True):
+                if account in self.eod_balances:
+                    self.eod_balances.update(account, transactions)
+        if self.cube is not None:
+            if self.cube.built:
+                self.cube.update(new_transactions)
+            else:
+                self.cube.rebuild(self.store.get_all())
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+MINOR_UNIT_DIGITS: dict[str, int] = {
+    "BHD": 3,
+    "CLP": 0,
+    "IQD": 3,
+    "ISK": 0,
+    "JOD": 3,
+    "JPY": 0,
+    "KRW": 0,
+    "KWD": 3,
+    "LYD": 3,
+    "OMR": 3,
+    "TND": 3,
+    "UGX": 0,
+    "VND": 0,
+}
+"""ISO 4217 minor unit digits of currencies that do not use the usual two (e.g. PLN grosze)."""
+DEFAULT_MINOR_UNIT_DIGITS = 2
+
+
+def minor_unit_digits(currency: pd.Series | str) -> pd.Series | int:
+    """Number of decimal digits of the minor unit of each currency."""
+    if isinstance(currency, str):
+        return MINOR_UNIT_DIGITS.get(currency.upper(), DEFAULT_MINOR_UNIT_DIGITS)
+    return (
+        currency.str.upper()
+        .map(MINOR_UNIT_DIGITS)
+        .fillna(DEFAULT_MINOR_UNIT_DIGITS)
+        .astype("int64")
+    )
+
+
+def to_minor_units(amounts: pd.Series, currency: pd.Series | str) -> pd.Series:
+    """Convert decimal amounts into `Int64` minor units, e.g. 12.34 PLN into 1234 grosze.
+
+    Amounts are rounded to the nearest minor unit, which recovers the exact value of any amount
+    that was written with at most the currency's number of decimal digits.
+    """
+    scale = 10.0 ** np.asarray(minor_unit_digits(currency))
+    return (amounts * scale).round().astype("Int64")
+
+
+def from_minor_units(amounts: pd.Series, currency: pd.Series | str) -> pd.Series:
+    """Convert `Int64` minor units back into decimal amounts, for presentation only."""
+    scale = 10.0 ** np.asarray(minor_unit_digits(currency))
+    return amounts.astype("float64") / scale
@@ -1,8 +1,3 @@
-from .registry import PARSER_REGISTRY
-from ..pretransform.interpolate_timestamps import repair_data_pipeline
+from .registry import PARSER_REGISTRY, load_parsers
 
-# Needed to register parsers
-from . import revolut
-from . import pekao24
-
-__all__ = ["PARSER_REGISTRY", "fixes"]
+__all__ = ["PARSER_REGISTRY", "load_parsers"]
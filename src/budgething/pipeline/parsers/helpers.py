@@ -1,14 +1,157 @@
+import threading
+from typing import Mapping, NamedTuple
+
+import numpy as np
 import pandas as pd
 
+from budgething.data_io.csv_data_reader import MetaColName
+
+DATE_CACHE_SIZE = 1 << 16
+"""Maximum number of parsed date strings remembered per format."""
+
+_date_cache: dict[str, pd.Series] = {}
+_date_cache_lock = threading.Lock()
+
+
+class AmountFormat(NamedTuple):
+    """How a bank writes amounts, e.g. "-1 234,56" is `AmountFormat(decimal=",")`.
+
+    `grouping` characters (thousands separators) are dropped wherever they appear. A trailing
+    minus ("12.00-") and accounting parentheses ("(12.00)") are only read as negative amounts
+    when enabled.
+    """
+
+    decimal: str = "."
+    grouping: str = " \u00a0\u202f"
+    trailing_minus: bool = False
+    parentheses: bool = False
+
+
+def parse_amounts(
+    sr: pd.Series, fmt: AmountFormat = AmountFormat(), *, digits: pd.Series | int | None = None
+) -> pd.Series:
+    """Parse a column of amount strings. Unparseable cells become missing values.
+
+    Every distinct string is translated in a single pass that drops the grouping characters and
+    swaps the decimal mark, so the cost grows with distinct values rather than rows. Use
+    `invalid_cells` to report which cells were set to missing.
+
+    Args:
+        sr (pd.Series):
+            Amounts as written in the statement.
+        fmt (AmountFormat):
+            How the bank writes amounts.
+        digits (pd.Series | int | None):
+            Minor unit digits of each amount's currency, see `money.minor_unit_digits`. If
+            given, amounts are parsed exactly into `Int64` minor units without going through
+            floats, otherwise into `float64`.
+    """
+    if pd.api.types.is_numeric_dtype(sr):
+        if digits is None:
+            return sr.astype(float)
+        return (sr.astype(float) * 10.0 ** np.asarray(digits)).round().astype("Int64")
+    codes, uniques = pd.factorize(sr)
+    text = _normalize_amounts(pd.Series(uniques, dtype=object), fmt)
+    if digits is not None:
+        return _parse_minor_units(text, codes, digits).set_axis(sr.index).rename(sr.name)
+    parsed = pd.to_numeric(text, errors="coerce").to_numpy(dtype=float)
+    # Missing values have code -1, which picks the trailing NaN
+    return pd.Series(np.append(parsed, np.nan)[codes], index=sr.index, name=sr.name)
+
+
+def _normalize_amounts(text: pd.Series, fmt: AmountFormat) -> pd.Series:
+    """Rewrite amounts as plain "-1234.56" strings."""
+    text = text.str.translate(str.maketrans({**dict.fromkeys(fmt.grouping), fmt.decimal: "."}))
+    if fmt.trailing_minus:
+        negative = text.str.endswith("-")
+        text[negative] = "-" + text[negative].str[:-1]
+    if fmt.parentheses:
+        negative = text.str.startswith("(") & text.str.endswith(")")
+        text[negative] = "-" + text[negative].str[1:-1]
+    return text
+
 
-def asfloat(sr: pd.Series) -> pd.Series:
-    if not pd.api.types.is_numeric_dtype(sr):
-        sr = sr.str.replace(",", ".").str.replace(" ", "").astype(float)
-    return sr
+def _parse_minor_units(text: pd.Series, codes: np.ndarray, digits: pd.Series | int) -> pd.Series:
+    """Integer amounts in minor units from plain amount strings, rounding half away from zero."""
+    parts = text.str.extract(r"^([+-]?)(\d*)(?:\.(\d*))?$")
+    sign, fraction = parts[0], parts[2].fillna("")
+    mantissa = pd.to_numeric(
+        parts[1] + fraction, errors="coerce", dtype_backend="numpy_nullable"
+    ).astype("Int64")
+    mantissa = mantissa.where(sign != "-", -mantissa)
+    # Missing values have code -1, which picks the trailing missing value
+    values = pd.concat([mantissa, pd.Series([pd.NA], dtype="Int64")], ignore_index=True)
+    values = values.take(codes).reset_index(drop=True)
+    shift = np.asarray(digits) - np.append(fraction.str.len().to_numpy(), 0)[codes]
+    shift = np.broadcast_to(shift, len(values))
+    if (shift >= 0).all():
+        return values * 10 ** shift
+    divisor = 10 ** np.maximum(-shift, 0)
+    rounded = (values.abs() + divisor // 2) // divisor * np.sign(values)
+    return rounded.where(shift < 0, values * 10 ** np.maximum(shift, 0))
+
+
+def invalid_cells(data: pd.DataFrame, parsed: Mapping[str, pd.Series]) -> pd.DataFrame:
+    """Cells of `data` that were given, but came out of parsing as missing.
+
+    Args:
+        data (pd.DataFrame):
+            Raw input, with `MetaColName` columns if the file was read with `add_meta=True`.
+        parsed (Mapping[str, pd.Series]):
+            Parsed values by the name of the `data` column they were parsed from.
+
+    Returns:
+        pd.DataFrame: "column" and raw "value" of each invalid cell, indexed by source and
+            line number (or by the index of `data` when it has no meta columns).
+    """
+    meta = [col for col in MetaColName.astuple() if col in data.columns]
+    reports = [
+        data.loc[invalid, meta].assign(column=column, value=data.loc[invalid, column])
+        for column, values in parsed.items()
+        if (invalid := values.isna() & data[column].notna()).any()
+    ]
+    report = pd.concat(reports) if reports else pd.DataFrame(columns=[*meta, "column", "value"])
+    return report.set_index(meta) if meta else report
 
 
 def get_date(df: pd.DataFrame, fmt: str) -> pd.Series:
-    df = df.copy()
-    for col in df.columns:
-        df[col] = pd.to_datetime(df[col], format=fmt)
-    return df.min(axis=1)
+    """Earliest of the dates in each row of `df`, ignoring missing ones.
+
+    ## Example
+
+    >>> get_date(df[["Data waluty", "Data księgowania"]], "%d.%m.%Y")
+    """
+    earliest = np.fmin.reduce([parse_dates(df[col], fmt) for col in df.columns])
+    return pd.Series(earliest, index=df.index)
+
+
+def parse_dates(sr: pd.Series, fmt: str) -> np.ndarray:
+    """Parse a column of date strings into a `datetime64[ns]` array.
+
+    Statements repeat the same few hundred dates over thousands of rows, so only the distinct
+    strings are parsed, and strings parsed before (e.g. in an earlier file of the same run) are
+    taken from a cache. The cost grows with the number of new distinct dates, not with rows.
+    """
+    codes, uniques = pd.factorize(sr)
+    parsed = _parse_unique_dates(pd.Index(uniques), fmt)
+    # Missing values have code -1, which picks the trailing NaT
+    return np.append(parsed, np.datetime64("NaT", "ns"))[codes]
+
+
+def clear_date_cache() -> None:
+    with _date_cache_lock:
+        _date_cache.clear()
+
+
+def _parse_unique_dates(uniques: pd.Index, fmt: str) -> np.ndarray:
+    with _date_cache_lock:
+        cache = _date_cache.get(fmt)
+    if cache is None or len(cache) > DATE_CACHE_SIZE:
+        cache = pd.Series([], index=pd.Index([], dtype=object), dtype="datetime64[ns]")
+    missing = uniques.difference(cache.index, sort=False)
+    if len(missing):
+        parsed = pd.to_datetime(missing, format=fmt).as_unit("ns")
+        cache = pd.concat([cache, pd.Series(parsed, index=missing)])
+        with _date_cache_lock:
+            _date_cache[fmt] = cache
+    return cache.reindex(uniques).to_numpy()
@@ -1,16 +1,55 @@
-from typing import Callable
+import importlib
+from typing import Any, Callable
 
 import pandas as pd
 
+from budgething.data_io.csv_data_reader import ReadSpec
+
 Parser = Callable[[pd.DataFrame], pd.DataFrame]
 PARSER_REGISTRY: list[tuple[set[str], Parser]] = []
+PARSER_READ_SPECS: dict[Parser, ReadSpec] = {}
+PARSER_MODULES: list[str] = [
+    "budgething.pipeline.parsers.revolut",
+    "budgething.pipeline.parsers.pekao24",
+]
+"""Modules that register parsers when imported. Add a bank by appending its module here."""
+
+
+def load_parsers() -> list[tuple[set[str], Parser]]:
+    """Import the modules of `PARSER_MODULES` not imported yet and return `PARSER_REGISTRY`.
+
+    Parser modules are only imported once files are dispatched, so importing the pipeline does
+    not pay for every bank.
+    """
+    for module in PARSER_MODULES:
+        importlib.import_module(module)
+    return PARSER_REGISTRY
+
 
+def _register_parser(
+    required_fields: set[str],
+    *,
+    columns: set[str] | None = None,
+    dtype: dict[str, Any] | None = None,
+) -> Callable:
+    """Decorator to register a parser function with its required fields.
 
-def _register_parser(required_fields: set[str]) -> Callable:
-    """Decorator to register a parser function with its required fields."""
+    Args:
+        required_fields (set[str]):
+            Columns a file must contain for the parser to handle it.
+        columns (set[str] | None):
+            All columns the parser reads, which may include optional ones. Other columns are
+            not loaded from the file. Defaults to `required_fields`.
+        dtype (dict[str, Any] | None):
+            Dtypes to parse some of the `columns` with.
+    """
 
     def decorator(func: Parser) -> Parser:
         PARSER_REGISTRY.append((required_fields, func))
+        PARSER_READ_SPECS[func] = ReadSpec(
+            usecols=frozenset(required_fields if columns is None else required_fields | columns),
+            dtype=dtype,
+        )
         return func
 
     return decorator
@@ -1,44 +1,23 @@
-import logging
-import pandas as pd
-
-from budgething.data_io.csv_data_reader import MetaColName
 from budgething.pipeline.models import Account
-from budgething.pipeline.parsers.helpers import asfloat, get_date
-from budgething.pipeline.parsers.registry import _register_parser
-
-REVOLUT_REQUIRED_FIELDS = {
-    "Started Date",
-    "Completed Date",
-    "Amount",
-    "Balance",
-    "Currency",
-    "Type",
-}
-
-
-@_register_parser(REVOLUT_REQUIRED_FIELDS)
-def _map_revolut_data(transactions: pd.DataFrame) -> pd.DataFrame:
-
-    df = pd.DataFrame(transactions)
-
+from budgething.pipeline.parsers.spec import BankSpec, Column, ColumnKind, RowFilter, register_bank
+
+REVOLUT_SPEC = BankSpec(
+    account=Account.REVOLUT,
+    dates=("Started Date", "Completed Date"),
+    date_format="%Y-%m-%d %H:%M:%S",
+    columns={
+        "amount": Column("Amount", ColumnKind.AMOUNT),
+        # Not stored, but part of the balance change that reconciliation checks
+        "fee": Column("Fee", ColumnKind.AMOUNT),
+        "currency": Column("Currency", ColumnKind.UPPER),
+        "balance": Column("Balance", ColumnKind.AMOUNT),
+        "payment_type": Column("Type"),
+    },
     # Remove reverted/cancelled transactions
-    df = df[~((df["State"] == "REVERTED") & df["Completed Date"].isna() & df["Balance"].isna())]
-
-    df["date"] = get_date(df[["Started Date", "Completed Date"]], "%Y-%m-%d %H:%M:%S")
-    df["amount"] = asfloat(df["Amount"])
-    df["balance"] = asfloat(df["Balance"])
-    df["currency"] = df["Currency"].str.upper()
-    df["payment_type"] = df["Type"]
-    df = df.assign(account=Account.REVOLUT)
+    drop=(RowFilter({"State": "REVERTED", "Completed Date": None, "Balance": None}),),
+    optional=frozenset({"State", "Fee"}),
+    # Balances are applied when a transaction completes, not when it starts
+    balance_date="Completed Date",
+)
 
-    return df[
-        [
-            "date",
-            "amount",
-            "currency",
-            "balance",
-            "payment_type",
-            "account",
-            *MetaColName.astuple(),
-        ]
-    ]
+_map_revolut_data = register_bank(REVOLUT_SPEC)
@@ -0,0 +1,176 @@
+from enum import Enum
+import logging
+from typing import Mapping, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from budgething.config import MINOR_UNITS
+from budgething.data_io.csv_data_reader import MetaColName
+from budgething.pipeline.money import DEFAULT_MINOR_UNIT_DIGITS, minor_unit_digits
+from budgething.pipeline.models import Account
+from budgething.pipeline.parsers.helpers import (
+    AmountFormat,
+    get_date,
+    invalid_cells,
+    parse_amounts,
+    parse_dates,
+)
+from budgething.pipeline.parsers.registry import Parser, _register_parser
+from budgething.pipeline.pretransform.interpolate_timestamps import BALANCE_DATE
+
+
+class ColumnKind(Enum):
+    """How a statement column is converted into an output column."""
+
+    TEXT = "text"
+    UPPER = "upper"
+    AMOUNT = "amount"
+
+
+class Column(NamedTuple):
+    source: str
+    kind: ColumnKind = ColumnKind.TEXT
+
+
+class RowFilter(NamedTuple):
+    """Rows to drop: those where every column equals its value, None standing for a missing value.
+
+    A filter on a column that the file does not contain never matches.
+    """
+
+    conditions: Mapping[str, str | None]
+
+
+class BankSpec(NamedTuple):
+    """Declarative description of how a bank's statement maps onto transactions.
+
+    The transaction date is the earliest of the `dates` columns, `columns` lists the other
+    output columns in order, and rows matching any of the `drop` filters are left out. AMOUNT
+    columns are written in the `amounts` format; cells that cannot be parsed become NaN and are
+    logged with their source file and line number. `optional` columns are read when present,
+    but a file does not need them to match the spec; output columns read from a missing one are
+    left out. `balance_date` names the date column whose order the bank applies transactions to
+    the balance in, when that differs from the transaction date; it is output as `BALANCE_DATE`
+    (falling back to the transaction date where it is missing) and stored with the transaction.
+
+    ## Example
+
+    >>> register_bank(
+    ...     BankSpec(
+    ...         account=Account.PEKAO24,
+    ...         dates=("Data waluty", "Data księgowania"),
+    ...         date_format="%d.%m.%Y",
+    ...         columns={"amount": Column("Kwota operacji", ColumnKind.AMOUNT)},
+    ...         amounts=AmountFormat(decimal=","),
+    ...     )
+    ... )
+    """
+
+    account: Account
+    dates: tuple[str, ...]
+    date_format: str
+    columns: Mapping[str, Column]
+    amounts: AmountFormat = AmountFormat()
+    drop: tuple[RowFilter, ...] = ()
+    optional: frozenset[str] = frozenset()
+    balance_date: str | None = None
+
+    @property
+    def fields(self) -> set[str]:
+        """All statement columns the spec reads."""
+        return {
+            *self.dates,
+            *([self.balance_date] if self.balance_date else []),
+            *(column.source for column in self.columns.values()),
+            *(name for row_filter in self.drop for name in row_filter.conditions),
+        }
+
+    @property
+    def required_fields(self) -> set[str]:
+        return self.fields - self.optional
+
+
+def compile_spec(
+    spec: BankSpec, name: str | None = None, *, minor_units: bool = MINOR_UNITS
+) -> Parser:
+    """Turn `spec` into a parser that builds its output in a single pass.
+
+    The filters are applied first, so later conversions only see the kept rows, and every output
+    column is converted straight from the input into the result, which is allocated once.
+    Nothing is added to or copied from the input frame column by column.
+
+    With `minor_units`, AMOUNT columns are parsed into `Int64` minor units of the "currency"
+    output column (or of `DEFAULT_MINOR_UNIT_DIGITS` if the spec has none).
+    """
+
+    def parser(transactions: pd.DataFrame) -> pd.DataFrame:
+        if spec.drop:
+            transactions = transactions[~_drop_mask(transactions, spec.drop)]
+        columns = {
+            output: column
+            for output, column in spec.columns.items()
+            if column.source in transactions.columns or column.source not in spec.optional
+        }
+        converted = {
+            output: _convert(transactions[column.source], column.kind)
+            for output, column in columns.items()
+            if column.kind != ColumnKind.AMOUNT
+        }
+        digits = None
+        if minor_units:
+            currency = converted.get("currency")
+            digits = DEFAULT_MINOR_UNIT_DIGITS if currency is None else minor_unit_digits(currency)
+        amounts = {
+            column.source: parse_amounts(transactions[column.source], spec.amounts, digits=digits)
+            for column in columns.values()
+            if column.kind == ColumnKind.AMOUNT
+        }
+        if not (invalid := invalid_cells(transactions, amounts)).empty:
+            logging.warning(
+                f"{parser.__name__}: {len(invalid)} unparseable amount(s) set to missing\n{invalid}"
+            )
+
+        data = {"date": get_date(transactions[list(spec.dates)], spec.date_format)}
+        if spec.balance_date:
+            applied = parse_dates(transactions[spec.balance_date], spec.date_format)
+            data[BALANCE_DATE] = np.where(np.isnat(applied), data["date"], applied)
+        for output, column in columns.items():
+            is_amount = column.kind == ColumnKind.AMOUNT
+            data[output] = amounts[column.source] if is_amount else converted[output]
+        data["account"] = spec.account
+        for meta in MetaColName.astuple():
+            if meta in transactions.columns:
+                data[meta] = transactions[meta]
+        return pd.DataFrame(data, index=transactions.index)
+
+    parser.__name__ = parser.__qualname__ = name or f"_map_{spec.account}_data"
+    return parser
+
+
+def register_bank(spec: BankSpec, name: str | None = None) -> Parser:
+    """Compile `spec` and register the parser for files that contain its required fields."""
+    parser = compile_spec(spec, name)
+    return _register_parser(
+        spec.required_fields, columns=spec.fields, dtype=dict.fromkeys(spec.fields, str)
+    )(parser)
+
+
+def _drop_mask(data: pd.DataFrame, filters: tuple[RowFilter, ...]) -> pd.Series:
+    drop = pd.Series(False, index=data.index)
+    for row_filter in filters:
+        if not set(row_filter.conditions) <= set(data.columns):
+            continue
+        matches = pd.Series(True, index=data.index)
+        for name, value in row_filter.conditions.items():
+            matches &= data[name].isna() if value is None else data[name] == value
+        drop |= matches
+    return drop
+
+
+def _convert(sr: pd.Series, kind: ColumnKind) -> pd.Series:
+    match kind:
+        case ColumnKind.TEXT:
+            return sr
+        case ColumnKind.UPPER:
+            return sr.str.upper()
@@ -0,0 +1,126 @@
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from budgething.data_io.csv_data_reader import MetaColName
+from budgething.data_io.transaction_schema import normalize_transactions
+
+DEDUP_COLUMNS = ("date", "amount", "currency", "balance", "account")
+
+
+def fingerprint_transactions(
+    data: pd.DataFrame, columns: Iterable[str] = DEDUP_COLUMNS
+) -> np.ndarray:
+    """64-bit fingerprint of every transaction, computed from normalized `columns`.
+
+    Identical rows within one source file (e.g. two equal card payments on the same day in a
+    statement without balances) are told apart by their occurrence number within that file, so
+    the n-th copy in one export matches the n-th copy in an overlapping export instead of all
+    copies collapsing into one.
+    """
+    columns = list(columns)
+    normalized = normalize_transactions(data)[columns]
+    keys = [normalized[col] for col in columns]
+    if (source := MetaColName.SOURCE.value) in data.columns:
+        keys.append(data[source].astype(str))
+    occurrence = normalized.groupby(keys, dropna=False, sort=False).cumcount()
+    return pd.util.hash_pandas_object(
+        normalized.assign(occurrence=occurrence.to_numpy()), index=False
+    ).to_numpy()
+
+
+class FingerprintSet:
+    """Persistent set of transaction fingerprints kept as sorted `uint64` arrays.
+
+    Membership checks are a binary search per new fingerprint, so checking an incremental
+    ingest costs O(new rows * log(history)) and never re-sorts the stored history. New
+    fingerprints go to a small sorted buffer, which is merged into the history only by `save`
+    (or once it has grown to a fraction of the history), so adding a batch does not copy the
+    whole history.
+    """
+
+    MERGE_FRACTION = 8
+    """The buffer is merged once it holds more than 1/`MERGE_FRACTION` of the history."""
+
+    def __init__(self, path: Path | None = None):
+        """
+        Args:
+            path (Path | None):
+                `.npy` file to load the set from and save it to. In-memory only if None.
+        """
+        self.path = path
+        if path is not None and path.exists():
+            self._fingerprints = np.load(path)
+        else:
+            self._fingerprints = np.empty(0, dtype=np.uint64)
+        self._pending = np.empty(0, dtype=np.uint64)
+
+    def contains(self, fingerprints: np.ndarray) -> np.ndarray:
+        """Boolean mask of which `fingerprints` are already in the set."""
+        return _sorted_contains(self._fingerprints, fingerprints) | _sorted_contains(
+            self._pending, fingerprints
+        )
+
+    def add(self, fingerprints: np.ndarray) -> None:
+        """Add `fingerprints` to the buffer of new fingerprints."""
+        new = np.unique(fingerprints)
+        new = new[~self.contains(new)]
+        self._pending = _sorted_insert(self._pending, new)
+        if len(self._pending) * self.MERGE_FRACTION > len(self._fingerprints):
+            self._merge()
+
+    def save(self) -> None:
+        if self.path is None:
+            raise ValueError("Cannot save a FingerprintSet without a path.")
+        self._merge()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("wb") as file:
+            np.save(file, self._fingerprints)
+
+    def _merge(self) -> None:
+        if len(self._pending):
+            self._fingerprints = _sorted_insert(self._fingerprints, self._pending)
+            self._pending = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._fingerprints) + len(self._pending)
+
+
+def _sorted_contains(sorted_values: np.ndarray, values: np.ndarray) -> np.ndarray:
+    positions = np.searchsorted(sorted_values, values)
+    found = positions < len(sorted_values)
+    found[found] = sorted_values[positions[found]] == values[found]
+    return found
+
+
+def _sorted_insert(sorted_values: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """Merge sorted `new` values, none of which are in `sorted_values` yet, in linear time."""
+    return np.insert(sorted_values, np.searchsorted(sorted_values, new), new)
+
+
+def drop_duplicate_transactions(
+    data: pd.DataFrame,
+    seen: FingerprintSet | None = None,
+    columns: Iterable[str] = DEDUP_COLUMNS,
+) -> pd.DataFrame:
+    """Drop transactions that appear more than once in `data` or were already seen.
+
+    Args:
+        data (pd.DataFrame):
+            Parser output, possibly from several overlapping exports.
+        seen (FingerprintSet | None):
+            Fingerprints of previously ingested transactions. The fingerprints of the returned
+            (new) transactions are added to it.
+        columns (Iterable[str]):
+            Normalized columns identifying a transaction.
+    """
+    if data.empty:
+        return data
+    fingerprints = fingerprint_transactions(data, columns)
+    keep = ~pd.Series(fingerprints).duplicated().to_numpy()
+    if seen is not None:
+        keep &= ~seen.contains(fingerprints)
+        seen.add(fingerprints[keep])
+    return data[keep]
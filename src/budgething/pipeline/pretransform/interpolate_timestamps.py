@@ -0,0 +1,148 @@
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+BALANCE_KEYS = ("account", "currency")
+"""Columns identifying one running balance."""
+BALANCE_DATE = "balance_date"
+"""Optional column with the time a transaction changed the balance, if that is not "date"."""
+BALANCE_TOLERANCE = 0.005
+"""Largest difference between two float balances that still counts as equal (half a cent)."""
+
+
+def balance_dates(data: pd.DataFrame) -> tuple[pd.DataFrame, str]:
+    """`data` and its column with the time each transaction changed the balance.
+
+    That is `BALANCE_DATE`, with the "date" of rows that have none filled in, when `data` has
+    it, and "date" otherwise.
+    """
+    if BALANCE_DATE not in data.columns:
+        return data, "date"
+    return data.assign(**{BALANCE_DATE: data[BALANCE_DATE].fillna(data["date"])}), BALANCE_DATE
+
+
+def balance_change(data: pd.DataFrame) -> pd.Series:
+    """How much each transaction changes the balance: its amount less its "fee", if any."""
+    if "fee" not in data.columns:
+        return data["amount"]
+    return data["amount"] - data["fee"].fillna(0)
+
+
+def order_tied_transactions(
+    data: pd.DataFrame,
+    *,
+    keys: Sequence[str] = BALANCE_KEYS,
+    tolerance: float = BALANCE_TOLERANCE,
+    date: str = "date",
+) -> pd.DataFrame:
+    """Sort transactions by `keys` and `date`, ordering rows with the same timestamp by balance.
+
+    Within a group of rows sharing account, currency and timestamp, a row's successor is the row
+    whose balance before it ("balance" less the change) equals the row's "balance". When this
+    links the whole group into a single chain, the group is put in chain order; otherwise (no
+    balances, ambiguous or broken chains) its rows keep their input order. Successors are found
+    by a hash join of the tied rows only and chains are ranked by pointer jumping, so resolving
+    ties costs little more than linear time on top of the sort.
+    """
+    keys = [key for key in keys if key in data.columns]
+    codes = [pd.factorize(data[key])[0] for key in keys]
+    # lexsort is stable and sorts by its last key first
+    data = data.iloc[np.lexsort([data[date].to_numpy(), *reversed(codes)])]
+    groups = _tie_groups(data, keys, date)
+    size = np.bincount(groups)[groups]
+    tied = size > 1
+    if not tied.any() or "balance" not in data.columns:
+        return data
+
+    position = np.zeros(len(data), dtype=np.int64)
+    tied_groups = np.unique(groups[tied], return_inverse=True)[1]
+    position[tied] = _chain_positions(data[tied], tied_groups, tolerance)
+    return data.iloc[np.lexsort([position, groups])]
+
+
+def interpolate_timestamps(
+    data: pd.DataFrame,
+    *,
+    step: pd.Timedelta = pd.Timedelta(1, "us"),
+    keys: Sequence[str] = BALANCE_KEYS,
+    tolerance: float = BALANCE_TOLERANCE,
+) -> pd.DataFrame:
+    """`order_tied_transactions`, then spread tied timestamps `step` apart in that order.
+
+    Transactions are ordered, and their timestamps spread, by `balance_dates`. Afterwards
+    timestamps are unique within an account and currency, so any later sort by them (e.g. in
+    `extract_eod_balance`) keeps the order in which the balances were reported. Only use it on
+    stored transactions, as the shifted dates change their fingerprints.
+    """
+    keys = [key for key in keys if key in data.columns]
+    data, date = balance_dates(data)
+    data = order_tied_transactions(data, keys=keys, tolerance=tolerance, date=date)
+    groups = _tie_groups(data, keys, date)
+    starts = np.flatnonzero(np.append(True, groups[1:] != groups[:-1]))
+    offset = np.arange(len(data)) - starts[groups]
+    return data.assign(**{date: data[date] + offset * step})
+
+
+def _tie_groups(data: pd.DataFrame, keys: list[str], date: str) -> np.ndarray:
+    """Number of the run of equal `keys` and `date` that each row of sorted `data` belongs to."""
+    if data.empty:
+        return np.zeros(0, dtype=np.int64)
+    new = np.zeros(len(data), dtype=bool)
+    new[0] = True
+    for column in [*keys, date]:
+        codes = pd.factorize(data[column])[0]
+        new[1:] |= codes[1:] != codes[:-1]
+    return np.cumsum(new) - 1
+
+
+def _chain_positions(tied: pd.DataFrame, groups: np.ndarray, tolerance: float) -> np.ndarray:
+    """Position of every tied row within its group, in chain order where there is one chain."""
+    n, group_count = len(tied), groups.max() + 1
+    opening = tied["balance"] - balance_change(tied)
+    rows, successors = _successor_links(groups, tied["balance"], opening, tolerance)
+
+    group_size = np.bincount(groups, minlength=group_count)
+    out_degree = np.bincount(rows, minlength=n)
+    in_degree = np.bincount(successors, minlength=n)
+    chained = np.bincount(groups[rows], minlength=group_count) == group_size - 1
+    branching = (out_degree > 1) | (in_degree > 1)
+    chained &= np.bincount(groups, weights=branching, minlength=group_count) == 0
+
+    # Distance to the end of the chain by pointer jumping, in O(n log(longest chain))
+    following = np.full(n, -1)
+    following[rows] = successors
+    distance = (following >= 0).astype(np.int64)
+    for _ in range(max(n, 1).bit_length() + 1):
+        active = following >= 0
+        if not active.any():
+            break
+        target = following[active]
+        distance[active] += distance[target]
+        following[active] = following[target]
+    # Rows still pointing somewhere are on a cycle, which is no chain either
+    chained &= np.bincount(groups, weights=following >= 0, minlength=group_count) == 0
+
+    input_order = np.arange(n) - np.searchsorted(groups, groups)
+    return np.where(chained[groups], group_size[groups] - 1 - distance, input_order)
+
+
+def _successor_links(
+    groups: np.ndarray, balance: pd.Series, opening: pd.Series, tolerance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pairs of a row and a row of the same group that starts at the balance the first ends at."""
+    rows = np.arange(len(groups))
+    ends = pd.DataFrame({"group": groups, "value": _match_key(balance, tolerance), "row": rows})
+    starts = pd.DataFrame(
+        {"group": groups, "value": _match_key(opening, tolerance), "successor": rows}
+    )
+    links = ends.dropna().merge(starts.dropna(), on=["group", "value"])
+    links = links[links["row"] != links["successor"]]
+    return links["row"].to_numpy(), links["successor"].to_numpy()
+
+
+def _match_key(values: pd.Series, tolerance: float) -> np.ndarray:
+    """Balances on a grid of `tolerance`, so balances equal but for float noise join."""
+    if pd.api.types.is_integer_dtype(values):
+        return values.to_numpy(dtype="float64", na_value=np.nan)
+    return (values.to_numpy(dtype="float64", na_value=np.nan) / (2 * tolerance)).round()
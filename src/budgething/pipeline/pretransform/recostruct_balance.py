@@ -0,0 +1,78 @@
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from budgething.data_io.csv_data_reader import MetaColName
+from budgething.pipeline.pretransform.interpolate_timestamps import (
+    BALANCE_KEYS,
+    BALANCE_TOLERANCE,
+    balance_change,
+    balance_dates,
+    order_tied_transactions,
+)
+
+BREAK_COLUMNS = ("account", "currency", "date", "amount", "balance", "expected_balance")
+
+
+def find_balance_breaks(
+    data: pd.DataFrame,
+    *,
+    keys: Sequence[str] = BALANCE_KEYS,
+    tolerance: float = BALANCE_TOLERANCE,
+) -> pd.DataFrame:
+    """Transactions whose reported balance is not the previous balance plus their change.
+
+    Transactions with a "balance" are put in order per account and currency by
+    `order_tied_transactions`, after which every balance is compared with the one before it in
+    a single vectorized pass. They are ordered by `BALANCE_DATE` when `data` has it, as banks
+    that date transactions by when they started apply them to the balance when they complete.
+    A balance may leave out the "fee" of its transaction, which banks can charge apart. The
+    first transaction of each account and currency has nothing to be compared with. A break
+    means a transaction is missing, duplicated, or dated out of the order in which the bank
+    applied it, and that balances taken per day (`extract_eod_balance`) cannot be trusted
+    around it.
+
+    Args:
+        data (pd.DataFrame):
+            Transactions with "date", "amount" and "balance" columns, and optionally "fee",
+            `BALANCE_DATE` and `MetaColName` columns.
+        keys (Sequence[str]):
+            Columns identifying one running balance.
+        tolerance (float):
+            Largest difference between float balances that is not a break. Integer (minor unit)
+            balances must match exactly.
+
+    Returns:
+        pd.DataFrame: `BREAK_COLUMNS` of each break, indexed by source and line number (or by
+            the index of `data` when it has no meta columns).
+    """
+    meta = [col for col in MetaColName.astuple() if col in data.columns]
+    if "balance" not in data.columns:
+        report = pd.DataFrame(columns=[*meta, *BREAK_COLUMNS])
+        return report.set_index(meta) if meta else report
+    data, date = balance_dates(data[data["balance"].notna()])
+    ordered = order_tied_transactions(data, keys=keys, tolerance=tolerance, date=date)
+    keys = [key for key in keys if key in ordered.columns]
+
+    balance = ordered["balance"].to_numpy(dtype="float64", na_value=np.nan)
+    change = balance_change(ordered).to_numpy(dtype="float64", na_value=np.nan)
+    expected = np.roll(balance, 1) + change
+    # The first transaction of every running balance has no previous balance
+    first = np.arange(len(ordered)) == 0
+    for key in keys:
+        codes = pd.factorize(ordered[key])[0]
+        first[1:] |= codes[1:] != codes[:-1]
+    exact = pd.api.types.is_integer_dtype(ordered["balance"])
+    atol = 0 if exact else tolerance
+    broken = ~first & ~np.isclose(balance, expected, rtol=0, atol=atol)
+    if "fee" in ordered.columns:
+        # A fee charged apart from its transaction is not part of the balance reported with it
+        amount = ordered["amount"].to_numpy(dtype="float64", na_value=np.nan)
+        broken &= ~np.isclose(balance, np.roll(balance, 1) + amount, rtol=0, atol=atol)
+
+    report = ordered.loc[broken, [*meta, *(col for col in BREAK_COLUMNS if col in ordered)]]
+    report = report.assign(expected_balance=expected[broken])
+    if exact:
+        report["expected_balance"] = report["expected_balance"].round().astype("Int64")
+    return report.set_index(meta) if meta else report
@@ -0,0 +1,314 @@
+from enum import StrEnum
+import logging
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from budgething.data_io.snapshot import list_snapshots, read_snapshot, write_snapshot
+from budgething.data_io.transaction_schema import MONEY_DTYPE, TRANSACTION_DTYPES
+from budgething.pipeline.models import Currency
+from budgething.pipeline.transform import currency as exchange
+from budgething.pipeline.transform.currency import RateMatrix, convert_currency
+
+
+class Period(StrEnum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class Sign(StrEnum):
+    INCOME = "income"
+    EXPENSE = "expense"
+
+
+CUBE_DIMENSIONS = ("account", "category", "payment_type", "sign")
+"""Columns a slice of the cube can be filtered and broken down by."""
+CELL_DTYPES: dict[str, str] = {
+    "period": "category",
+    "date": "datetime64[ns]",
+    **{dimension: "category" for dimension in CUBE_DIMENSIONS},
+    "amount": MONEY_DTYPE,
+    "count": "int64",
+}
+"""Stored cell columns. "date" is the first day of the period (weeks start on Monday).
+
+Dimensions are categorical, so they are stored dictionary encoded and filtered by code.
+"""
+PENDING_DTYPES: dict[str, str] = {
+    column: TRANSACTION_DTYPES[column]
+    for column in ("date", "amount", "currency", *CUBE_DIMENSIONS[:-1])
+}
+"""Stored columns of transactions waiting for an exchange rate."""
+
+
+class AggregateCube:
+    """Sums and counts of transactions per period, account, category, payment type and sign.
+
+    Every cell holds the total "amount", in `currency`, and the number of the transactions of one
+    day, week or month that share account, category, payment type and sign. Expenses sum up to
+    negative amounts. The cells are stored as the snapshot `aggregate_cube_<currency>` next to
+    the transactions snapshot, and `update` only merges new transactions into the periods they
+    fall into. Slices are read with `query` from an in-memory copy, without any pass over the
+    transactions.
+
+    Transactions that cannot be converted yet, as there is no rate for their day or currency,
+    are kept in the snapshot `aggregate_cube_<currency>_pending` and retried by every `update`,
+    so they are added as soon as the rates cover them.
+
+    ## Example
+
+    >>> cube = AggregateCube(SNAPSHOT_PATH, Currency.PLN)
+    >>> cube.rebuild(store.get_all())
+    >>> cube.update(new_transactions)
+    >>> cube.query(Period.MONTH, sign=Sign.EXPENSE)  # Monthly spending trend
+    >>> cube.query(Period.MONTH, by=["category"], sign=Sign.EXPENSE)  # Category breakdown
+    >>> cube.query(Period.WEEK, by=["sign"])  # Income vs expenses
+    >>> cube.query(Period.MONTH)  # Net income trend
+    """
+
+    def __init__(self, directory: Path, currency: Currency, *, rates: RateMatrix | None = None):
+        """
+        Args:
+            directory (Path):
+                Directory of the snapshots. It does not have to exist yet.
+            currency (Currency):
+                Currency every amount is converted into.
+            rates (RateMatrix | None):
+                Exchange rates to convert with. Loaded with `load_rates` if None.
+        """
+        self.directory = directory
+        self.currency = currency
+        self.rates = rates
+        self._cells: pd.DataFrame | None = None
+        self._views: dict[Period, pd.DataFrame] = {}
+
+    @property
+    def name(self) -> str:
+        return f"aggregate_cube_{self.currency.lower()}"
+
+    @property
+    def pending_name(self) -> str:
+        return f"{self.name}_pending"
+
+    @property
+    def built(self) -> bool:
+        """Whether the cube was stored by `rebuild`."""
+        return self.name in list_snapshots(self.directory)
+
+    def rebuild(self, transactions: pd.DataFrame) -> pd.DataFrame:
+        """Compute and store the cube from all transactions.
+
+        Returns:
+            pd.DataFrame: All cells, with `CELL_DTYPES` columns.
+        """
+        cells, pending = _aggregate_cells(transactions, self.currency, self.rates)
+        self._store(cells, pending)
+        return cells
+
+    def update(self, transactions: pd.DataFrame) -> pd.DataFrame:
+        """Add new transactions to the stored cube.
+
+        Only the cells of the days, weeks and months the transactions fall into are regrouped;
+        all other cells are kept as they are. Pending transactions are retried with them.
+
+        Returns:
+            pd.DataFrame: Cells of the periods that changed.
+
+        Raises:
+            FileNotFoundError: If the cube was never rebuilt.
+        """
+        cells = self._load()
+        if transactions.empty:
+            transactions = retried = self._pending()
+        elif not (retried := self._pending()).empty:
+            transactions = pd.concat(
+                [retried, transactions.reindex(columns=list(PENDING_DTYPES))], ignore_index=True
+            )
+        new, pending = _aggregate_cells(transactions, self.currency, self.rates)
+        if new.empty:
+            if len(pending) != len(retried):
+                write_snapshot(self.directory, **{self.pending_name: pending})
+            return new
+        affected = pd.MultiIndex.from_frame(new[["period", "date"]].drop_duplicates())
+        touched = pd.MultiIndex.from_frame(cells[["period", "date"]]).isin(affected)
+        changed = _sum_cells(_concat_cells(cells[touched], new))
+        self._store(_concat_cells(cells[~touched], changed), pending)
+        return changed
+
+    def query(
+        self,
+        period: Period = Period.MONTH,
+        *,
+        by: Sequence[str] = (),
+        start: pd.Timestamp | str | None = None,
+        end: pd.Timestamp | str | None = None,
+        **filters: str | Iterable[str],
+    ) -> pd.DataFrame:
+        """Total amount and number of transactions per period of a slice of the cube.
+
+        Args:
+            period (Period):
+                Length of the periods.
+            by (Sequence[str]):
+                Dimensions (`CUBE_DIMENSIONS`) to break every period down by.
+            start (pd.Timestamp | str | None):
+                First period to include, by the day it starts on.
+            end (pd.Timestamp | str | None):
+                Last period to include, by the day it starts on.
+            **filters (str | Iterable[str]):
+                Value, or values, a dimension must have, e.g. `account="revolut"`.
+
+        Returns:
+            pd.DataFrame: "amount" and "count" columns, indexed by "date" (the first day of the
+                period) and the `by` dimensions.
+
+        Raises:
+            ValueError: If `by` or `filters` name something that is not a dimension.
+        """
+        unknown = {*by, *filters} - set(CUBE_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"{sorted(unknown)} are not dimensions of the cube")
+        cells = self._view(Period(period))
+        dates = cells["date"].to_numpy()
+        mask = np.ones(len(cells), dtype=bool)
+        if start is not None:
+            mask &= dates >= pd.Timestamp(start).to_datetime64()
+        if end is not None:
+            mask &= dates <= pd.Timestamp(end).to_datetime64()
+        for dimension, values in filters.items():
+            values = [values] if isinstance(values, str) else list(values)
+            mask &= cells[dimension].isin(values).to_numpy()
+        return (
+            cells[mask]
+            .groupby(["date", *by], observed=True, dropna=False)[["amount", "count"]]
+            .sum()
+        )
+
+    def _load(self) -> pd.DataFrame:
+        if self._cells is None:
+            if not self.built:
+                raise FileNotFoundError(f"No aggregate cube stored in '{self.directory}'")
+            self._cells = read_snapshot(self.directory, self.name).astype(CELL_DTYPES)
+        return self._cells
+
+    def _pending(self) -> pd.DataFrame:
+        """Transactions that could not be converted so far."""
+        if self.pending_name not in list_snapshots(self.directory):
+            return pd.DataFrame(columns=list(PENDING_DTYPES)).astype(PENDING_DTYPES)
+        return read_snapshot(self.directory, self.pending_name)
+
+    def _view(self, period: Period) -> pd.DataFrame:
+        """Cells of one period length."""
+        if period not in self._views:
+            cells = self._load()
+            self._views[period] = cells[cells["period"] == period.value].drop(columns="period")
+        return self._views[period]
+
+    def _store(self, cells: pd.DataFrame, pending: pd.DataFrame) -> None:
+        cells = cells.astype(CELL_DTYPES).sort_values(
+            ["period", "date"], kind="stable", ignore_index=True
+        )
+        # Pending first, so a crash in between may leave transactions out, but never counts twice
+        write_snapshot(self.directory, **{self.pending_name: pending, self.name: cells})
+        self._cells = cells
+        self._views.clear()
+
+
+def aggregate_cells(
+    transactions: pd.DataFrame, currency: Currency, *, rates: RateMatrix | None = None
+) -> pd.DataFrame:
+    """Cube cells of `transactions`, for every `Period`.
+
+    Transactions are converted into `currency` and grouped by day once, after which weeks and
+    months are summed from the (far fewer) day cells. Transactions that cannot be converted, as
+    there is no rate for their day, are left out; `AggregateCube` keeps them pending instead.
+
+    Returns:
+        pd.DataFrame: Cells with `CELL_DTYPES` columns.
+    """
+    return _aggregate_cells(transactions, currency, rates)[0]
+
+
+def _aggregate_cells(
+    transactions: pd.DataFrame, currency: Currency, rates: RateMatrix | None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Cells of the transactions that can be converted, and the others as `PENDING_DTYPES`."""
+    transactions = transactions.reindex(columns=list(PENDING_DTYPES))
+    if transactions.empty:
+        cells = pd.DataFrame(columns=list(CELL_DTYPES)).astype(CELL_DTYPES)
+        return cells, transactions.astype(PENDING_DTYPES)
+    if rates is None:
+        rates = exchange.load_rates()
+    # Currencies the rates do not cover at all wait like days they do not cover yet
+    supported = rates.supports(transactions["currency"])
+    converted = convert_currency(transactions[supported], currency, rates=rates)
+    # A transaction without an amount is left out; only a missing rate can be made up for later
+    no_rate = ~supported
+    no_rate[supported] = (
+        converted["amount"].isna().to_numpy() & transactions["amount"].notna().to_numpy()[supported]
+    )
+    pending = transactions[no_rate].astype(PENDING_DTYPES).reset_index(drop=True)
+    if not pending.empty:
+        unsupported = sorted(transactions.loc[~supported, "currency"].dropna().unique())
+        logging.warning(
+            f"{len(pending)} transaction(s) without an exchange rate left out of the cube"
+            + (f" (no rates at all for {', '.join(unsupported)})" if unsupported else "")
+        )
+    converted = converted.dropna(subset=["amount"])
+
+    expense = (converted["amount"] < 0).to_numpy(dtype=bool)
+    cells = (
+        converted.assign(
+            date=converted["date"].dt.normalize(),
+            sign=np.where(expense, Sign.EXPENSE.value, Sign.INCOME.value),
+        )
+        .groupby(["date", *CUBE_DIMENSIONS], dropna=False, sort=False)["amount"]
+        .agg(amount="sum", count="size")
+        .reset_index()
+    )
+    periods = []
+    for period in Period:
+        period_cells = cells.assign(period=period.value, date=_period_start(cells["date"], period))
+        periods.append(period_cells if period is Period.DAY else _sum_cells(period_cells))
+    cells = pd.concat(periods, ignore_index=True)[list(CELL_DTYPES)].astype(CELL_DTYPES)
+    return cells, pending
+
+
+def _concat_cells(*frames: pd.DataFrame) -> pd.DataFrame:
+    """Concatenate cells, merging categories so the dimensions stay categorical."""
+    frames = tuple(frame.astype(CELL_DTYPES) for frame in frames)
+    for column, dtype in CELL_DTYPES.items():
+        if dtype != "category":
+            continue
+        categories = frames[0][column].cat.categories
+        for frame in frames[1:]:
+            categories = categories.union(frame[column].cat.categories)
+        frames = tuple(
+            frame.assign(**{column: frame[column].cat.set_categories(categories)})
+            for frame in frames
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def _period_start(days: pd.Series, period: Period) -> np.ndarray:
+    """First day of the `period` each of `days` falls into."""
+    days = days.to_numpy(dtype="datetime64[D]")
+    if period is Period.WEEK:
+        # 1970-01-01 was a Thursday, so day numbers shifted by 3 make Monday a multiple of 7
+        days = days - (days.astype("int64") + 3) % 7
+    elif period is Period.MONTH:
+        days = days.astype("datetime64[M]").astype("datetime64[D]")
+    return days.astype("datetime64[ns]")
+
+
+def _sum_cells(cells: pd.DataFrame) -> pd.DataFrame:
+    """Merge cells with the same period, day and dimensions."""
+    keys = ["period", "date", *CUBE_DIMENSIONS]
+    return (
+        cells.groupby(keys, observed=True, dropna=False, sort=False)[["amount", "count"]]
+        .sum()
+        .reset_index()
+    )
@@ -0,0 +1,93 @@
+from typing import Mapping, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class BalanceMatrix(NamedTuple):
+    """End of day balances of several accounts on one shared, continuous day axis.
+
+    `balances` is a dense (accounts x days) array in which every account carries its last known
+    balance forward. Days before an account's first known balance are not `known` and count as
+    zero in the total. Integer (minor unit) balances stay integers.
+
+    ## Example
+
+    >>> matrix = BalanceMatrix.from_series({"pekao24": pekao_eod, "revolut": revolut_eod})
+    >>> matrix.total()
+    >>> matrix.per_account()["revolut"]
+    """
+
+    accounts: tuple[str, ...]
+    start: np.datetime64
+    balances: np.ndarray
+    known: np.ndarray
+
+    @classmethod
+    def from_series(cls, balances: Mapping[str, pd.Series]) -> "BalanceMatrix":
+        """Align the end of day balances of every account, indexed by date, in a single pass.
+
+        Missing balances are skipped, and of several balances on the same day the latest one
+        counts.
+        """
+        accounts = tuple(balances)
+        series = [_daily(sr) for sr in balances.values()]
+        days = [index for index, _ in series if len(index)]
+        if not days:
+            empty = np.empty((len(accounts), 0))
+            return cls(accounts, np.datetime64("NaT", "D"), empty, empty.astype(bool))
+        start = min(index[0] for index in days)
+        end = max(index[-1] for index in days)
+        width = int((end - start).astype("int64")) + 1
+        integer = all(pd.api.types.is_integer_dtype(values) for _, values in series)
+
+        matrix = np.zeros((len(accounts), width), dtype=np.int64 if integer else np.float64)
+        known = np.zeros((len(accounts), width), dtype=bool)
+        for row, (index, values) in enumerate(series):
+            columns = (index - start).astype("int64")
+            matrix[row, columns] = values
+            known[row, columns] = True
+
+        # Forward fill: each day takes the balance of the last known day at or before it
+        last_known = np.where(known, np.arange(width), 0)
+        np.maximum.accumulate(last_known, axis=1, out=last_known)
+        rows = np.arange(len(accounts))[:, None]
+        known = known[rows, last_known]
+        matrix = np.where(known, matrix[rows, last_known], 0)
+        return cls(accounts, start, matrix, known)
+
+    @property
+    def days(self) -> pd.DatetimeIndex:
+        if not self.balances.shape[1]:
+            return pd.DatetimeIndex([], name="date")
+        return pd.date_range(self.start, periods=self.balances.shape[1], freq="D", name="date")
+
+    def per_account(self) -> pd.DataFrame:
+        """Balance of every account (columns) on every day, missing before its first balance."""
+        data = {
+            account: self._to_series(self.balances[row], self.known[row])
+            for row, account in enumerate(self.accounts)
+        }
+        return pd.DataFrame(data, index=self.days)
+
+    def total(self) -> pd.Series:
+        """Sum of the balances of all accounts on every day."""
+        return pd.Series(self.balances.sum(axis=0), index=self.days, name="eod_balance")
+
+    def _to_series(self, values: np.ndarray, known: np.ndarray) -> pd.Series:
+        if values.dtype.kind == "i":
+            return pd.Series(pd.arrays.IntegerArray(values, ~known), index=self.days)
+        return pd.Series(np.where(known, values, np.nan), index=self.days)
+
+
+def _daily(sr: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted days (`datetime64[D]`) and the latest non-missing value of each."""
+    sr = sr.dropna()
+    timestamps = pd.DatetimeIndex(sr.index).to_numpy()
+    values = sr.to_numpy(dtype=np.int64 if isinstance(sr.dtype, pd.Int64Dtype) else None)
+    order = np.argsort(timestamps, kind="stable")
+    days, values = timestamps[order].astype("datetime64[D]"), values[order]
+    if not len(days):
+        return days, values
+    last = np.append(days[1:] != days[:-1], True)
+    return days[last], values[last]
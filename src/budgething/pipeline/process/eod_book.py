@@ -0,0 +1,169 @@
+import json
+import os
+from pathlib import Path
+from typing import Mapping, NamedTuple
+
+import pandas as pd
+
+from budgething.data_io.snapshot import (
+    append_snapshot,
+    list_snapshots,
+    read_snapshot,
+    write_snapshot,
+)
+from budgething.pipeline.transform.amount import aggregate_daily_net_amounts, reindex_with_defaults
+from budgething.pipeline.transform.balance import reconstruct_eod_balance, update_eod_balance
+
+
+class EODCheckpoint(NamedTuple):
+    """Last day of an account's stored end of day balance and the balance on that day."""
+
+    last_day: pd.Timestamp
+    closing_balance: float | int
+
+
+class EODBalanceBook:
+    """End of day balances of accounts known only by their latest balance, kept up to date.
+
+    Each account is reconstructed once with `rebuild` and then stored as the snapshot
+    `eod_balance_<account>`, starting on the day before its first transaction. Its
+    `EODCheckpoint` is saved in a small JSON file next to it, so `update` computes the days after
+    the checkpoint from new transactions and appends them with `append_snapshot`, without reading
+    or rewriting the stored history. Only back-dated transactions make it load and rewrite the
+    history, to shift the days before them. `latest_balances`
+    lists the accounts to `rebuild` as soon as their transactions are stored (see
+    `Ingestor.seed_eod_balances`).
+
+    ## Example
+
+    >>> book = EODBalanceBook(SNAPSHOT_PATH)
+    >>> book.rebuild(Account.PEKAO24, history, latest_balance=4158.68)
+    >>> book.update(Account.PEKAO24, new_transactions)
+    """
+
+    VERSION = 1
+    CHECKPOINTS_NAME = "eod_checkpoints.json"
+
+    def __init__(self, directory: Path, latest_balances: Mapping[str, float | int] | None = None):
+        """
+        Args:
+            directory (Path):
+                Directory of the balance snapshots and checkpoints. It does not have to exist
+                yet.
+            latest_balances (Mapping[str, float | int] | None):
+                Balance of accounts at the end of the day of their most recent stored
+                transaction, used to rebuild the ones not in the book yet.
+        """
+        self.directory = directory
+        self.latest_balances = {
+            str(account): balance for account, balance in (latest_balances or {}).items()
+        }
+        self._checkpoints: dict[str, EODCheckpoint] = {}
+        if (path := directory / self.CHECKPOINTS_NAME).exists():
+            self._load(path)
+
+    def __contains__(self, account: str) -> bool:
+        return str(account) in self._checkpoints
+
+    def checkpoint(self, account: str) -> EODCheckpoint | None:
+        return self._checkpoints.get(str(account))
+
+    def get(self, account: str) -> pd.Series:
+        """Stored end of day balance of `account`, indexed by day."""
+        name = self._snapshot_name(account)
+        if name not in list_snapshots(self.directory):
+            raise KeyError(f"No end of day balance stored for '{account}'")
+        return read_snapshot(self.directory, name)["eod_balance"]
+
+    def rebuild(
+        self, account: str, transactions: pd.DataFrame, latest_balance: float | int
+    ) -> pd.Series:
+        """Reconstruct the whole end of day balance of `account` from all its transactions.
+
+        Args:
+            account (str):
+                Account the transactions belong to.
+            transactions (pd.DataFrame):
+                All transactions of the account, with "date" and "amount" columns.
+            latest_balance (float | int):
+                Balance at the end of the day of the most recent transaction.
+        """
+        daily = reindex_with_defaults(aggregate_daily_net_amounts(transactions), fill_value=0)
+        eod_balance = reconstruct_eod_balance(daily, latest_balance=latest_balance)
+        opening_day = eod_balance.index[0] - pd.Timedelta(days=1)
+        opening = eod_balance.iloc[0] - daily["daily_net_amount"].iloc[0]
+        opening_balance = pd.Series(
+            [opening], index=[opening_day], dtype=eod_balance.dtype, name=eod_balance.name
+        )
+        eod_balance = pd.concat([opening_balance, eod_balance]).rename_axis("date")
+        write_snapshot(self.directory, **{self._snapshot_name(account): eod_balance})
+        self._set_checkpoint(account, eod_balance)
+        return eod_balance
+
+    def update(self, account: str, transactions: pd.DataFrame) -> pd.Series:
+        """Add new transactions of `account` to its stored end of day balance.
+
+        Returns:
+            pd.Series: End of day balance of the days that changed.
+
+        Raises:
+            KeyError: If `account` was never rebuilt.
+        """
+        checkpoint = self._checkpoints[str(account)]
+        daily = aggregate_daily_net_amounts(transactions)
+        name = self._snapshot_name(account)
+        backdated = daily.index[daily.index <= checkpoint.last_day]
+        if backdated.empty:
+            last = pd.Series(
+                [checkpoint.closing_balance], index=pd.DatetimeIndex([checkpoint.last_day])
+            )
+            changed = update_eod_balance(last, daily).iloc[1:]
+            if changed.empty:
+                return changed
+            append_snapshot(self.directory, name, changed.to_frame())
+            self._set_checkpoint(account, changed)
+            return changed
+        eod_balance = update_eod_balance(self.get(account), daily)
+        write_snapshot(self.directory, **{name: eod_balance})
+        self._set_checkpoint(account, eod_balance)
+        changed = (eod_balance.index < backdated.max()) | (eod_balance.index > checkpoint.last_day)
+        return eod_balance[changed]
+
+    def save(self) -> None:
+        """Write the checkpoints to disk atomically."""
+        payload = {
+            "version": self.VERSION,
+            "accounts": {
+                account: {
+                    "last_day": checkpoint.last_day.date().isoformat(),
+                    "closing_balance": checkpoint.closing_balance,
+                }
+                for account, checkpoint in self._checkpoints.items()
+            },
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / self.CHECKPOINTS_NAME
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _set_checkpoint(self, account: str, eod_balance: pd.Series) -> None:
+        closing = eod_balance.iloc[-1]
+        closing = closing.item() if hasattr(closing, "item") else closing
+        last_day = pd.Timestamp(eod_balance.index[-1])
+        self._checkpoints[str(account)] = EODCheckpoint(last_day, closing)
+        # Saved right away, so the checkpoints never lag behind the stored balances
+        self.save()
+
+    def _load(self, path: Path) -> None:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("version") != self.VERSION:
+            return
+        for account, record in payload["accounts"].items():
+            self._checkpoints[account] = EODCheckpoint(
+                pd.Timestamp(record["last_day"]), record["closing_balance"]
+            )
+
+    @staticmethod
+    def _snapshot_name(account: str) -> str:
+        return f"eod_balance_{account}"
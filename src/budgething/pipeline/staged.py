@@ -0,0 +1,155 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Iterable, NamedTuple
+
+import pandas as pd
+
+from budgething.data_io.pdf_data_reader import InputFile
+from budgething.pipeline.dispatch import dispatch_files
+from budgething.pipeline.ingest import Ingestor
+from budgething.pipeline.parsers.registry import PARSER_READ_SPECS, Parser
+
+_DONE = object()
+"""Sentinel telling a stage worker that its input is exhausted."""
+
+
+class StageConcurrency(NamedTuple):
+    """Number of workers per pipeline stage and the size of the queues between stages.
+
+    All of them must be at least 1: an unlimited queue (`asyncio.Queue` of size 0) would lift the
+    bound on memory.
+    """
+
+    read: int = 4
+    parse: int = 2
+    queue_size: int = 4
+
+
+class _Item(NamedTuple):
+    number: int
+    """Position in dispatch order, in which items are stored."""
+    parser: Parser
+    csv_file: InputFile
+    data: pd.DataFrame | None = None
+
+
+async def run_staged_ingest(
+    ingestor: Ingestor,
+    files: Iterable[InputFile],
+    concurrency: StageConcurrency = StageConcurrency(),
+) -> pd.DataFrame:
+    """Ingest `files` through read -> parse -> store stages connected by bounded queues.
+
+    Reading and parsing run in worker threads, so I/O of one file overlaps with parsing of
+    another. A stage blocks as soon as the queue in front of the next one is full, which keeps at
+    most about `queue_size` parsed files in memory, regardless of how many are ingested. Storing
+    runs in a single worker, because deduplication and the store are not thread-safe.
+
+    Files are stored in dispatch order, whatever order the workers finish them in, so of
+    transactions exported more than once the same copy is kept as by `Ingestor.ingest`. Files
+    finished early wait in a reorder buffer, and only a bounded number of files is in flight,
+    so a slow file holds back reading rather than filling memory. If a stage fails, the files
+    stored until then are finished like by `Ingestor.ingest` before the error is raised.
+
+    Returns:
+        pd.DataFrame: Normalized transactions that were not stored before.
+
+    Raises:
+        ValueError: If a stage has no workers or a queue no room.
+    """
+    if min(concurrency) < 1:
+        raise ValueError(f"Stage workers and queue sizes must be at least 1, got {concurrency}")
+    dispatched = dispatch_files(files)
+    to_read: asyncio.Queue = asyncio.Queue(concurrency.queue_size)
+    to_parse: asyncio.Queue = asyncio.Queue(concurrency.queue_size)
+    to_store: asyncio.Queue = asyncio.Queue(concurrency.queue_size)
+    new: list[pd.DataFrame] = []
+    # As many files as the queues and stage workers can hold at once
+    in_flight = asyncio.Semaphore(
+        3 * concurrency.queue_size + concurrency.read + concurrency.parse + 1
+    )
+    finished: dict[int, _Item] = {}
+    next_number = 0
+    storing: asyncio.Future | None = None
+
+    async def feed() -> None:
+        items = (
+            (parser, csv_file)
+            for parser, parser_files in dispatched.routed.items()
+            for csv_file in parser_files
+        )
+        for number, (parser, csv_file) in enumerate(items):
+            await in_flight.acquire()
+            await to_read.put(_Item(number, parser, csv_file))
+        for _ in range(concurrency.read):
+            await to_read.put(_DONE)
+
+    async def read(item: _Item) -> _Item:
+        data = await asyncio.to_thread(
+            item.csv_file.read, add_meta=True, strip=True, spec=PARSER_READ_SPECS[item.parser]
+        )
+        return item._replace(data=data)
+
+    async def parse(item: _Item) -> _Item:
+        return item._replace(data=await asyncio.to_thread(item.parser, item.data))
+
+    def store_parsed(item: _Item) -> pd.DataFrame:
+        transactions = ingestor.store_parsed(item.data, [item.csv_file])
+        # Recorded in the worker thread, so it is not lost if the stage is cancelled meanwhile
+        new.append(transactions)
+        return transactions
+
+    async def store(item: _Item) -> None:
+        nonlocal next_number, storing
+        finished[item.number] = item
+        while (item := finished.pop(next_number, None)) is not None:
+            storing = asyncio.ensure_future(asyncio.to_thread(store_parsed, item))
+            transactions = await asyncio.shield(storing)
+            logging.info(
+                f"{item.csv_file.filepath.name}: {len(transactions)} new transaction(s)"
+            )
+            next_number += 1
+            in_flight.release()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(feed())
+            group.create_task(
+                _stage(read, to_read, to_parse, concurrency.read, concurrency.parse)
+            )
+            group.create_task(_stage(parse, to_parse, to_store, concurrency.parse, 1))
+            group.create_task(_stage(store, to_store, None, 1, 0))
+    except Exception:
+        # A file being stored when another stage failed is stored all the same
+        if storing is not None:
+            await asyncio.wait([storing])
+        # Whatever was stored before the failure still has to reach the derived data
+        await asyncio.to_thread(ingestor.finish, new)
+        raise
+
+    return await asyncio.to_thread(ingestor.finish, new)
+
+
+async def _stage(
+    func: Callable[[Any], Awaitable[Any]],
+    inbox: asyncio.Queue,
+    outbox: asyncio.Queue | None,
+    workers: int,
+    downstream_workers: int,
+) -> None:
+    """Run `workers` copies of `func` over `inbox` and forward results to `outbox`.
+
+    Each worker stops on a `_DONE` sentinel. Once all of them stopped, one sentinel per
+    downstream worker is sent on.
+    """
+
+    async def worker() -> None:
+        while (item := await inbox.get()) is not _DONE:
+            result = await func(item)
+            if outbox is not None:
+                await outbox.put(result)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    if outbox is not None:
+        for _ in range(downstream_workers):
+            await outbox.put(_DONE)
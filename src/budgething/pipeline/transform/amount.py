@@ -34,9 +34,8 @@ def aggregate_daily_net_amounts(data: pd.DataFrame) -> pd.DataFrame:
     Name: daily_net_amount, dtype: int64
     '''
     """
-    data = data[["date", "amount"]].copy()
-    data["date"] = data["date"].dt.date
-    return data.groupby("date").sum().rename(columns={"amount": "daily_net_amount"})
+    days = pd.DatetimeIndex(data["date"].dt.normalize(), name="date")
+    return data["amount"].groupby(days).sum().to_frame("daily_net_amount")
 
 
 def reindex_with_defaults(
@@ -1,9 +1,15 @@
+import numpy as np
 import pandas as pd
 
+from budgething.pipeline.pretransform.interpolate_timestamps import balance_dates
+
 
 def extract_eod_balance(data: pd.DataFrame) -> pd.Series:
     """End of day balance from "date" and "balance" columns.
 
+    Days and order come from `BALANCE_DATE` instead of "date" where the data has it, so a
+    transaction counts on the day the bank applied it to the balance.
+
     ## Example
 
     >>> data = pd.DataFrame(
@@ -33,20 +39,22 @@ def extract_eod_balance(data: pd.DataFrame) -> pd.Series:
     Name: eod_balance, dtype: int64
     '''
     """
-    data = data[["date", "balance"]].copy()
-    data["date"] = data["date"].dt.date
+    data, date = balance_dates(data)
+    data = data[[date, "balance"]].sort_values(date, kind="stable")
+    days = data[date].dt.normalize()
+    # The last transaction of each day is the one followed by another day
+    last = days.ne(days.shift(-1)).to_numpy()
     return (
-        data.sort_values("date")
-        .groupby("date")
-        .tail(1)
-        .set_index("date")["balance"]
+        data["balance"][last]
+        .set_axis(pd.DatetimeIndex(days[last], name="date"))
         .rename("eod_balance")
     )
 
 
-def reconstruct_eod_balance(data: pd.DataFrame, latest_balance: float) -> pd.Series:
+def reconstruct_eod_balance(data: pd.DataFrame, latest_balance: float | int) -> pd.Series:
     """End of day balance from "date" and "daily_net_amount" columns, using the latest balance.
-    Treats `latest_balance` as the most recent day EOD balance
+    Treats `latest_balance` as the most recent day EOD balance. With integer minor-unit amounts,
+    pass `latest_balance` in minor units too and the result stays exact.
 
     ## Example
 
@@ -84,9 +92,53 @@ def reconstruct_eod_balance(data: pd.DataFrame, latest_balance: float) -> pd.Ser
     """
     if data.index.name == "date":
         data = data.reset_index()
-        data["date"] = pd.to_datetime(data["date"])
-    data = data[["date", "daily_net_amount"]].copy()
-    data["date"] = data["date"].dt.date
+    data = data[["date", "daily_net_amount"]].assign(
+        date=pd.to_datetime(data["date"]).dt.normalize()
+    )
     data = data.set_index("date", verify_integrity=True).sort_index(ascending=False)
     reverse_cumsum = data["daily_net_amount"].cumsum().shift(fill_value=0)
     return (latest_balance - reverse_cumsum).iloc[::-1].rename("eod_balance")
+
+
+def update_eod_balance(eod_balance: pd.Series, daily: pd.DataFrame) -> pd.Series:
+    """Fold new "daily_net_amount"s into an end of day balance from `reconstruct_eod_balance`.
+
+    The balance of the last day is known (it is the latest balance), so days after it continue
+    from it, while a back-dated net amount leaves that day and every later one as they are and
+    shifts all earlier days instead. Only the new days are computed; the shift is a single
+    vectorized subtraction. Back-dated days before the first day extend the series with the
+    first day's balance, so the series should start on a day without transactions (see
+    `EODBalanceBook`). Days are returned as a `DatetimeIndex`.
+
+    ## Example
+
+    >>> eod_balance = reconstruct_eod_balance(history, latest_balance=1000)
+    >>> eod_balance = update_eod_balance(eod_balance, aggregate_daily_net_amounts(new))
+    """
+    eod_balance = eod_balance.set_axis(pd.DatetimeIndex(eod_balance.index, name="date"))
+    net = daily["daily_net_amount"]
+    net = net.set_axis(pd.DatetimeIndex(net.index).normalize()).groupby(level=0).sum()
+    first_day, last_day = eod_balance.index[0], eod_balance.index[-1]
+
+    backdated = net[net.index <= last_day]
+    if not backdated.empty:
+        if backdated.index[0] < first_day:
+            days = pd.date_range(backdated.index[0], first_day, freq="D", inclusive="left")
+            before = pd.Series(eod_balance.iloc[0], index=days, dtype=eod_balance.dtype)
+            eod_balance = pd.concat([before, eod_balance]).rename_axis("date")
+        # Every day is shifted by the back-dated net amounts of the days after it
+        positions = eod_balance.index.searchsorted(backdated.index)
+        amounts = backdated.to_numpy(
+            dtype=np.int64 if pd.api.types.is_integer_dtype(backdated) else np.float64
+        )
+        later = np.zeros(len(eod_balance) + 1, dtype=amounts.dtype)
+        np.add.at(later, positions, amounts)
+        shift = later[::-1].cumsum()[::-1][1:]
+        eod_balance = eod_balance - shift
+
+    suffix = net[net.index > last_day]
+    if suffix.empty:
+        return eod_balance.rename("eod_balance")
+    days = pd.date_range(last_day + pd.Timedelta(days=1), suffix.index[-1], freq="D", name="date")
+    new_days = eod_balance.iloc[-1] + suffix.reindex(days, fill_value=0).cumsum()
+    return pd.concat([eod_balance, new_days]).rename("eod_balance")
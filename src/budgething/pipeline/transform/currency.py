@@ -1,14 +1,193 @@
-from currency_converter import CurrencyConverter  # type: ignore[import-untyped]
+import os
+from pathlib import Path
+import threading
+from typing import Iterable, NamedTuple
+
+import numpy as np
 import pandas as pd
 
+from budgething.config import RATES_CACHE_PATH
 from budgething.pipeline.models import Currency
+from budgething.pipeline.money import from_minor_units, to_minor_units
+
+_rate_cache: dict[Path, tuple[tuple, "RateMatrix"]] = {}
+_rate_cache_lock = threading.Lock()
+
+
+class RateMatrix(NamedTuple):
+    """ECB reference rates as a dense (currency x day) matrix of units per euro.
+
+    Every calendar day from `start` on has a column. Days without a reference rate (weekends,
+    holidays) carry the rate of the last day that had one.
+    """
+
+    currencies: tuple[str, ...]
+    start: np.datetime64
+    rates: np.ndarray
+
+    @property
+    def end(self) -> np.datetime64:
+        """Last day with a rate."""
+        return self.start + np.timedelta64(self.rates.shape[1] - 1, "D")
+
+    def lookup(self, currency: pd.Series | str, days: np.ndarray) -> np.ndarray:
+        """Units of `currency` per euro on each of `days` (`datetime64[D]`).
+
+        Days after `end` use the rate of `end`. Days before `start`, or before the ECB quoted
+        the currency, are NaN.
+
+        Raises:
+            ValueError: If a currency has no rates at all.
+        """
+        if isinstance(currency, str):
+            rows = np.full(len(days), self._row(currency))
+            known = np.ones(len(days), dtype=bool)
+        else:
+            codes, uniques = pd.factorize(currency.str.upper())
+            # Missing currencies have code -1, which picks the trailing placeholder row
+            rows = np.append([self._row(name) for name in uniques], 0).astype(np.intp)[codes]
+            known = codes >= 0
+        columns = (days - self.start).astype("int64")
+        valid = known & ~np.isnat(days) & (columns >= 0)
+        columns = np.clip(columns, 0, self.rates.shape[1] - 1)
+        return np.where(valid, self.rates[rows, columns], np.nan)
+
+    def supports(self, currency: pd.Series) -> np.ndarray:
+        """Whether each of `currency` has rates at all, so `lookup` does not raise for it."""
+        return currency.str.upper().isin(self.currencies).to_numpy(dtype=bool)
+
+    def _row(self, currency: str) -> int:
+        try:
+            return self.currencies.index(currency.upper())
+        except ValueError:
+            raise ValueError(f"{currency} is not a supported currency") from None
+
+
+def load_rates(
+    source: Path | None = None, cache_path: Path | None = RATES_CACHE_PATH
+) -> RateMatrix:
+    """Load the rate matrix of an ECB rate history file, parsing the file only when it changed.
+
+    The matrix is kept in memory for the process and, with a `cache_path`, on disk as `.npz`,
+    so later runs load it without parsing the CSV either.
+
+    Args:
+        source (Path | None):
+            ECB `eurofxref-hist` file (`.csv` or `.zip`). Defaults to the one bundled with
+            `currency_converter`.
+        cache_path (Path | None):
+            Where to cache the matrix on disk. Only kept in memory if None.
+    """
+    if source is None:
+        # Slow to import, so only imported when rates are loaded
+        from currency_converter import CURRENCY_FILE  # type: ignore[import-untyped]
+
+        source = Path(CURRENCY_FILE)
+    stat = source.stat()
+    key = (str(source.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _rate_cache_lock:
+        cached = _rate_cache.get(source)
+    if cached is not None and cached[0] == key:
+        return cached[1]
 
+    matrix = _load_cached_rates(cache_path, key) if cache_path is not None else None
+    if matrix is None:
+        matrix = _read_ecb_rates(source)
+        if cache_path is not None:
+            _store_rates(cache_path, key, matrix)
+    with _rate_cache_lock:
+        _rate_cache[source] = (key, matrix)
+    return matrix
 
-def convert_currency(df: pd.DataFrame, target_currency: Currency) -> pd.DataFrame:
-    c = CurrencyConverter(fallback_on_missing_rate=True)
-    df["amount"] = df.apply(
-        lambda row: c.convert(row["amount"], row["currency"], target_currency, row["date"].date()),
-        axis=1,
+
+def clear_rate_cache() -> None:
+    with _rate_cache_lock:
+        _rate_cache.clear()
+
+
+def convert_currency(
+    df: pd.DataFrame, target_currency: Currency, *, rates: RateMatrix | None = None
+) -> pd.DataFrame:
+    """Copy of `df` with "amount" converted into `target_currency` at the rate of its "date".
+
+    `Int64` amounts are taken as minor units of their currency and converted into minor units
+    of `target_currency`, rounded to the nearest one.
+    """
+    amounts = _convert(df, [target_currency], rates)[target_currency]
+    return df.assign(amount=amounts, currency=target_currency.value)
+
+
+def convert_to_all(
+    df: pd.DataFrame,
+    currencies: Iterable[Currency] = Currency,
+    *,
+    rates: RateMatrix | None = None,
+) -> pd.DataFrame:
+    """Copy of `df` with an `amount_<currency>` column per currency, e.g. "amount_pln".
+
+    The source rate of every row is looked up once and shared by all target currencies.
+    """
+    amounts = _convert(df, list(currencies), rates)
+    return df.assign(
+        **{f"amount_{currency.lower()}": values for currency, values in amounts.items()}
     )
-    df["currency"] = target_currency.value
-    return df
+
+
+def _convert(
+    df: pd.DataFrame, currencies: list[Currency], rates: RateMatrix | None
+) -> dict[Currency, pd.Series]:
+    if rates is None:
+        rates = load_rates()
+    days = df["date"].to_numpy(dtype="datetime64[D]")
+    source_rates = rates.lookup(df["currency"], days)
+    minor_units = isinstance(df["amount"].dtype, pd.Int64Dtype)
+    amounts = df["amount"]
+    if minor_units:
+        amounts = from_minor_units(amounts, df["currency"])
+    amounts = amounts.to_numpy(dtype=float, na_value=np.nan) / source_rates
+
+    converted = {}
+    for currency in currencies:
+        values = pd.Series(amounts * rates.lookup(currency, days), index=df.index, name="amount")
+        converted[currency] = to_minor_units(values, currency) if minor_units else values
+    return converted
+
+
+def _read_ecb_rates(source: Path) -> RateMatrix:
+    """Parse an ECB rate history: one row per business day, one column per currency."""
+    data = pd.read_csv(source, index_col="Date", parse_dates=["Date"], na_values="N/A")
+    data = data.loc[:, ~data.columns.str.startswith("Unnamed")].sort_index().assign(EUR=1.0)
+    days = pd.date_range(data.index.min(), data.index.max(), freq="D")
+    data = data.reindex(days).ffill()
+    return RateMatrix(
+        currencies=tuple(data.columns),
+        start=days[0].to_datetime64().astype("datetime64[D]"),
+        rates=np.ascontiguousarray(data.to_numpy(dtype=float).T),
+    )
+
+
+def _load_cached_rates(path: Path, key: tuple) -> RateMatrix | None:
+    if not path.exists():
+        return None
+    with np.load(path) as cached:
+        if tuple(cached["key"]) != tuple(str(part) for part in key):
+            return None
+        return RateMatrix(
+            currencies=tuple(map(str, cached["currencies"])),
+            start=cached["start"][()],
+            rates=cached["rates"],
+        )
+
+
+def _store_rates(path: Path, key: tuple, matrix: RateMatrix) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as file:
+        np.savez(
+            file,
+            key=np.array([str(part) for part in key]),
+            currencies=np.array(matrix.currencies),
+            start=np.array(matrix.start),
+            rates=matrix.rates,
+        )
+    os.replace(tmp_path, path)
@@ -1,30 +1,138 @@
+import argparse
+import asyncio
 import logging
+import os
 from pathlib import Path
-from dash import Dash
+import threading
 
 import pandas as pd
 
-from budgething.config import DATA_PATH, DEBUG
+from budgething.config import (
+    DATA_PATH,
+    DEBUG,
+    FINGERPRINTS_PATH,
+    LATEST_BALANCES,
+    MANIFEST_PATH,
+    PDF_CACHE_PATH,
+    SNAPSHOT_PATH,
+    STORE_PATH,
+)
 from budgething.pipeline._logging import configure_logging
 from budgething.data_io.csv_data_reader import CSVDataReader
-from budgething.pipeline.parsers import PARSER_REGISTRY, repair_data_pipeline
-
-
-configure_logging(level=logging.DEBUG if DEBUG else logging.INFO)
-
-# app = Dash()
-
-
-def main(csvdir: Path = DATA_PATH / "input"):
-    parsed = []
-
-    for schema, parser in PARSER_REGISTRY:
-        reader = CSVDataReader(csvdir, schema=schema, skip_hashes=set())
-        data = reader.get_all(add_meta=True, strip=True)
-        parsed.append(parser(data))
-
+from budgething.data_io.manifest import FileManifest
+from budgething.data_io.parquet_store import ParquetTransactionStore
+from budgething.data_io.pdf_data_reader import PDFDataReader
+from budgething.data_io.watcher import DirectoryWatcher
+from budgething.pipeline.ingest import Ingestor
+from budgething.pipeline.models import Currency
+from budgething.pipeline.process.aggregate_cube import AggregateCube
+from budgething.pipeline.process.eod_book import EODBalanceBook
+from budgething.pipeline.pretransform.deduplicate import FingerprintSet
+from budgething.pipeline.staged import StageConcurrency, run_staged_ingest
+
+
+def _create_ingestor(
+    manifest_path: Path, store_path: Path, fingerprints_path: Path, snapshot_path: Path
+) -> Ingestor:
+    return Ingestor(
+        manifest=FileManifest(manifest_path),
+        store=ParquetTransactionStore(store_path),
+        fingerprints=FingerprintSet(fingerprints_path),
+        snapshot_path=snapshot_path,
+        eod_balances=EODBalanceBook(snapshot_path, LATEST_BALANCES),
+        cube=AggregateCube(snapshot_path, Currency.PLN),
+    )
+
+
+def _create_pdf_reader(pdfdir: Path, ingestor: Ingestor, cache_path: Path) -> PDFDataReader:
+    return PDFDataReader(
+        pdfdir,
+        schema=None,
+        skip_hashes=set(),
+        manifest=ingestor.manifest,
+        cache_dir=cache_path,
+        workers=os.cpu_count() or 1,
+    )
+
+
+def watch(
+    csvdir: Path = DATA_PATH / "input",
+    manifest_path: Path = MANIFEST_PATH,
+    store_path: Path = STORE_PATH,
+    fingerprints_path: Path = FINGERPRINTS_PATH,
+    snapshot_path: Path = SNAPSHOT_PATH,
+    pdf_cache_path: Path = PDF_CACHE_PATH,
+    stop: threading.Event | None = None,
+):
+    """Ingest whatever is pending in `csvdir`, then keep ingesting files as they land there."""
+    ingestor = _create_ingestor(manifest_path, store_path, fingerprints_path, snapshot_path)
+    reader = CSVDataReader(csvdir, schema=None, skip_hashes=set(), manifest=ingestor.manifest)
+    pdf_reader = _create_pdf_reader(csvdir, ingestor, pdf_cache_path)
+
+    with DirectoryWatcher(csvdir, suffixes={".csv", ".pdf"}) as watcher:
+        _ingest_batch(ingestor, reader, pdf_reader, set(csvdir.iterdir()))
+        logging.info(f"Watching '{csvdir}' for new statements")
+        for paths in watcher.batches(stop):
+            _ingest_batch(ingestor, reader, pdf_reader, paths)
+
+
+def _ingest_batch(
+    ingestor: Ingestor, reader: CSVDataReader, pdf_reader: PDFDataReader, paths: set[Path]
+) -> None:
+    """Ingest changed files without letting a bad one stop the watcher.
+
+    If the batch fails, its files are ingested one at a time, so only the files that fail stay
+    un-ingested. They are picked up again once they change, or when watching restarts.
+    """
+
+    def ingest(batch: set[Path]) -> None:
+        ingestor.ingest([*reader.files_from(batch), *pdf_reader.files_from(batch)])
+
+    try:
+        ingest(paths)
+        return
+    except Exception:
+        if len(paths) == 1:
+            logging.exception(f"Failed to ingest '{next(iter(paths))}'")
+            return
+        logging.exception(f"Failed to ingest {len(paths)} files, retrying them one by one")
+    for path in sorted(paths):
+        try:
+            ingest({path})
+        except Exception:
+            logging.exception(f"Failed to ingest '{path}'")
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(
+    csvdir: Path = DATA_PATH / "input",
+    manifest_path: Path = MANIFEST_PATH,
+    store_path: Path = STORE_PATH,
+    fingerprints_path: Path = FINGERPRINTS_PATH,
+    snapshot_path: Path = SNAPSHOT_PATH,
+    pdf_cache_path: Path = PDF_CACHE_PATH,
+    staged: bool = False,
+    concurrency: StageConcurrency = StageConcurrency(),
+):
+    ingestor = _create_ingestor(manifest_path, store_path, fingerprints_path, snapshot_path)
+    reader = CSVDataReader(csvdir, schema=None, skip_hashes=set(), manifest=ingestor.manifest)
+    pdf_reader = _create_pdf_reader(csvdir, ingestor, pdf_cache_path)
+    files = [*reader.files, *pdf_reader.files]
+    if staged:
+        parsed = asyncio.run(run_staged_ingest(ingestor, files, concurrency))
+    else:
+        parsed = ingestor.ingest(files)
     print(parsed)
 
+    # Presentation stage, dash is only imported when it runs:
+    # from dash import Dash
+    # app = Dash()
     # app.layout = []
     # eod_balance = {}
 
@@ -70,5 +178,41 @@ if __name__ == "__main__":
     #
     # * new files can be filtered by calculating their hashes
 
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--watch", action="store_true", help="keep ingesting new statements as they arrive"
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="overlap reading, parsing and storing of files (bounded memory for large backlogs)",
+    )
+    defaults = StageConcurrency()
+    parser.add_argument(
+        "--read-workers",
+        type=_positive_int,
+        default=defaults.read,
+        help="with --staged, files read at the same time",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=_positive_int,
+        default=defaults.parse,
+        help="with --staged, files parsed at the same time",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=_positive_int,
+        default=defaults.queue_size,
+        help="with --staged, files waiting between two stages, which bounds memory use",
+    )
+    args = parser.parse_args()
+    configure_logging(level=logging.DEBUG if DEBUG else logging.INFO)
+    if args.watch:
+        watch()
+    else:
+        main(
+            staged=args.staged,
+            concurrency=StageConcurrency(args.read_workers, args.parse_workers, args.queue_size),
+        )
     # app.run(debug=DEBUG)
@@ -1,11 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 from pathlib import Path
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 import pytest
 from pytest_mock import MockerFixture
 
-from budgething.data_io.csv_data_reader import CSVDataReader, CSVFile
+from budgething.data_io.csv_data_reader import CSVDataReader, CSVFile, ReadSpec
 
 
 @pytest.fixture(name="csv_file")
@@ -93,6 +95,69 @@ class TestCSVFile:
             check_like=True,
         )
 
+    def test_load_returns_hash_dialect_and_data_from_single_open(
+        self, tmp_path: Path, mocker: MockerFixture
+    ):
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text(" col1 ; col2\nval1;val2", encoding="utf-8")
+        expected_sha256 = hashlib.sha256(csv_file.read_bytes()).hexdigest()
+        obj = CSVFile(csv_file)
+        spy = mocker.spy(Path, "open")
+
+        result = obj.load(strip=True)
+
+        assert spy.call_count == 1
+        assert result.sha256 == expected_sha256
+        assert result.dialect.delimiter == ";"
+        assert_frame_equal(result.data, pd.DataFrame({"col1": ["val1"], "col2": ["val2"]}))
+        assert (obj.sha256, obj.delimiter, obj.schema) == (result.sha256, ";", {"col1", "col2"})
+        assert spy.call_count == 1
+
+    def test_load_does_not_sniff_a_known_delimiter(self, tmp_path: Path, mocker: MockerFixture):
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text("col1;col2\nval1;val2", encoding="utf-8")
+        obj = CSVFile(csv_file, delimiter=";")
+        spy = mocker.spy(CSVFile, "_sniff")
+
+        result = obj.load()
+
+        spy.assert_not_called()
+        assert result.dialect is None
+        assert obj.schema == {"col1", "col2"}
+
+    def test_read_with_spec_loads_only_requested_columns(self, tmp_path: Path):
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text(" id , note , amount\n001, foo, 1.50\n002, bar, 2", encoding="utf-8")
+
+        df = CSVFile(csv_file).read(
+            strip=True, spec=ReadSpec(frozenset({"id", "amount", "missing"}), {"id": str})
+        )
+
+        assert_frame_equal(df, pd.DataFrame({"id": ["001", "002"], "amount": [1.5, 2.0]}))
+
+    def test_read_strip_keeps_missing_values(self, tmp_path: Path):
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text("col1,col2\nval1,\n  ,val2", encoding="utf-8")
+        assert_frame_equal(
+            CSVFile(csv_file).read(strip=True),
+            pd.DataFrame({"col1": ["val1", np.nan], "col2": [np.nan, "val2"]}),
+        )
+
+    def test_read_with_pyarrow_engine_matches_c_engine(self, tmp_path: Path):
+        pytest.importorskip("pyarrow")
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text(
+            " col1 , col2 , col3\nval1  , 1.5,\n   , 2, val3 \nval4,3, ", encoding="utf-8"
+        )
+        obj = CSVFile(csv_file)
+
+        result = obj.read(strip=True, add_meta=True, engine="pyarrow")
+        expected = obj.read(strip=True, add_meta=True)
+
+        assert result["col1"].dtype == pd.StringDtype("pyarrow")
+        assert_frame_equal(result.isna(), expected.isna())
+        assert_frame_equal(result.fillna(""), expected.fillna(""), check_dtype=False)
+
 
 class TestCSVDataReader:
     def test_constructor_raises_for_non_directory_path(self, tmp_path: Path):
@@ -165,3 +230,20 @@ class TestCSVDataReader:
         df = obj.get_all(add_meta=False, strip=False)
         expected_df = pd.DataFrame({"col1": ["val1", "val3"], "col2": ["val2", "val4"]})
         assert_frame_equal(df, expected_df, check_like=True)
+
+    @pytest.mark.parametrize("use_threads", [False, True], ids=["process_pool", "thread_pool"])
+    def test_get_all_parallel_matches_serial(self, tmp_path: Path, use_threads: bool):
+        for i in reversed(range(5)):
+            rows = "\n".join(f"val{i}_{j}, {j}" for j in range(i + 1))
+            (tmp_path / f"test{i}.csv").write_text(f"col1,col2\n{rows}", encoding="utf-8")
+        obj = CSVDataReader(tmp_path, schema={"col1", "col2"}, skip_hashes=set())
+
+        serial = obj.get_all(add_meta=True, strip=True)
+        if use_threads:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                parallel = obj.get_all(add_meta=True, strip=True, executor=executor)
+        else:
+            parallel = obj.get_all(add_meta=True, strip=True, workers=2)
+
+        assert_frame_equal(parallel, serial)
+        assert list(serial["source"].drop_duplicates()) == sorted(tmp_path.glob("*.csv"))
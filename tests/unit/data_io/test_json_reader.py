@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+import pytest
+
+from budgething.data_io.json_reader import (
+    JSONSnapshotError,
+    JSONTransactionReader,
+    iter_json_array,
+)
+
+RECORDS = [
+    {"date": f"2024-01-{i % 28 + 1:02d}", "amount": i * 1.25, "description": f'shop "{i}", ]'}
+    for i in range(25)
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_json_array_streams_items_across_chunk_boundaries(tmp_path: Path, chunk_size: int):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps([*RECORDS, -4.5e3, True, None], indent=4), encoding="utf-8")
+
+    assert list(iter_json_array(path, chunk_size=chunk_size)) == [*RECORDS, -4.5e3, True, None]
+
+
+@pytest.mark.parametrize("content", ["", "{}", "[", '[{"date":', "[1 2]", "[1,]"])
+def test_iter_json_array_rejects_invalid_arrays(tmp_path: Path, content: str):
+    path = tmp_path / "data.json"
+    path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(JSONSnapshotError):
+        list(iter_json_array(path, chunk_size=2))
+
+
+def test_reader_uses_newest_complete_snapshot_per_family(tmp_path: Path):
+    (tmp_path / "transactions_20250516_004009.json").write_text(
+        json.dumps(RECORDS[:3]), encoding="utf-8"
+    )
+    (tmp_path / "transactions_20250516_004357.json").write_text(
+        json.dumps(RECORDS), encoding="utf-8"
+    )
+    (tmp_path / "transactions_20250516_004704.json").write_text(
+        '[\n    {\n        "date": ', encoding="utf-8"
+    )
+    (tmp_path / "balances_20250101_000000.json").write_text(
+        json.dumps([{"date": "2025-01-01", "balance": 10.0}]), encoding="utf-8"
+    )
+    (tmp_path / "notes.json").write_text("[]", encoding="utf-8")
+    reader = JSONTransactionReader(tmp_path, batch_size=10)
+
+    assert list(reader.snapshots()) == ["balances", "transactions"]
+    assert_frame_equal(reader.read(), pd.DataFrame(RECORDS))
+    assert_frame_equal(
+        reader.read(columns=["date", "amount"]), pd.DataFrame(RECORDS)[["date", "amount"]]
+    )
+    assert len(reader.get_all()) == len(RECORDS) + 1
+    with pytest.raises(JSONSnapshotError):
+        list(reader.iter_batches())
+
+
+def test_iter_batches_yields_fixed_size_frames(tmp_path: Path):
+    (tmp_path / "transactions_20250516_004009.json").write_text(
+        json.dumps(RECORDS), encoding="utf-8"
+    )
+
+    batches = list(JSONTransactionReader(tmp_path, batch_size=10).iter_batches())
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert_frame_equal(pd.concat(batches, ignore_index=True), pd.DataFrame(RECORDS))
@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from budgething.data_io.csv_data_reader import CSVDataReader, CSVFile
+from budgething.data_io.manifest import FileKey, FileManifest, ManifestEntry
+
+
+@pytest.fixture(name="csv_path")
+def fixture_csv_path(tmp_path: Path) -> Path:
+    (tmp_path / "input").mkdir()
+    path = tmp_path / "input" / "test.csv"
+    path.write_text("col1;col2\nval1;val2", encoding="utf-8")
+    return path
+
+
+class TestFileManifest:
+    def test_round_trip(self, tmp_path: Path, csv_path: Path):
+        manifest = FileManifest(tmp_path / "manifest.json")
+        key = FileKey.from_path(csv_path)
+        entry = ManifestEntry("abc", ";", "utf-8", ("col1", "col2"))
+        manifest.put(key, entry)
+        manifest.mark_ingested({"abc"})
+        manifest.save()
+
+        reloaded = FileManifest(tmp_path / "manifest.json")
+        assert reloaded.get(key) == entry._replace(ingested=True)
+        assert reloaded.ingested_hashes == {"abc"}
+
+    def test_get_misses_when_file_changes(self, tmp_path: Path, csv_path: Path):
+        manifest = FileManifest(tmp_path / "manifest.json")
+        key = FileKey.from_path(csv_path)
+        manifest.put(key, ManifestEntry("abc", ";", "utf-8", ("col1", "col2")))
+
+        csv_path.write_text("col1;col2\nval1;val2\nval3;val4", encoding="utf-8")
+        assert manifest.get(FileKey.from_path(csv_path)) is None
+
+    def test_copies_of_ingested_files_are_ingested(self, tmp_path: Path, csv_path: Path):
+        manifest = FileManifest(tmp_path / "manifest.json")
+        manifest.put(FileKey("a.csv", 1, 1, 1), ManifestEntry("abc", ";", "utf-8", ()))
+        manifest.mark_ingested(["abc"])
+
+        manifest.put(FileKey("copy.csv", 1, 2, 2), ManifestEntry("abc", ";", "utf-8", ()))
+        manifest.put(FileKey("b.csv", 1, 3, 3), ManifestEntry("def", ";", "utf-8", ()))
+
+        assert manifest.get(FileKey("copy.csv", 1, 2, 2)).ingested
+        assert manifest.ingested_hashes == {"abc"}
+
+
+class TestCSVDataReaderWithManifest:
+    def test_unchanged_files_are_not_rehashed(
+        self, tmp_path: Path, csv_path: Path, mocker: MockerFixture
+    ):
+        manifest = FileManifest(tmp_path / "manifest.json")
+        CSVDataReader(csv_path.parent, schema=None, skip_hashes=set(), manifest=manifest).files
+
+        spy = mocker.spy(CSVFile, "manifest_entry")
+        files = CSVDataReader(
+            csv_path.parent, schema={"col1"}, skip_hashes=set(), manifest=manifest
+        ).files
+        assert [f.filepath for f in files] == [csv_path]
+        assert files[0].delimiter == ";"
+        spy.assert_not_called()
+
+    def test_ingested_files_are_skipped(self, tmp_path: Path, csv_path: Path):
+        manifest = FileManifest(tmp_path / "manifest.json")
+        reader = CSVDataReader(csv_path.parent, schema=None, skip_hashes=set(), manifest=manifest)
+        manifest.mark_ingested(f.sha256 for f in reader.files)
+        manifest.save()
+
+        reader = CSVDataReader(
+            csv_path.parent,
+            schema=None,
+            skip_hashes=set(),
+            manifest=FileManifest(tmp_path / "manifest.json"),
+        )
+        assert reader.files == []
+
+        csv_path.write_text("col1;col2\nval10;val20", encoding="utf-8")
+        assert [f.filepath for f in reader.files] == [csv_path]
+
+    def test_unreadable_files_are_listed_but_not_cached(self, tmp_path: Path, csv_path: Path):
+        (csv_path.parent / "empty.csv").write_text("", encoding="utf-8")
+        (csv_path.parent / "garbage.csv").write_bytes(b"\xff\xfe\x00garbage\x00\n")
+        manifest = FileManifest(tmp_path / "manifest.json")
+
+        files = CSVDataReader(
+            csv_path.parent, schema=None, skip_hashes=set(), manifest=manifest
+        ).files
+
+        assert [f.filepath.name for f in files] == ["empty.csv", "garbage.csv", "test.csv"]
+        assert len(manifest) == 1
+        assert CSVDataReader(
+            csv_path.parent, schema={"col1"}, skip_hashes=set(), manifest=manifest
+        ).files == [files[-1]]
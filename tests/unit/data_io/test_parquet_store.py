@@ -0,0 +1,92 @@
+from pathlib import Path
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from budgething.data_io.parquet_store import ParquetTransactionStore
+from budgething.data_io.transaction_schema import normalize_transactions
+
+
+def transactions(dates: list[str], account: str, amounts: list[float]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(dates),
+            "amount": amounts,
+            "currency": "PLN",
+            "account": account,
+            "source": Path(f"{account}.csv"),
+            "line_number": range(len(dates)),
+        }
+    )
+
+
+@pytest.fixture(name="store")
+def fixture_store(tmp_path: Path) -> ParquetTransactionStore:
+    store = ParquetTransactionStore(tmp_path / "store")
+    store.create(transactions(["2024-04-30", "2024-05-02", "2024-05-20"], "revolut", [1, 2, 3]))
+    store.create(transactions(["2024-05-01", "2024-06-01"], "pekao24", [10, 20]))
+    return store
+
+
+def test_create_partitions_by_account_and_month(store: ParquetTransactionStore):
+    assert store.partitions() == [
+        ("pekao24", "2024-05"),
+        ("pekao24", "2024-06"),
+        ("revolut", "2024-04"),
+        ("revolut", "2024-05"),
+    ]
+
+
+def test_create_appends(store: ParquetTransactionStore):
+    store.create(transactions(["2024-05-03"], "revolut", [4]))
+    result = store.read(columns=["date", "amount"], accounts=["revolut"])
+    assert result["amount"].tolist() == [1, 2, 4, 3]
+
+
+def test_read_round_trips_normalized_data(tmp_path: Path):
+    store = ParquetTransactionStore(tmp_path)
+    data = transactions(["2024-04-30", "2024-05-02"], "revolut", [1.5, -2.25])
+    store.create(data)
+    assert_frame_equal(store.get_all(), normalize_transactions(data))
+
+
+@pytest.mark.parametrize(
+    "kwargs,expected",
+    [
+        pytest.param({"accounts": ["pekao24"]}, [10, 20], id="account"),
+        pytest.param({"start": "2024-05-02", "end": "2024-06-01"}, [2, 3], id="date_range"),
+        pytest.param({"accounts": ["revolut"], "end": "2024-05-01"}, [1], id="both"),
+    ],
+)
+def test_read_with_predicates(store: ParquetTransactionStore, kwargs: dict, expected: list):
+    result = store.read(columns=["date", "amount"], **kwargs)
+    assert list(result.columns) == ["date", "amount"]
+    assert result["amount"].tolist() == expected
+
+
+def test_update_replaces_touched_partitions_only(store: ParquetTransactionStore):
+    store.update(transactions(["2024-05-05"], "revolut", [99]))
+    assert store.read(columns=["amount"], accounts=["revolut"])["amount"].tolist() == [1, 99]
+
+
+def test_delete_partitions(store: ParquetTransactionStore):
+    assert store.delete(months=["2024-05"]) == [("pekao24", "2024-05"), ("revolut", "2024-05")]
+    assert store.get_all()["amount"].tolist() == [1, 20]
+    store.delete()
+    assert store.get_all().empty
+
+
+def test_read_fills_columns_missing_from_older_files(tmp_path: Path):
+    store = ParquetTransactionStore(tmp_path / "store")
+    data = transactions(["2024-05-01", "2024-05-02"], "revolut", [1.0, 2.0]).assign(
+        balance_date=pd.to_datetime(["2024-05-01 10:00", "2024-05-03 00:00"])
+    )
+    store.create(data.iloc[:1])
+    old_file = next((tmp_path / "store").rglob("*.parquet"))
+    pd.read_parquet(old_file).drop(columns="balance_date").to_parquet(old_file, index=False)
+    store.create(data.iloc[1:])
+
+    assert store.get_all()["balance_date"].tolist() == [pd.NaT, pd.Timestamp("2024-05-03")]
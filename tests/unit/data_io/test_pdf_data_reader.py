@@ -0,0 +1,116 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import shutil
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+import pytest
+from pytest_mock import MockerFixture
+
+from budgething.data_io import pdf_data_reader
+from budgething.data_io.manifest import FileManifest
+from budgething.data_io.pdf_data_reader import (
+    PDFDataReader,
+    PDFExtractionError,
+    PDFFile,
+    extract_pdf_tables,
+)
+from budgething.pipeline.dispatch import dispatch_files
+from budgething.pipeline.parsers.pekao24 import _map_pekao24_data
+from tests.conftest import RESOURCES_ROOT
+
+SAMPLE_PDF = (
+    RESOURCES_ROOT / "acceptance" / "sample_pdf_statements" / "pekao24-sample_2025-05.pdf"
+)
+
+
+@pytest.fixture(name="pdf_dir")
+def fixture_pdf_dir(tmp_path: Path) -> Path:
+    pdf_dir = tmp_path / "input"
+    pdf_dir.mkdir()
+    shutil.copy(SAMPLE_PDF, pdf_dir)
+    return pdf_dir
+
+
+def test_pdf_file_init_fails_for_non_pdf_file():
+    with pytest.raises(ValueError):
+        PDFFile(Path("statement.csv"))
+
+
+def test_read_joins_pages_and_drops_repeated_headers():
+    data = PDFFile(SAMPLE_PDF).read(add_meta=True, strip=True)
+
+    assert list(data.columns) == [
+        "line_number",
+        "Data księgowania",
+        "Data waluty",
+        "Kwota operacji",
+        "Waluta",
+        "Typ operacji",
+        "Kategoria",
+        "source",
+    ]
+    assert data["line_number"].tolist() == list(range(6))
+    assert data["Kwota operacji"].tolist() == [
+        "-235,62",
+        "-159,99",
+        "5 000,00",
+        "-12,50",
+        "-1 020,00",
+        "-42,00",
+    ]
+    assert data.loc[0, "Typ operacji"] == "PŁATNOŚĆ BLIK"
+    assert (data["source"] == SAMPLE_PDF).all()
+
+
+def test_extraction_is_cached_by_sha256(tmp_path: Path, mocker: MockerFixture):
+    expected = PDFFile(SAMPLE_PDF, cache_dir=tmp_path).extract()
+    assert (tmp_path / f"{PDFFile(SAMPLE_PDF).sha256}.parquet").exists()
+
+    mocker.patch.object(pdf_data_reader, "_extract_pages", side_effect=AssertionError)
+    copy = tmp_path / "renamed.pdf"
+    shutil.copy(SAMPLE_PDF, copy)
+    assert_frame_equal(PDFFile(copy, cache_dir=tmp_path).extract(), expected)
+
+
+def test_pages_are_extracted_in_parallel_chunks(mocker: MockerFixture):
+    mocker.patch.object(PDFFile, "PAGES_PER_TASK", 1)
+    serial = PDFFile(SAMPLE_PDF)
+    parallel = PDFFile(SAMPLE_PDF)
+    extract_pages = mocker.spy(pdf_data_reader, "_extract_pages")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        extract_pdf_tables([parallel], executor=executor)
+
+    assert extract_pages.call_count == 5
+    assert_frame_equal(parallel.extract(), serial.extract())
+
+
+def test_reader_skips_unreadable_and_ingested_files(pdf_dir: Path, tmp_path: Path):
+    (pdf_dir / "broken.pdf").write_bytes(b"not a pdf")
+    (pdf_dir / "statement.csv").write_text("a,b\n1,2", encoding="utf-8")
+    manifest = FileManifest(tmp_path / "manifest.json")
+
+    files = PDFDataReader(pdf_dir, schema=None, skip_hashes=set(), manifest=manifest).files
+
+    assert [f.filepath.name for f in files] == [SAMPLE_PDF.name]
+    assert len(manifest) == 1
+    manifest.mark_ingested([files[0].sha256])
+    assert PDFDataReader(pdf_dir, schema=None, skip_hashes=set(), manifest=manifest).files == []
+    with pytest.raises(PDFExtractionError):
+        PDFFile(pdf_dir / "broken.pdf").extract()
+
+
+def test_pdf_statements_go_through_the_parser_registry(pdf_dir: Path):
+    files = PDFDataReader(pdf_dir, schema=None, skip_hashes=set()).files
+
+    result = dispatch_files(files)
+
+    assert result.routed == {_map_pekao24_data: files}
+    parsed = _map_pekao24_data(files[0].read(add_meta=True, strip=True))
+    assert parsed["amount"].tolist() == [-235.62, -159.99, 5000.0, -12.5, -1020.0, -42.0]
+    assert parsed["date"].tolist() == list(
+        pd.to_datetime(
+            ["2025-05-01", "2025-05-05", "2025-05-06", "2025-05-07", "2025-05-10", "2025-05-12"]
+        )
+    )
@@ -0,0 +1,119 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
+import pyarrow as pa
+import pytest
+from pytest_mock import MockerFixture
+
+from budgething.data_io import snapshot
+from budgething.data_io.snapshot import (
+    append_snapshot,
+    list_snapshots,
+    read_snapshot,
+    write_snapshot,
+)
+
+
+def test_snapshot_round_trip(tmp_path: Path):
+    transactions = pd.DataFrame(
+        {
+            "date": pd.date_range("2024-01-01", periods=3, freq="9h"),
+            "amount": [1.5, -2.0, 3.25],
+            "currency": pd.array(["PLN", "GBP", None], dtype="string"),
+        }
+    )
+    eod_balance = pd.Series(
+        [10.0, 12.5], index=pd.date_range("2024-01-01", periods=2, name="date"), name="eod_balance"
+    )
+    write_snapshot(tmp_path, transactions=transactions, eod_balance=eod_balance)
+
+    assert list_snapshots(tmp_path) == ["eod_balance", "transactions"]
+    assert_frame_equal(
+        read_snapshot(tmp_path, "transactions"), transactions, check_dtype=False
+    )
+    assert_series_equal(
+        read_snapshot(tmp_path, "eod_balance")["eod_balance"], eod_balance, check_freq=False
+    )
+
+
+def test_read_snapshot_loads_selected_columns_without_copying(tmp_path: Path):
+    n = 1_000_000
+    data = pd.DataFrame(
+        {"amount": np.arange(n, dtype="float64"), "balance": np.ones(n), "other": np.zeros(n)},
+        index=pd.date_range("2000-01-01", periods=n, freq="min", name="date"),
+    )
+    write_snapshot(tmp_path, transactions=data)
+
+    allocated = pa.total_allocated_bytes()
+    result = read_snapshot(tmp_path, "transactions", columns=["amount"])
+
+    assert list(result.columns) == ["amount"]
+    assert result.index.equals(data.index)
+    assert pa.total_allocated_bytes() - allocated < data["amount"].nbytes // 10
+
+
+def test_append_snapshot_writes_only_new_rows(tmp_path: Path, mocker: MockerFixture):
+    transactions = pd.DataFrame(
+        {"amount": [1.5, -2.0], "currency": pd.array(["PLN", "GBP"], dtype="string")}
+    )
+    new = pd.DataFrame({"amount": [3.25], "currency": pd.array(["EUR"], dtype="string")})
+    path = write_snapshot(tmp_path, transactions=transactions)[0]
+    before = path.stat()
+    read = mocker.spy(snapshot, "read_snapshot")
+    write = mocker.spy(snapshot, "write_snapshot")
+
+    append_snapshot(tmp_path, "transactions", new)
+    append_snapshot(tmp_path, "transactions", new)
+
+    read.assert_not_called()
+    write.assert_not_called()
+    assert (path.stat().st_ino, path.stat().st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+    assert list_snapshots(tmp_path) == ["transactions"]
+    assert_frame_equal(
+        read_snapshot(tmp_path, "transactions"),
+        pd.concat([transactions, new, new], ignore_index=True),
+        check_dtype=False,
+    )
+
+
+def test_append_snapshot_keeps_index(tmp_path: Path):
+    index = pd.date_range("2024-01-01", periods=4, name="date")
+    eod_balance = pd.DataFrame({"eod_balance": [10.0, 12.5, 11.0, 9.0]}, index=index)
+    write_snapshot(tmp_path, eod_balance=eod_balance.iloc[:2])
+
+    append_snapshot(tmp_path, "eod_balance", eod_balance.iloc[2:3])
+    append_snapshot(tmp_path, "eod_balance", eod_balance.iloc[3:])
+
+    assert_frame_equal(read_snapshot(tmp_path, "eod_balance"), eod_balance, check_freq=False)
+    assert_frame_equal(
+        read_snapshot(tmp_path, "eod_balance", columns=["eod_balance"]),
+        eod_balance,
+        check_freq=False,
+    )
+
+
+def test_write_snapshot_drops_appended_rows(tmp_path: Path):
+    data = pd.DataFrame({"amount": [1.0, 2.0]})
+    write_snapshot(tmp_path, transactions=data)
+    append_snapshot(tmp_path, "transactions", data)
+
+    write_snapshot(tmp_path, transactions=data)
+
+    assert_frame_equal(read_snapshot(tmp_path, "transactions"), data)
+    assert not any((tmp_path / "transactions.segments").iterdir())
+
+
+def test_append_snapshot_merges_segments(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(snapshot, "MAX_SEGMENTS", 2)
+    data = pd.DataFrame({"amount": [1.0, 2.0]})
+    write_snapshot(tmp_path, transactions=data)
+
+    for _ in range(3):
+        append_snapshot(tmp_path, "transactions", data)
+
+    assert not any((tmp_path / "transactions.segments").iterdir())
+    assert_frame_equal(
+        read_snapshot(tmp_path, "transactions"), pd.concat([data] * 4, ignore_index=True)
+    )
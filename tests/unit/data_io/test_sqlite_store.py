@@ -0,0 +1,150 @@
+from pathlib import Path
+import sqlite3
+from typing import Generator
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+import pytest
+
+from budgething.data_io.sqlite_store import SQLiteTransactionStore
+from budgething.data_io.transaction_schema import normalize_transactions
+
+
+def transactions(
+    dates: list[str], account: str, amounts: list[float], categories: list[str] | None = None
+) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(dates, format="ISO8601"),
+            "amount": amounts,
+            "currency": "PLN",
+            "category": categories,
+            "account": account,
+            "source": f"{account}.csv",
+            "line_number": range(len(dates)),
+        }
+    )
+
+
+@pytest.fixture(name="store")
+def fixture_store(tmp_path: Path) -> Generator[SQLiteTransactionStore, None, None]:
+    with SQLiteTransactionStore(tmp_path / "transactions.db") as store:
+        store.create(
+            transactions(
+                ["2024-04-30 10:00:00", "2024-05-02", "2024-05-20"],
+                "revolut",
+                [1, 2, 3],
+            )
+        )
+        store.create(
+            transactions(["2024-05-01", "2024-06-01"], "pekao24", [10, 20], ["Food", "Rent"])
+        )
+        yield store
+
+
+def test_read_round_trips_normalized_data(tmp_path: Path):
+    data = transactions(["2024-04-30 16:45:30", "2024-05-02"], "revolut", [1.5, -2.25])
+    with SQLiteTransactionStore(tmp_path / "transactions.db") as store:
+        store.create(data)
+        assert_frame_equal(store.get_all(), normalize_transactions(data))
+
+
+def test_read_round_trips_microseconds(tmp_path: Path):
+    data = transactions(
+        ["2024-04-30 16:45:30.000001", "2024-04-30 16:45:30", "2024-04-30 16:45:30.000002"],
+        "revolut",
+        [1.0, 2.0, 3.0],
+    )
+    with SQLiteTransactionStore(tmp_path / "transactions.db") as store:
+        store.create(data)
+        stored = store.get_all()
+
+    assert stored["date"].dt.microsecond.tolist() == [0, 1, 2]
+    assert stored["amount"].tolist() == [2.0, 1.0, 3.0]
+
+
+def test_create_keeps_rows_with_invalid_amounts(tmp_path: Path):
+    # Parsers keep rows whose amount cell could not be parsed, with a missing amount
+    data = transactions(["2024-05-01", "2024-05-02"], "revolut", [1.5, float("nan")])
+    with SQLiteTransactionStore(tmp_path / "transactions.db") as store:
+        assert store.create(data) == 2
+        assert_frame_equal(store.get_all(), normalize_transactions(data))
+        assert store.aggregate()["amount"].tolist() == [1.5]
+
+
+def test_create_rejects_duplicates(store: SQLiteTransactionStore):
+    with pytest.raises(sqlite3.IntegrityError):
+        store.create(transactions(["2024-05-05"], "revolut", [99]))
+
+
+def test_update_replaces_rows(store: SQLiteTransactionStore):
+    assert store.update(transactions(["2024-05-05"], "revolut", [99])) == 1
+    assert store.read(columns=["amount"], accounts=["revolut"])["amount"].tolist() == [2, 99, 3]
+
+
+@pytest.mark.parametrize(
+    "kwargs,expected",
+    [
+        pytest.param({"accounts": ["pekao24"]}, [10, 20], id="account"),
+        pytest.param({"start": "2024-05-01", "end": "2024-06-01"}, [10, 2, 3], id="date_range"),
+        pytest.param({"accounts": ["revolut"], "end": "2024-05-01"}, [1], id="both"),
+    ],
+)
+def test_read_with_predicates(store: SQLiteTransactionStore, kwargs: dict, expected: list):
+    result = store.read(columns=["date", "amount"], **kwargs)
+    assert list(result.columns) == ["date", "amount"]
+    assert result["amount"].tolist() == expected
+
+
+def test_delete(store: SQLiteTransactionStore):
+    assert store.delete(accounts=["revolut"], start="2024-05-01") == 2
+    assert store.get_all()["amount"].tolist() == [1, 10, 20]
+
+
+def test_aggregate(store: SQLiteTransactionStore):
+    assert store.aggregate(by="account", freq="month").values.tolist() == [
+        ["pekao24", "2024-05", 10, 1],
+        ["pekao24", "2024-06", 20, 1],
+        ["revolut", "2024-04", 1, 1],
+        ["revolut", "2024-05", 5, 2],
+    ]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT SUM(amount) FROM transactions WHERE account = 'revolut' AND date >= '2024-05'",
+        "SELECT SUM(amount) FROM transactions WHERE category = 'Food' AND date >= '2024-05'",
+    ],
+)
+def test_range_queries_use_covering_index(store: SQLiteTransactionStore, query: str):
+    plan = store.connection.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+    assert "USING COVERING INDEX" in plan[0][-1]
+
+
+def test_database_uses_wal_mode(store: SQLiteTransactionStore):
+    assert store.connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_read_round_trips_balance_dates(tmp_path: Path):
+    data = transactions(["2024-05-05 09:12:27", "2024-05-06"], "revolut", [1.0, 2.0]).assign(
+        balance_date=pd.to_datetime(["2024-05-06 10:48:33.5", None])
+    )
+    with SQLiteTransactionStore(tmp_path / "transactions.db") as store:
+        store.create(data)
+        assert_frame_equal(store.get_all(), normalize_transactions(data))
+
+
+def test_open_adds_balance_date_to_older_databases(tmp_path: Path):
+    path = tmp_path / "transactions.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE transactions (date TEXT NOT NULL, amount NUMERIC, currency TEXT, "
+            "balance NUMERIC, category TEXT, payment_type TEXT, account TEXT NOT NULL, "
+            "source TEXT NOT NULL, line_number INTEGER NOT NULL, PRIMARY KEY (source, line_number))"
+        )
+    connection.close()
+
+    with SQLiteTransactionStore(path) as store:
+        store.create(transactions(["2024-05-01"], "revolut", [1.0]))
+        assert store.get_all()["balance_date"].isna().all()
@@ -0,0 +1,42 @@
+from pathlib import Path
+import sys
+import threading
+import time
+
+import pytest
+
+from budgething.data_io.watcher import DirectoryWatcher
+
+BACKENDS = [
+    pytest.param(
+        "inotify",
+        marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only"),
+    ),
+    "polling",
+]
+
+
+def write_later(path: Path, content: str, delay: float) -> None:
+    threading.Timer(delay, path.write_text, args=(content,), kwargs={"encoding": "utf-8"}).start()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_batches_reports_new_and_changed_files(tmp_path: Path, backend: str):
+    existing = tmp_path / "existing.csv"
+    existing.write_text("a,b\n1,2", encoding="utf-8")
+    stop = threading.Event()
+
+    with DirectoryWatcher(
+        tmp_path, suffixes={".csv"}, debounce=0.1, poll_interval=0.05, backend=backend
+    ) as watcher:
+        batches = watcher.batches(stop)
+        write_later(tmp_path / "new.CSV", "a,b\n3,4", delay=0.05)
+        write_later(tmp_path / "ignored.txt", "foo", delay=0.05)
+        write_later(existing, "a,b\n1,2\n5,6", delay=0.1)
+        start = time.monotonic()
+
+        assert next(batches) == {tmp_path / "new.CSV", existing}
+        assert time.monotonic() - start < 1.0
+
+        stop.set()
+        assert list(batches) == []
@@ -0,0 +1,139 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+import pytest
+
+from budgething.pipeline.models import Currency
+from budgething.pipeline.process.aggregate_cube import AggregateCube, Period, Sign
+from budgething.pipeline.transform.currency import RateMatrix
+
+# 4 PLN and 1 EUR per euro throughout January and February 2024
+RATES = RateMatrix(("PLN", "EUR"), np.datetime64("2024-01-01"), np.array([[4.0] * 60, [1.0] * 60]))
+
+
+def transactions(*rows: tuple) -> pd.DataFrame:
+    columns = ["date", "amount", "currency", "account", "category", "payment_type"]
+    data = pd.DataFrame(list(rows), columns=columns)
+    return data.assign(date=pd.to_datetime(data["date"], format="ISO8601"))
+
+
+HISTORY = transactions(
+    ("2024-01-01 10:00", -10.0, "PLN", "bank", "food", "card"),
+    ("2024-01-01 18:00", 5.0, "EUR", "revolut", None, "transfer"),
+    ("2024-01-09", -2.0, "PLN", "bank", "food", "card"),
+    ("2024-01-10", -8.0, "PLN", "bank", "rent", "transfer"),
+    ("2024-02-03", 100.0, "PLN", "bank", "salary", "transfer"),
+)
+
+
+@pytest.fixture(name="cube")
+def fixture_cube(tmp_path: Path) -> AggregateCube:
+    cube = AggregateCube(tmp_path, Currency.PLN, rates=RATES)
+    cube.rebuild(HISTORY)
+    return cube
+
+
+def test_query_sums_periods_in_the_target_currency(cube: AggregateCube):
+    monthly = cube.query(Period.MONTH, by=["sign"])
+
+    expected = pd.DataFrame(
+        {"amount": [-20.0, 20.0, 100.0], "count": [3, 1, 1]},
+        index=pd.MultiIndex.from_arrays(
+            [
+                pd.to_datetime(["2024-01-01", "2024-01-01", "2024-02-01"]),
+                pd.CategoricalIndex(["expense", "income", "income"]),
+            ],
+            names=["date", "sign"],
+        ),
+    )
+    assert_frame_equal(monthly, expected, check_categorical=False)
+
+
+def test_query_filters_slices(cube: AggregateCube):
+    weekly = cube.query(Period.WEEK, by=["category"], sign=Sign.EXPENSE, account=["bank"])
+
+    assert weekly.index.get_level_values("date").strftime("%Y-%m-%d").tolist() == [
+        "2024-01-01",
+        "2024-01-08",
+        "2024-01-08",
+    ]
+    assert weekly["amount"].tolist() == [-10.0, -2.0, -8.0]
+    assert cube.query(Period.DAY, start="2024-01-09", end="2024-01-09")["count"].tolist() == [1]
+    with pytest.raises(ValueError):
+        cube.query(Period.DAY, by=["currency"])
+
+
+def test_update_matches_a_rebuild_and_keeps_other_periods(tmp_path: Path, cube: AggregateCube):
+    new = transactions(
+        ("2024-01-09 12:00", -3.0, "PLN", "bank", "food", "card"),
+        ("2024-01-09 13:00", -1.0, "EUR", "revolut", "food", "card"),
+    )
+    before = cube.query(Period.MONTH, by=["category"])
+
+    changed = cube.update(new)
+
+    assert set(zip(changed["period"], changed["date"].dt.strftime("%Y-%m-%d"))) == {
+        ("day", "2024-01-09"),
+        ("week", "2024-01-08"),
+        ("month", "2024-01-01"),
+    }
+    rebuilt = AggregateCube(tmp_path / "rebuilt", Currency.PLN, rates=RATES)
+    rebuilt.rebuild(pd.concat([HISTORY, new], ignore_index=True))
+    reloaded = AggregateCube(tmp_path, Currency.PLN, rates=RATES)
+    for period in Period:
+        assert_frame_equal(
+            reloaded.query(period, by=["account", "category", "payment_type", "sign"]),
+            rebuilt.query(period, by=["account", "category", "payment_type", "sign"]),
+        )
+    after = cube.query(Period.MONTH, by=["category"])
+    assert after.loc[("2024-02-01", "salary"), "amount"] == before.loc[
+        ("2024-02-01", "salary"), "amount"
+    ]
+    assert after.loc[("2024-01-01", "food"), "amount"] == -19.0
+
+
+def test_update_requires_a_rebuilt_cube(tmp_path: Path):
+    with pytest.raises(FileNotFoundError):
+        AggregateCube(tmp_path, Currency.PLN, rates=RATES).update(HISTORY)
+
+
+def test_update_adds_pending_transactions_once_their_rate_is_known(tmp_path: Path):
+    before_rates = transactions(("2023-12-30", -6.0, "EUR", "bank", "food", "card"))
+    cube = AggregateCube(tmp_path, Currency.PLN, rates=RATES)
+    cube.rebuild(pd.concat([HISTORY, before_rates], ignore_index=True))
+
+    assert cube.query(Period.MONTH)["count"].sum() == len(HISTORY)
+
+    # The same rates, known from December 2023 on
+    rates = RateMatrix(
+        ("PLN", "EUR"), np.datetime64("2023-12-01"), np.array([[4.0] * 90, [1.0] * 90])
+    )
+    cube = AggregateCube(tmp_path, Currency.PLN, rates=rates)
+    cube.update(transactions(("2024-02-04", -1.0, "PLN", "bank", "food", "card")))
+
+    assert cube.query(Period.DAY, end="2023-12-31")["amount"].tolist() == [-24.0]
+    assert cube.update(transactions()).empty
+    assert cube.query(Period.MONTH)["count"].sum() == len(HISTORY) + 2
+
+
+def test_transactions_in_unsupported_currencies_stay_pending(tmp_path: Path):
+    aed = transactions(("2024-01-05", -8.0, "AED", "revolut", "food", "card"))
+    cube = AggregateCube(tmp_path, Currency.PLN, rates=RATES)
+    cube.rebuild(pd.concat([HISTORY, aed], ignore_index=True))
+
+    assert cube.query(Period.MONTH)["count"].sum() == len(HISTORY)
+
+    # 4 AED per euro
+    rates = RateMatrix(
+        ("PLN", "EUR", "AED"),
+        np.datetime64("2024-01-01"),
+        np.array([[4.0] * 60, [1.0] * 60, [4.0] * 60]),
+    )
+    cube = AggregateCube(tmp_path, Currency.PLN, rates=rates)
+    cube.update(transactions())
+
+    assert cube.query(Period.DAY, start="2024-01-05", end="2024-01-05")["amount"].tolist() == [
+        -8.0
+    ]
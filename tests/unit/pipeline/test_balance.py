@@ -0,0 +1,38 @@
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from budgething.pipeline.transform.amount import aggregate_daily_net_amounts
+from budgething.pipeline.transform.balance import extract_eod_balance
+
+
+def test_extract_eod_balance_takes_the_latest_transaction_of_each_day():
+    data = pd.DataFrame(
+        {
+            "date": pd.to_datetime(
+                ["2024-01-01 18:00", "2024-01-01 09:00", "2024-01-03 12:00", "2024-01-03 12:00"]
+            ),
+            "balance": [30.0, 10.0, 5.0, 7.0],
+        }
+    )
+
+    expected = pd.Series(
+        [30.0, 7.0],
+        index=pd.DatetimeIndex(["2024-01-01", "2024-01-03"], name="date"),
+        name="eod_balance",
+    )
+    assert_series_equal(extract_eod_balance(data), expected)
+
+
+def test_aggregate_daily_net_amounts_indexes_by_normalized_days():
+    data = pd.DataFrame(
+        {
+            "date": pd.date_range("2023-01-01", periods=8, freq="9h"),
+            "amount": [100, -50, 200, -100, 50, 175, -75, 25],
+        }
+    )
+
+    expected = pd.DataFrame(
+        {"daily_net_amount": [250, 125, -50]},
+        index=pd.date_range("2023-01-01", periods=3, name="date"),
+    )
+    assert_frame_equal(aggregate_daily_net_amounts(data), expected, check_freq=False)
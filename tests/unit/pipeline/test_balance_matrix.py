@@ -0,0 +1,83 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from budgething.pipeline.process.balance_matrix import BalanceMatrix
+from budgething.pipeline.process.eod_balance import sum_eod_balances
+from budgething.pipeline.transform.date import get_max_range
+
+
+def eod(values: dict[str, float], dtype: str = "float64") -> pd.Series:
+    return pd.Series(
+        list(values.values()),
+        index=pd.to_datetime(list(values), format="ISO8601"),
+        dtype=dtype,
+        name="eod_balance",
+    )
+
+
+def test_balance_matrix_aligns_and_forward_fills_accounts():
+    matrix = BalanceMatrix.from_series(
+        {
+            "a": eod({"2024-01-01": 10.0, "2024-01-03": 30.0}),
+            "b": eod({"2024-01-02 18:00": 5.0, "2024-01-02 09:00": 4.0, "2024-01-03": np.nan}),
+            "c": eod({"2024-01-04": 1.0}),
+        }
+    )
+
+    days = pd.date_range("2024-01-01", "2024-01-04", name="date")
+    assert_frame_equal(
+        matrix.per_account(),
+        pd.DataFrame(
+            {
+                "a": [10.0, 10.0, 30.0, 30.0],
+                "b": [np.nan, 5.0, 5.0, 5.0],
+                "c": [np.nan, np.nan, np.nan, 1.0],
+            },
+            index=days,
+        ),
+    )
+    assert_series_equal(
+        matrix.total(), pd.Series([10.0, 15.0, 35.0, 36.0], index=days, name="eod_balance")
+    )
+
+
+def test_balance_matrix_keeps_minor_units_exact():
+    matrix = BalanceMatrix.from_series(
+        {
+            "a": eod({"2024-01-01": 1001, "2024-01-02": 2002}, dtype="Int64"),
+            "b": eod({"2024-01-02": 7}, dtype="Int64"),
+        }
+    )
+
+    assert matrix.per_account()["b"].tolist() == [pd.NA, 7]
+    assert matrix.total().tolist() == [1001, 2009]
+    assert matrix.total().dtype == np.int64
+
+
+def test_balance_matrix_of_no_balances_is_empty():
+    matrix = BalanceMatrix.from_series({"a": eod({})})
+
+    assert matrix.per_account().empty
+    assert matrix.total().empty
+
+
+def test_sum_eod_balances_accepts_a_generator_of_frames():
+    balances = [
+        eod({"2024-01-01": 1.0, "2024-01-02": 2.0}),
+        eod({"2024-01-02": 10.0}),
+    ]
+    # Balances stored before day indexes became datetime64 are indexed by `datetime.date`
+    balances[1].index = [date(2024, 1, 2)]
+
+    total = sum_eod_balances(sr.to_frame() for sr in balances)
+
+    assert total.tolist() == [1.0, 12.0]
+
+
+def test_get_max_range_accepts_a_generator():
+    dfs = [pd.DataFrame(index=[3, 5]), pd.DataFrame(index=[1, 4])]
+
+    assert get_max_range(df for df in dfs) == (1, 5)
@@ -0,0 +1,126 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from budgething.pipeline.models import Account
+from budgething.pipeline.parsers.helpers import AmountFormat
+from budgething.pipeline.parsers.spec import (
+    BankSpec,
+    Column,
+    ColumnKind,
+    RowFilter,
+    compile_spec,
+)
+from budgething.pipeline.parsers.revolut import REVOLUT_SPEC
+
+SPEC = BankSpec(
+    account=Account.REVOLUT,
+    dates=("Started", "Completed"),
+    date_format="%d.%m.%Y",
+    columns={
+        "amount": Column("Amount", ColumnKind.AMOUNT),
+        "currency": Column("Currency", ColumnKind.UPPER),
+        "payment_type": Column("Type"),
+    },
+    amounts=AmountFormat(decimal=","),
+    drop=(RowFilter({"State": "REVERTED", "Completed": None}),),
+    optional=frozenset({"State"}),
+)
+
+
+def test_bank_spec_fields():
+    assert SPEC.fields == {"Started", "Completed", "Amount", "Currency", "Type", "State"}
+    assert SPEC.required_fields == {"Started", "Completed", "Amount", "Currency", "Type"}
+
+
+def test_compile_spec_maps_filters_and_converts_in_order():
+    data = pd.DataFrame(
+        {
+            "Started": ["02.01.2024", "03.01.2024", "05.01.2024"],
+            "Completed": ["01.01.2024", np.nan, np.nan],
+            "Amount": ["1 234,50", "-3,00", "7"],
+            "Currency": ["pln", "eur", "gbp"],
+            "Type": ["TRANSFER", "CARD", "CARD"],
+            "State": ["COMPLETED", "REVERTED", "PENDING"],
+            "Unused": ["a", "b", "c"],
+            "source": ["a.csv"] * 3,
+            "line_number": [1, 2, 3],
+        }
+    )
+
+    expected = pd.DataFrame(
+        {
+            "date": [datetime(2024, 1, 1), datetime(2024, 1, 5)],
+            "amount": [1234.5, 7.0],
+            "currency": ["PLN", "GBP"],
+            "payment_type": ["TRANSFER", "CARD"],
+            "account": [Account.REVOLUT] * 2,
+            "source": ["a.csv"] * 2,
+            "line_number": [1, 3],
+        },
+        index=[0, 2],
+    )
+    parser = compile_spec(SPEC)
+    assert parser.__name__ == "_map_revolut_data"
+    assert_frame_equal(parser(data), expected)
+
+
+def test_compile_spec_ignores_filters_on_missing_optional_columns():
+    data = pd.DataFrame(
+        {
+            "Started": ["02.01.2024"],
+            "Completed": [np.nan],
+            "Amount": ["1,5"],
+            "Currency": ["pln"],
+            "Type": ["CARD"],
+        }
+    )
+
+    assert len(compile_spec(SPEC)(data)) == 1
+
+
+def test_compile_spec_leaves_out_columns_of_missing_optional_fields():
+    data = pd.DataFrame(
+        {
+            "Type": ["CARD_PAYMENT"],
+            "Started Date": ["2024-05-02 09:38:10"],
+            "Completed Date": ["2024-05-02 09:43:29"],
+            "Amount": ["-15.86"],
+            "Currency": ["gbp"],
+            "Balance": ["842.76"],
+        }
+    )
+
+    result = compile_spec(REVOLUT_SPEC)(data)
+
+    assert "Fee" not in REVOLUT_SPEC.required_fields
+    assert "fee" not in result.columns
+    assert list(result.columns) == [
+        "date",
+        "balance_date",
+        "amount",
+        "currency",
+        "balance",
+        "payment_type",
+        "account",
+    ]
+    assert result["amount"].tolist() == [-15.86]
+
+
+def test_compile_spec_parses_minor_units_of_each_currency():
+    data = pd.DataFrame(
+        {
+            "Started": ["02.01.2024", "03.01.2024"],
+            "Completed": ["02.01.2024", "03.01.2024"],
+            "Amount": ["-12,34", "1 500"],
+            "Currency": ["pln", "jpy"],
+            "Type": ["CARD", "CARD"],
+        }
+    )
+
+    result = compile_spec(SPEC, minor_units=True)(data)
+
+    assert result["amount"].dtype == "Int64"
+    assert result["amount"].tolist() == [-1234, 1500]
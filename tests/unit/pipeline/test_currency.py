@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
+import pytest
+from pytest_mock import MockerFixture
+
+from budgething.pipeline.models import Currency
+from budgething.pipeline.transform import currency
+from budgething.pipeline.transform.currency import (
+    clear_rate_cache,
+    convert_currency,
+    convert_to_all,
+    load_rates,
+)
+
+# Rates in the ECB layout: newest first, "N/A" before a currency was quoted, trailing comma.
+# 2024-01-06 and 2024-01-07 are a weekend.
+ECB_CSV = """\
+Date,GBP,PLN,USD,
+2024-01-08,0.8,4.4,1.1,
+2024-01-05,0.9,4.5,1.2,
+2024-01-04,0.85,4.0,N/A,
+"""
+
+
+@pytest.fixture(name="source")
+def fixture_source(tmp_path: Path) -> Path:
+    clear_rate_cache()
+    path = tmp_path / "eurofxref-hist.csv"
+    path.write_text(ECB_CSV)
+    return path
+
+
+def test_load_rates_forward_fills_days_without_rates(source: Path):
+    rates = load_rates(source, cache_path=None)
+
+    assert rates.currencies == ("GBP", "PLN", "USD", "EUR")
+    assert rates.start == np.datetime64("2024-01-04")
+    assert rates.end == np.datetime64("2024-01-08")
+    days = np.arange("2024-01-03", "2024-01-10", dtype="datetime64[D]")
+    np.testing.assert_array_equal(
+        rates.lookup("PLN", days), [np.nan, 4.0, 4.5, 4.5, 4.5, 4.4, 4.4]
+    )
+    np.testing.assert_array_equal(
+        rates.lookup(pd.Series(["usd", "eur", None]), days[1:4]), [np.nan, 1.0, np.nan]
+    )
+    with pytest.raises(ValueError, match="CHF"):
+        rates.lookup("CHF", days)
+
+
+def test_load_rates_parses_the_source_only_when_it_changed(
+    source: Path, tmp_path: Path, mocker: MockerFixture
+):
+    cache_path = tmp_path / "rates.npz"
+    read = mocker.spy(currency, "_read_ecb_rates")
+
+    first = load_rates(source, cache_path)
+    clear_rate_cache()
+    second = load_rates(source, cache_path)
+    assert read.call_count == 1
+    assert second.currencies == first.currencies and second.start == first.start
+    np.testing.assert_array_equal(second.rates, first.rates)
+    assert load_rates(source, cache_path) is second
+
+    source.write_text(ECB_CSV.replace("4.4", "4.3"))
+    assert load_rates(source, cache_path).rates[1, -1] == 4.3
+    assert read.call_count == 2
+
+
+def test_convert_currency_returns_a_new_frame(source: Path):
+    rates = load_rates(source, cache_path=None)
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2024-01-05 12:30", "2024-01-07 00:00", "2024-01-08 23:59"]),
+            "amount": [45.0, -9.0, 11.0],
+            "currency": ["PLN", "PLN", "USD"],
+        }
+    )
+    original = df.copy()
+
+    result = convert_currency(df, Currency.GBP, rates=rates)
+
+    assert_frame_equal(df, original)
+    assert_series_equal(result["amount"], pd.Series([9.0, -1.8, 8.0], name="amount"))
+    assert (result["currency"] == "GBP").all()
+
+
+def test_convert_to_all_adds_a_column_per_currency(source: Path):
+    rates = load_rates(source, cache_path=None)
+    df = pd.DataFrame(
+        {"date": pd.to_datetime(["2024-01-05"]), "amount": [90.0], "currency": ["GBP"]}
+    )
+
+    result = convert_to_all(df, rates=rates)
+
+    assert_frame_equal(
+        result,
+        df.assign(amount_pln=[450.0], amount_gbp=[90.0], amount_eur=[100.0]),
+        check_exact=False,
+    )
+
+
+def test_convert_currency_converts_minor_units(source: Path):
+    rates = load_rates(source, cache_path=None)
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2024-01-05", "2024-01-05", "2023-12-31"]),
+            "amount": pd.array([1000, 333, 100], dtype="Int64"),
+            "currency": ["PLN", "PLN", "PLN"],
+        }
+    )
+
+    result = convert_currency(df, Currency.EUR, rates=rates)
+
+    assert result["amount"].tolist() == [222, 74, pd.NA]
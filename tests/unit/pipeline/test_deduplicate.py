@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from budgething.pipeline.pretransform.deduplicate import (
+    FingerprintSet,
+    drop_duplicate_transactions,
+)
+
+
+def statement(source: str, rows: list[tuple[str, float, float]]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime([date for date, _, _ in rows]),
+            "amount": [amount for _, amount, _ in rows],
+            "balance": [balance for _, _, balance in rows],
+            "currency": "GBP",
+            "account": "revolut",
+            "source": Path(source),
+            "line_number": range(len(rows)),
+        }
+    )
+
+
+JAN_JUN = statement(
+    "jan-jun.csv",
+    [("2024-01-05", -5.0, 95.0), ("2024-03-01", -10.0, 85.0), ("2024-06-01", 100.0, 185.0)],
+)
+MAR_SEP = statement(
+    "mar-sep.csv",
+    [("2024-03-01", -10.0, 85.0), ("2024-06-01", 100.0, 185.0), ("2024-09-01", -1.0, 184.0)],
+)
+
+
+def test_drop_duplicate_transactions_across_overlapping_exports():
+    result = drop_duplicate_transactions(pd.concat([JAN_JUN, MAR_SEP], ignore_index=True))
+    assert result["amount"].tolist() == [-5.0, -10.0, 100.0, -1.0]
+    assert result["source"].tolist() == [Path("jan-jun.csv")] * 3 + [Path("mar-sep.csv")]
+
+
+def test_drop_duplicate_transactions_keeps_repeated_rows_within_a_file():
+    data = statement("a.csv", [("2024-01-05", -5.0, np.nan), ("2024-01-05", -5.0, np.nan)])
+    overlapping = statement("b.csv", [("2024-01-05", -5.0, np.nan)])
+
+    seen = FingerprintSet()
+    assert len(drop_duplicate_transactions(data, seen)) == 2
+    assert drop_duplicate_transactions(overlapping, seen).empty
+
+
+def test_drop_duplicate_transactions_with_persisted_fingerprints(tmp_path: Path):
+    seen = FingerprintSet(tmp_path / "fingerprints.npy")
+    assert_frame_equal(drop_duplicate_transactions(JAN_JUN, seen), JAN_JUN)
+    seen.save()
+
+    seen = FingerprintSet(tmp_path / "fingerprints.npy")
+    assert len(seen) == 3
+    assert drop_duplicate_transactions(MAR_SEP, seen)["amount"].tolist() == [-1.0]
+    assert len(seen) == 4
+
+
+def test_fingerprint_set_contains():
+    seen = FingerprintSet()
+    seen.add(np.array([5, 1, 9, 5], dtype=np.uint64))
+    assert seen.contains(np.array([0, 1, 5, 7, 9, 10], dtype=np.uint64)).tolist() == [
+        False,
+        True,
+        True,
+        False,
+        True,
+        False,
+    ]
+
+
+def test_fingerprint_set_buffers_small_batches_until_save(tmp_path: Path):
+    seen = FingerprintSet(tmp_path / "fingerprints.npy")
+    seen.add(np.arange(0, 200, 2, dtype=np.uint64))
+    history = seen._fingerprints
+
+    seen.add(np.array([3, 2, 7], dtype=np.uint64))
+
+    assert seen._fingerprints is history
+    assert len(seen) == 102
+    assert seen.contains(np.array([2, 3, 5, 7], dtype=np.uint64)).tolist() == [
+        True,
+        True,
+        False,
+        True,
+    ]
+    seen.save()
+    reloaded = np.load(tmp_path / "fingerprints.npy")
+    assert len(reloaded) == 102
+    assert (np.diff(reloaded.astype(np.int64)) > 0).all()
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pandas as pd
+
+from budgething.data_io.csv_data_reader import CSVDataReader, CSVFile
+from budgething.pipeline.dispatch import dispatch_files
+
+
+def foo_parser(data: pd.DataFrame) -> pd.DataFrame:
+    return data
+
+
+def bar_parser(data: pd.DataFrame) -> pd.DataFrame:
+    return data
+
+
+REGISTRY = [({"foo", "common"}, foo_parser), ({"bar", "common"}, bar_parser)]
+
+
+def test_dispatch_files_routes_each_file_once(tmp_path: Path):
+    files = {
+        "a_foo.csv": "foo,common,extra\n1,2,3",
+        "b_bar.csv": "bar;common\n1;2",
+        "c_both.csv": "foo,bar,common\n1,2,3",
+        "d_none.csv": "common\n1",
+        "e_foo.csv": " foo , common\n1,2",
+    }
+    for name, content in files.items():
+        (tmp_path / name).write_text(content, encoding="utf-8")
+
+    result = dispatch_files(
+        CSVDataReader(tmp_path, schema=None, skip_hashes=set()).files, REGISTRY
+    )
+
+    def names(csv_files: list[CSVFile]) -> list[str]:
+        return [f.filepath.name for f in csv_files]
+
+    assert list(result.routed) == [foo_parser, bar_parser]
+    assert names(result.routed[foo_parser]) == ["a_foo.csv", "e_foo.csv"]
+    assert names(result.routed[bar_parser]) == ["b_bar.csv"]
+    assert names(result.ambiguous) == ["c_both.csv"]
+    assert names(result.unmatched) == ["d_none.csv"]
+
+
+def test_dispatch_files_treats_unreadable_header_as_unmatched(tmp_path: Path):
+    (tmp_path / "empty.csv").write_text("", encoding="utf-8")
+    result = dispatch_files([CSVFile(tmp_path / "empty.csv")], REGISTRY)
+    assert result.routed == {}
+    assert [f.filepath.name for f in result.unmatched] == ["empty.csv"]
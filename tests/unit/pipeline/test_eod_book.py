@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import pandas as pd
+from pandas.testing import assert_series_equal
+import pytest
+from pytest_mock import MockerFixture
+
+from budgething.data_io import snapshot
+from budgething.pipeline.process import eod_book
+from budgething.pipeline.process.eod_book import EODBalanceBook, EODCheckpoint
+from budgething.pipeline.transform.amount import aggregate_daily_net_amounts
+from budgething.pipeline.transform.balance import update_eod_balance
+
+
+def transactions(rows: dict[str, int], dtype: str = "float64") -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(list(rows), format="ISO8601"),
+            "amount": pd.array(list(rows.values()), dtype=dtype),
+        }
+    )
+
+
+def eod(values: list, start: str, dtype: str = "float64") -> pd.Series:
+    days = pd.date_range(start, periods=len(values), freq="D", name="date")
+    return pd.Series(values, index=days, dtype=dtype, name="eod_balance")
+
+
+def test_update_eod_balance_extends_and_shifts():
+    eod_balance = eod([90.0, 100.0, 100.0], "2024-01-02")
+    new = transactions({"2024-01-03 10:00": 5, "2024-01-01": -1, "2024-01-06": 7})
+
+    updated = update_eod_balance(eod_balance, aggregate_daily_net_amounts(new))
+
+    assert_series_equal(
+        updated, eod([85.0, 85.0, 100.0, 100.0, 100.0, 107.0], "2024-01-01"), check_freq=False
+    )
+
+
+def test_rebuild_stores_balance_from_the_day_before_the_first_transaction(tmp_path: Path):
+    book = EODBalanceBook(tmp_path)
+
+    eod_balance = book.rebuild("bank", transactions({"2024-01-02": 10, "2024-01-04": -5}), 100)
+
+    expected = eod([95.0, 105.0, 105.0, 100.0], "2024-01-01")
+    assert_series_equal(eod_balance, expected, check_freq=False)
+    assert_series_equal(book.get("bank"), expected, check_freq=False)
+    assert EODBalanceBook(tmp_path).checkpoint("bank") == EODCheckpoint(
+        pd.Timestamp("2024-01-04"), 100.0
+    )
+
+
+def test_update_only_computes_new_days(tmp_path: Path, mocker: MockerFixture):
+    book = EODBalanceBook(tmp_path)
+    book.rebuild("bank", transactions({"2024-01-02": 10}, dtype="Int64"), 100)
+    spies = [
+        mocker.spy(eod_book, "read_snapshot"),
+        mocker.spy(eod_book, "write_snapshot"),
+        mocker.spy(snapshot, "read_snapshot"),
+        mocker.spy(snapshot, "write_snapshot"),
+    ]
+
+    changed = book.update("bank", transactions({"2024-01-05": 3, "2024-01-03": -1}, "Int64"))
+
+    for spy in spies:
+        spy.assert_not_called()
+    assert_series_equal(changed, eod([99, 99, 102], "2024-01-03", "Int64"), check_freq=False)
+    assert book.get("bank").tolist() == [90, 100, 99, 99, 102]
+    assert EODBalanceBook(tmp_path).checkpoint("bank") == EODCheckpoint(
+        pd.Timestamp("2024-01-05"), 102
+    )
+
+
+def test_update_shifts_days_before_back_dated_transactions(tmp_path: Path):
+    book = EODBalanceBook(tmp_path)
+    book.rebuild("bank", transactions({"2024-01-02": 10, "2024-01-04": -5}), 100)
+
+    changed = book.update("bank", transactions({"2024-01-03": 20, "2024-01-05": 1}))
+
+    assert book.get("bank").tolist() == [75.0, 85.0, 105.0, 100.0, 101.0]
+    assert changed.tolist() == [75.0, 85.0, 101.0]
+    assert book.checkpoint("bank") == EODCheckpoint(pd.Timestamp("2024-01-05"), 101.0)
+
+
+def test_update_of_an_unknown_account_raises(tmp_path: Path):
+    with pytest.raises(KeyError):
+        EODBalanceBook(tmp_path).update("bank", transactions({"2024-01-02": 10}))
@@ -0,0 +1,169 @@
+import logging
+from pathlib import Path
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+from pytest_mock import MockerFixture
+
+from budgething.data_io.csv_data_reader import CSVDataReader
+from budgething.data_io.manifest import FileManifest
+from budgething.data_io.parquet_store import ParquetTransactionStore
+from budgething.data_io.snapshot import read_snapshot
+from budgething.pipeline.ingest import Ingestor
+from budgething.pipeline.models import Currency
+from budgething.pipeline.process.aggregate_cube import AggregateCube, Period
+from budgething.pipeline.process.eod_book import EODBalanceBook
+from budgething.pipeline.pretransform.deduplicate import FingerprintSet
+from budgething.pipeline.transform.currency import RateMatrix
+from tests.conftest import RESOURCES_ROOT
+
+SAMPLE_INPUT = RESOURCES_ROOT / "acceptance" / "sample_csv_statements" / "input"
+REVOLUT_SAMPLE = "revolut-gbp-sample_2024-04-30_2024-05-07.csv"
+
+
+def create_ingestor(root: Path) -> Ingestor:
+    return Ingestor(
+        manifest=FileManifest(root / "manifest.json"),
+        store=ParquetTransactionStore(root / "store"),
+        fingerprints=FingerprintSet(root / "fingerprints.npy"),
+        snapshot_path=root / "snapshots",
+    )
+
+
+@pytest.fixture(name="ingestor")
+def fixture_ingestor(tmp_path: Path) -> Ingestor:
+    return create_ingestor(tmp_path)
+
+
+def test_ingest_only_adds_new_transactions(tmp_path: Path, ingestor: Ingestor):
+    input_dir = tmp_path / "input"
+    shutil.copytree(SAMPLE_INPUT, input_dir)
+    reader = CSVDataReader(input_dir, schema=None, skip_hashes=set(), manifest=ingestor.manifest)
+
+    assert len(ingestor.ingest(reader.files)) == 27
+    assert ingestor.ingest(reader.files).empty
+
+    overlapping = input_dir / "revolut-overlapping.csv"
+    content = (SAMPLE_INPUT / REVOLUT_SAMPLE).read_text(encoding="utf-8")
+    overlapping.write_text(
+        f"{content}\nTRANSFER, Current, 2024-05-08 10:00:00, 2024-05-08 10:00:01, x, -1.00, "
+        "0.00, GBP, COMPLETED, 1.00",
+        encoding="utf-8",
+    )
+    new = ingestor.ingest(reader.files_from([overlapping]))
+
+    assert new["amount"].tolist() == [-1.0]
+    assert len(ingestor.store.get_all()) == 28
+    assert len(read_snapshot(ingestor.snapshot_path, "transactions")) == 28
+
+
+def test_ingest_updates_rebuilt_eod_balances(tmp_path: Path, ingestor: Ingestor):
+    ingestor.eod_balances = EODBalanceBook(ingestor.snapshot_path)
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    shutil.copy(SAMPLE_INPUT / REVOLUT_SAMPLE, input_dir)
+    reader = CSVDataReader(input_dir, schema=None, skip_hashes=set(), manifest=ingestor.manifest)
+    history = ingestor.ingest(reader.files)
+    ingestor.eod_balances.rebuild("revolut", history, latest_balance=100.0)
+
+    overlapping = input_dir / "revolut-overlapping.csv"
+    content = (SAMPLE_INPUT / REVOLUT_SAMPLE).read_text(encoding="utf-8")
+    overlapping.write_text(
+        f"{content}\nTRANSFER, Current, 2024-05-09 10:00:00, 2024-05-09 10:00:01, x, -1.00, "
+        "0.00, GBP, COMPLETED, 1.00",
+        encoding="utf-8",
+    )
+    ingestor.ingest(reader.files_from([overlapping]))
+
+    assert ingestor.eod_balances.get("revolut").iloc[-3:].tolist() == [100.0, 100.0, 99.0]
+
+
+def test_ingest_seeds_eod_balances_of_accounts_with_a_latest_balance(
+    tmp_path: Path, ingestor: Ingestor
+):
+    ingestor.eod_balances = EODBalanceBook(
+        ingestor.snapshot_path, {"revolut": 100.0, "pekao24": 5.0}
+    )
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    shutil.copy(SAMPLE_INPUT / REVOLUT_SAMPLE, input_dir)
+    reader = CSVDataReader(input_dir, schema=None, skip_hashes=set(), manifest=ingestor.manifest)
+    ingestor.ingest(reader.files)
+
+    assert "revolut" in ingestor.eod_balances
+    assert "pekao24" not in ingestor.eod_balances
+    assert ingestor.eod_balances.get("revolut").iloc[-1] == 100.0
+
+    overlapping = input_dir / "revolut-overlapping.csv"
+    content = (SAMPLE_INPUT / REVOLUT_SAMPLE).read_text(encoding="utf-8")
+    overlapping.write_text(
+        f"{content}\nTRANSFER, Current, 2024-05-09 10:00:00, 2024-05-09 10:00:01, x, -1.00, "
+        "0.00, GBP, COMPLETED, 1.00",
+        encoding="utf-8",
+    )
+    ingestor.ingest(reader.files_from([overlapping]))
+
+    assert ingestor.eod_balances.get("revolut").iloc[-3:].tolist() == [100.0, 100.0, 99.0]
+
+
+def test_ingest_builds_then_updates_the_aggregate_cube(tmp_path: Path, ingestor: Ingestor):
+    rates = RateMatrix(("GBP", "EUR"), np.datetime64("2024-04-01"), np.ones((2, 60)))
+    ingestor.cube = AggregateCube(ingestor.snapshot_path, Currency.GBP, rates=rates)
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    shutil.copy(SAMPLE_INPUT / REVOLUT_SAMPLE, input_dir)
+    reader = CSVDataReader(input_dir, schema=None, skip_hashes=set(), manifest=ingestor.manifest)
+    history = ingestor.ingest(reader.files)
+
+    assert ingestor.cube.built
+    assert ingestor.cube.query(Period.MONTH)["count"].sum() == len(history)
+
+    overlapping = input_dir / "revolut-overlapping.csv"
+    content = (SAMPLE_INPUT / REVOLUT_SAMPLE).read_text(encoding="utf-8")
+    overlapping.write_text(
+        f"{content}\nTRANSFER, Current, 2024-05-09 10:00:00, 2024-05-09 10:00:01, x, -1.00, "
+        "0.00, GBP, COMPLETED, 1.00",
+        encoding="utf-8",
+    )
+    ingestor.ingest(reader.files_from([overlapping]))
+
+    daily = ingestor.cube.query(Period.DAY, start="2024-05-09")
+    assert daily["amount"].tolist() == [-1.0]
+    assert ingestor.cube.query(Period.MONTH)["count"].sum() == len(history) + 1
+
+
+def test_ingest_finds_no_balance_breaks_in_the_sample(
+    tmp_path: Path, ingestor: Ingestor, caplog: pytest.LogCaptureFixture
+):
+    input_dir = tmp_path / "input"
+    shutil.copytree(SAMPLE_INPUT, input_dir)
+    reader = CSVDataReader(input_dir, schema=None, skip_hashes=set(), manifest=ingestor.manifest)
+
+    with caplog.at_level(logging.WARNING):
+        assert len(ingestor.ingest(reader.files)) == 27
+
+    assert caplog.records == []
+
+
+def test_ingest_saves_fingerprints_and_manifest_before_refreshing(
+    tmp_path: Path, mocker: MockerFixture
+):
+    mocker.patch.object(Ingestor, "refresh", side_effect=RuntimeError("refresh failed"))
+    input_dir = tmp_path / "input"
+    shutil.copytree(SAMPLE_INPUT, input_dir)
+
+    def ingest() -> pd.DataFrame:
+        ingestor = create_ingestor(tmp_path)
+        reader = CSVDataReader(
+            input_dir, schema=None, skip_hashes=set(), manifest=ingestor.manifest
+        )
+        return ingestor.ingest(reader.files)
+
+    with pytest.raises(RuntimeError):
+        ingest()
+    mocker.stopall()
+
+    assert ingest().empty
+    assert len(ParquetTransactionStore(tmp_path / "store").get_all()) == 27
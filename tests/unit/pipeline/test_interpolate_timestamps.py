@@ -0,0 +1,57 @@
+import pandas as pd
+
+from budgething.pipeline.pretransform.interpolate_timestamps import (
+    interpolate_timestamps,
+    order_tied_transactions,
+)
+
+T = pd.Timestamp("2024-01-01 10:00")
+
+
+def test_order_tied_transactions_follows_the_balance_chain():
+    data = pd.DataFrame(
+        {
+            "date": [T, T, T, T + pd.Timedelta("1h"), T - pd.Timedelta("1h")],
+            "amount": [5.0, -3.0, 10.0, 1.0, 100.0],
+            "fee": [0.0, 0.0, 0.5, 0.0, 0.0],
+            "balance": [111.5, 106.5, 109.5, 112.5, 100.0],
+            "account": "bank",
+            "currency": "PLN",
+        },
+        index=list("abcde"),
+    )
+
+    assert order_tied_transactions(data).index.tolist() == ["e", "c", "b", "a", "d"]
+
+
+def test_order_tied_transactions_keeps_input_order_without_a_single_chain():
+    data = pd.DataFrame(
+        {
+            "date": [T] * 5,
+            # x -> y -> x is a cycle, and u, v both start at 0.00
+            "amount": [5.0, -5.0, 1.0, 2.0, 7.0],
+            "balance": [5.0, 0.0, 1.0, 2.0, 7.0],
+            "account": ["a", "a", "b", "b", "c"],
+            "currency": "PLN",
+        },
+        index=["x", "y", "u", "v", "w"],
+    )
+
+    assert order_tied_transactions(data).index.tolist() == ["x", "y", "u", "v", "w"]
+
+
+def test_interpolate_timestamps_makes_tied_timestamps_unique():
+    data = pd.DataFrame(
+        {
+            "date": [T, T, T],
+            "amount": pd.array([-300, 1000, 200], dtype="Int64"),
+            "balance": pd.array([700, 1000, 900], dtype="Int64"),
+            "account": ["bank", "bank", "other"],
+            "currency": "PLN",
+        }
+    )
+
+    result = interpolate_timestamps(data)
+
+    assert result.index.tolist() == [1, 0, 2]
+    assert result["date"].tolist() == [T, T + pd.Timedelta(1, "us"), T]
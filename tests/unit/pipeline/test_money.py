@@ -0,0 +1,37 @@
+import pandas as pd
+from pandas.testing import assert_series_equal
+
+from budgething.pipeline.money import from_minor_units, minor_unit_digits, to_minor_units
+from budgething.pipeline.process.eod_balance import get_eod_balance_from_latest_balance
+
+
+def test_minor_unit_digits():
+    assert minor_unit_digits("pln") == 2
+    assert minor_unit_digits(pd.Series(["PLN", "JPY", "KWD"])).tolist() == [2, 0, 3]
+
+
+def test_minor_units_round_trip():
+    amounts = pd.Series([0.1, 0.2, -1234.56, 1500.0])
+    currency = pd.Series(["PLN", "PLN", "GBP", "JPY"])
+
+    minor = to_minor_units(amounts, currency)
+
+    assert minor.tolist() == [10, 20, -123456, 1500]
+    assert from_minor_units(minor, currency).tolist() == amounts.tolist()
+
+
+def test_eod_balance_from_minor_units_stays_exact():
+    data = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2024-01-01 10:00", "2024-01-01 12:00", "2024-01-03 09:00"]),
+            "amount": pd.array([10, -3, 5], dtype="Int64"),
+        }
+    )
+
+    expected = pd.Series(
+        pd.array([95, 95, 100], dtype="Int64"),
+        index=pd.date_range("2024-01-01", periods=3, name="date"),
+        name="eod_balance",
+    )
+    result = get_eod_balance_from_latest_balance(data, latest_balance=100)
+    assert_series_equal(result, expected, check_freq=False)
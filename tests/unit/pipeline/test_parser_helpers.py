@@ -0,0 +1,104 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+import pytest
+from pytest_mock import MockerFixture
+
+from budgething.pipeline.parsers import helpers
+from budgething.pipeline.parsers.helpers import (
+    AmountFormat,
+    clear_date_cache,
+    get_date,
+    invalid_cells,
+    parse_amounts,
+    parse_dates,
+)
+
+
+def test_get_date_takes_earliest_non_missing_date_per_row():
+    data = pd.DataFrame(
+        {
+            "Data waluty": ["01.05.2025", "21.05.2025", np.nan, np.nan],
+            "Data księgowania": ["02.05.2025", "11.05.2025", "03.05.2025", np.nan],
+        },
+        index=[3, 5, 7, 9],
+    )
+
+    expected = pd.Series(
+        [datetime(2025, 5, 1), datetime(2025, 5, 11), datetime(2025, 5, 3), pd.NaT],
+        index=[3, 5, 7, 9],
+        dtype="datetime64[ns]",
+    )
+    assert get_date(data, "%d.%m.%Y").equals(expected)
+
+
+def test_parse_dates_parses_each_distinct_string_once(mocker: MockerFixture):
+    clear_date_cache()
+    to_datetime = mocker.spy(helpers.pd, "to_datetime")
+
+    first = parse_dates(pd.Series(["2024-01-02", "2024-01-01", "2024-01-02"]), "%Y-%m-%d")
+    second = parse_dates(pd.Series(["2024-01-01", "2024-01-03"]), "%Y-%m-%d")
+
+    np.testing.assert_array_equal(
+        first, np.array(["2024-01-02", "2024-01-01", "2024-01-02"], dtype="datetime64[ns]")
+    )
+    np.testing.assert_array_equal(
+        second, np.array(["2024-01-01", "2024-01-03"], dtype="datetime64[ns]")
+    )
+    parsed = [list(call.args[0]) for call in to_datetime.call_args_list[:2]]
+    assert parsed == [["2024-01-02", "2024-01-01"], ["2024-01-03"]]
+
+
+@pytest.mark.parametrize(
+    "fmt,values,expected",
+    [
+        (AmountFormat(), ["1 234.56", "-1234.56", "+0.50", "0"], [1234.56, -1234.56, 0.5, 0.0]),
+        (
+            AmountFormat(decimal=","),
+            ["-235,62", "1 234,56", "12 000,00", "0,00"],
+            [-235.62, 1234.56, 12000.0, 0.0],
+        ),
+        (
+            AmountFormat(decimal=",", grouping=".", trailing_minus=True),
+            ["1.234,56-", "7,00"],
+            [-1234.56, 7.0],
+        ),
+        (AmountFormat(parentheses=True), ["(12.00)", "3.50"], [-12.0, 3.5]),
+    ],
+)
+def test_parse_amounts(fmt: AmountFormat, values: list[str], expected: list[float]):
+    assert parse_amounts(pd.Series(values), fmt).tolist() == expected
+
+
+def test_parse_amounts_turns_bad_cells_into_nan_and_reports_them():
+    data = pd.DataFrame(
+        {
+            "Amount": ["1.50", "n/a", np.nan, "2..0"],
+            "source": ["a.csv"] * 4,
+            "line_number": [2, 3, 4, 5],
+        }
+    )
+
+    parsed = parse_amounts(data["Amount"])
+
+    assert parsed.isna().tolist() == [False, True, True, True]
+    expected = pd.DataFrame(
+        {"column": ["Amount", "Amount"], "value": ["n/a", "2..0"]},
+        index=pd.MultiIndex.from_tuples(
+            [("a.csv", 3), ("a.csv", 5)], names=["source", "line_number"]
+        ),
+    )
+    assert_frame_equal(invalid_cells(data, {"Amount": parsed}), expected)
+    assert invalid_cells(data.iloc[:1], {"Amount": parsed.iloc[:1]}).empty
+
+
+def test_parse_amounts_into_minor_units():
+    values = pd.Series(["-235,62", "1 234,5", "12", "n/a", np.nan, "0,005", "1500"])
+    digits = pd.Series([2, 2, 2, 2, 2, 2, 0])
+
+    parsed = parse_amounts(values, AmountFormat(decimal=","), digits=digits)
+
+    assert parsed.dtype == "Int64"
+    assert parsed.tolist() == [-23562, 123450, 1200, pd.NA, pd.NA, 1, 1500]
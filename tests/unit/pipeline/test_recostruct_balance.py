@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import pandas as pd
+
+from budgething.data_io.csv_data_reader import CSVFile, read_csv_files
+from budgething.data_io.parquet_store import ParquetTransactionStore
+from budgething.pipeline.parsers.registry import PARSER_READ_SPECS
+from budgething.pipeline.parsers.revolut import _map_revolut_data
+from budgething.pipeline.pretransform.recostruct_balance import find_balance_breaks
+from budgething.pipeline.process.eod_balance import get_eod_balance_from_known_balance
+from tests.conftest import RESOURCES_ROOT
+
+SAMPLE_INPUT = RESOURCES_ROOT / "acceptance" / "sample_csv_statements" / "input"
+
+T = pd.Timestamp("2024-01-01 10:00")
+
+
+def transactions(amounts: list, balances: list, dtype: str = "float64") -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "date": [T + pd.Timedelta(hours=i) for i in range(len(amounts))],
+            "amount": pd.array(amounts, dtype=dtype),
+            "balance": pd.array(balances, dtype=dtype),
+            "account": "bank",
+            "currency": "GBP",
+            "source": "statement.csv",
+            "line_number": range(len(amounts)),
+        }
+    )
+
+
+def test_find_balance_breaks_reports_rows_by_source_and_line():
+    data = transactions([10.0, -2.5, 4.0, 1.0], [10.0, 7.5, 12.0, 13.0])
+
+    breaks = find_balance_breaks(data)
+
+    assert breaks.index.tolist() == [("statement.csv", 2)]
+    assert breaks["expected_balance"].tolist() == [11.5]
+
+
+def test_find_balance_breaks_checks_every_account_and_currency_separately():
+    data = pd.concat(
+        [
+            transactions([1.0, 1.0], [1.0, 2.0]),
+            transactions([5.0, 1.0], [50.0, 51.0]).assign(currency="EUR"),
+        ]
+    ).sample(frac=1, random_state=0)
+
+    assert find_balance_breaks(data).empty
+
+
+def test_find_balance_breaks_accounts_for_fees_and_minor_units():
+    data = transactions([1000, -250, 100], [1000, 700, 801], dtype="Int64").assign(
+        fee=pd.array([0, 50, 0], dtype="Int64")
+    )
+
+    breaks = find_balance_breaks(data)
+
+    assert breaks.index.tolist() == [("statement.csv", 2)]
+    assert breaks["expected_balance"].tolist() == [800]
+
+
+def test_find_balance_breaks_resolves_tied_timestamps():
+    data = transactions([10.0, 3.0, -1.0], [10.0, 12.0, 9.0]).assign(date=T)
+
+    assert find_balance_breaks(data).empty
+    assert get_eod_balance_from_known_balance(data).tolist() == [12.0]
+
+
+def test_find_balance_breaks_without_balances():
+    data = transactions([1.0], [None]).drop(columns="balance")
+
+    assert find_balance_breaks(data).empty
+
+
+def test_find_balance_breaks_orders_by_balance_date():
+    data = transactions([-4.0, -1.0, -2.0], [10.0, 7.0, 8.0]).assign(
+        balance_date=[T, T + pd.Timedelta(days=1), T + pd.Timedelta(hours=1)]
+    )
+
+    assert find_balance_breaks(data).empty
+    assert find_balance_breaks(data.drop(columns="balance_date")).index.tolist() == [
+        ("statement.csv", 1),
+        ("statement.csv", 2),
+    ]
+
+
+def test_find_balance_breaks_accepts_fees_charged_apart():
+    data = transactions([10.0, -4.0, -1.0], [10.0, 6.0, 4.5]).assign(fee=[0.0, 2.5, 0.5])
+
+    assert find_balance_breaks(data).empty
+
+
+def test_eod_balance_of_the_sample_follows_completion_dates(tmp_path: Path):
+    files = [CSVFile(SAMPLE_INPUT / "revolut-gbp-sample_2024-04-30_2024-05-07.csv")]
+    data = read_csv_files(
+        files, add_meta=True, strip=True, spec=PARSER_READ_SPECS[_map_revolut_data]
+    )
+    store = ParquetTransactionStore(tmp_path / "store")
+    store.create(_map_revolut_data(data))
+
+    eod_balance = get_eod_balance_from_known_balance(store.get_all())
+
+    assert eod_balance.index.strftime("%Y-%m-%d").tolist() == [
+        f"2024-05-0{day}" for day in range(1, 8)
+    ]
+    assert eod_balance.tolist() == [859.12, 777.88, 772.45, 768.76, 731.28, 719.89, 674.89]
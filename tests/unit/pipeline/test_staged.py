@@ -0,0 +1,129 @@
+import asyncio
+from pathlib import Path
+import shutil
+import time
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+import pytest
+from pytest_mock import MockerFixture
+
+from budgething.data_io.csv_data_reader import CSVDataReader, CSVFile
+from budgething.data_io.manifest import FileManifest
+from budgething.data_io.parquet_store import ParquetTransactionStore
+from budgething.pipeline.ingest import Ingestor
+from budgething.pipeline.pretransform.deduplicate import FingerprintSet
+from budgething.pipeline.staged import StageConcurrency, run_staged_ingest
+from tests.conftest import RESOURCES_ROOT
+
+SAMPLE_INPUT = RESOURCES_ROOT / "acceptance" / "sample_csv_statements" / "input"
+REVOLUT_SAMPLE = SAMPLE_INPUT / "revolut-gbp-sample_2024-04-30_2024-05-07.csv"
+
+
+def create_ingestor(root: Path) -> Ingestor:
+    return Ingestor(
+        manifest=FileManifest(root / "manifest.json"),
+        store=ParquetTransactionStore(root / "store"),
+        fingerprints=FingerprintSet(root / "fingerprints.npy"),
+        snapshot_path=root / "snapshots",
+    )
+
+
+def read_files(ingestor: Ingestor) -> list:
+    return CSVDataReader(
+        SAMPLE_INPUT, schema=None, skip_hashes=set(), manifest=ingestor.manifest
+    ).files
+
+
+@pytest.mark.parametrize(
+    "concurrency",
+    [StageConcurrency(), StageConcurrency(read=1, parse=1, queue_size=1)],
+    ids=["default", "serial"],
+)
+def test_run_staged_ingest_matches_serial_ingest(tmp_path: Path, concurrency: StageConcurrency):
+    serial = create_ingestor(tmp_path / "serial")
+    staged = create_ingestor(tmp_path / "staged")
+    files = read_files(staged)
+
+    serial.ingest(read_files(serial))
+    new = asyncio.run(run_staged_ingest(staged, files, concurrency))
+
+    assert len(new) == 27
+    assert_frame_equal(staged.store.get_all(), serial.store.get_all())
+    assert staged.manifest.ingested_hashes == {f.sha256 for f in files}
+
+
+def test_run_staged_ingest_keeps_the_copies_serial_ingest_keeps(
+    tmp_path: Path, mocker: MockerFixture
+):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    content = REVOLUT_SAMPLE.read_text(encoding="utf-8")
+    # Both exports overlap the original, and the first one is the slowest to read
+    (input_dir / "a.csv").write_text(content, encoding="utf-8")
+    (input_dir / "b.csv").write_text(content, encoding="utf-8")
+    (input_dir / "c.csv").write_text(
+        f"{content}\nTRANSFER, Current, 2024-05-09 10:00:00, 2024-05-09 10:00:01, x, -1.00, "
+        "0.00, GBP, COMPLETED, 1.00",
+        encoding="utf-8",
+    )
+    read = CSVFile.read
+
+    def slow_read(self: CSVFile, **kwargs):
+        if self.filepath.name == "a.csv":
+            time.sleep(0.2)
+        return read(self, **kwargs)
+
+    mocker.patch.object(CSVFile, "read", slow_read)
+    serial = create_ingestor(tmp_path / "serial")
+    staged = create_ingestor(tmp_path / "staged")
+
+    serial.ingest(CSVDataReader(input_dir, schema=None, skip_hashes=set()).files)
+    new = asyncio.run(
+        run_staged_ingest(
+            staged,
+            CSVDataReader(input_dir, schema=None, skip_hashes=set()).files,
+            StageConcurrency(read=3, parse=2, queue_size=1),
+        )
+    )
+
+    def ordered(data: pd.DataFrame) -> pd.DataFrame:
+        return data.sort_values(["date", "source", "line_number"], ignore_index=True)
+
+    assert new["source"].str.endswith("a.csv").sum() == len(new) - 1
+    assert_frame_equal(ordered(staged.store.get_all()), ordered(serial.store.get_all()))
+
+
+def test_run_staged_ingest_finishes_stored_files_when_one_fails(tmp_path: Path):
+    input_dir = tmp_path / "input"
+    shutil.copytree(SAMPLE_INPUT, input_dir)
+    header, first, *_ = REVOLUT_SAMPLE.read_text(encoding="utf-8").splitlines()
+    (input_dir / "zz-bad.csv").write_text(
+        "\n".join([header, first.replace("2024-04-30", "garbage", 1)]), encoding="utf-8"
+    )
+
+    for _ in range(2):
+        ingestor = create_ingestor(tmp_path)
+        files = CSVDataReader(
+            input_dir, schema=None, skip_hashes=set(), manifest=ingestor.manifest
+        ).files
+        with pytest.raises(ExceptionGroup):
+            asyncio.run(run_staged_ingest(ingestor, files, StageConcurrency(1, 1, 1)))
+
+        stored = ingestor.store.get_all()
+        assert not stored.empty
+        assert not stored.duplicated(["source", "line_number"]).any()
+        assert len(FingerprintSet(tmp_path / "fingerprints.npy")) == len(stored)
+
+
+@pytest.mark.parametrize(
+    "concurrency",
+    [StageConcurrency(read=0), StageConcurrency(parse=0), StageConcurrency(queue_size=0)],
+)
+def test_run_staged_ingest_rejects_stages_without_room(
+    tmp_path: Path, concurrency: StageConcurrency
+):
+    ingestor = create_ingestor(tmp_path)
+
+    with pytest.raises(ValueError):
+        asyncio.run(run_staged_ingest(ingestor, read_files(ingestor), concurrency))
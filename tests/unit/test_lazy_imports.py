@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+LAZY_MODULES = [
+    "colorama",
+    "currency_converter",
+    "dash",
+    "pdfplumber",
+    "budgething.pipeline.parsers.pekao24",
+    "budgething.pipeline.parsers.revolut",
+]
+
+
+def imported_modules(code: str) -> set[str]:
+    """Modules of `LAZY_MODULES` that running `code` in a fresh interpreter imports."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys\n{code}\nprint(*(m for m in {LAZY_MODULES!r} if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_importing_the_cli_leaves_heavy_dependencies_unimported():
+    assert imported_modules("import budgething.runner") == set()
+
+
+def test_parsers_are_imported_on_first_dispatch():
+    code = "from budgething.pipeline.dispatch import dispatch_files\ndispatch_files([])"
+
+    assert imported_modules(code) == {
+        "budgething.pipeline.parsers.pekao24",
+        "budgething.pipeline.parsers.revolut",
+    }
@@ -0,0 +1,92 @@
+import logging
+from pathlib import Path
+import shutil
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from budgething import runner
+from budgething.data_io.manifest import FileManifest
+from budgething.data_io.parquet_store import ParquetTransactionStore
+from budgething.pipeline.process.eod_book import EODBalanceBook
+from budgething.pipeline.transform import currency
+from budgething.pipeline.transform.currency import RateMatrix
+from tests.conftest import RESOURCES_ROOT
+
+SAMPLE_INPUT = RESOURCES_ROOT / "acceptance" / "sample_csv_statements" / "input"
+REVOLUT_SAMPLE = SAMPLE_INPUT / "revolut-gbp-sample_2024-04-30_2024-05-07.csv"
+
+
+class FakeWatcher:
+    """Stands in for `DirectoryWatcher`, dropping one file into the directory per batch."""
+
+    files: list[tuple[str, str]] = []
+
+    def __init__(self, directory: Path, **kwargs):
+        self.directory = directory
+
+    def batches(self, stop=None):
+        for name, content in self.files:
+            (path := self.directory / name).write_text(content, encoding="utf-8")
+            yield {path}
+
+    def __enter__(self) -> "FakeWatcher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+@pytest.fixture(name="paths")
+def fixture_paths(tmp_path: Path, mocker: MockerFixture) -> dict[str, Path]:
+    # Flat rates from 2024 on, so nothing is written to the real rate cache
+    rates = RateMatrix(("PLN", "GBP", "EUR"), np.datetime64("2024-01-01"), np.ones((3, 1000)))
+    mocker.patch.object(currency, "load_rates", return_value=rates)
+    input_dir = tmp_path / "input"
+    shutil.copytree(SAMPLE_INPUT, input_dir)
+    return {
+        "csvdir": input_dir,
+        "manifest_path": tmp_path / "manifest.json",
+        "store_path": tmp_path / "store",
+        "fingerprints_path": tmp_path / "fingerprints.npy",
+        "snapshot_path": tmp_path / "snapshots",
+        "pdf_cache_path": tmp_path / "pdf_cache",
+    }
+
+
+def test_main_reports_unreadable_statements_as_unmatched(
+    paths: dict[str, Path], caplog: pytest.LogCaptureFixture
+):
+    (paths["csvdir"] / "empty.csv").write_text("", encoding="utf-8")
+    (paths["csvdir"] / "garbage.csv").write_bytes(b"\xff\xfe\x00garbage\x00\n")
+
+    with caplog.at_level(logging.WARNING):
+        runner.main(**paths)
+
+    assert len(ParquetTransactionStore(paths["store_path"]).get_all()) == 27
+    assert len([message for message in caplog.messages if message.startswith("Skipping")]) == 2
+    assert len(FileManifest(paths["manifest_path"]).ingested_hashes) == 2
+    assert "pekao24" in EODBalanceBook(paths["snapshot_path"])
+
+
+def test_watch_keeps_going_after_a_bad_statement(
+    paths: dict[str, Path], mocker: MockerFixture, caplog: pytest.LogCaptureFixture
+):
+    shutil.rmtree(paths["csvdir"])
+    paths["csvdir"].mkdir()
+    good = REVOLUT_SAMPLE.read_text(encoding="utf-8")
+    header, first, *rest = good.splitlines()
+    bad = "\n".join([header, first.replace("2024-04-30", "garbage", 1)])
+    mocker.patch.object(FakeWatcher, "files", [("bad.csv", bad), ("good.csv", good)])
+    mocker.patch.object(runner, "DirectoryWatcher", FakeWatcher)
+
+    with caplog.at_level(logging.ERROR):
+        runner.watch(**paths)
+
+    assert len(ParquetTransactionStore(paths["store_path"]).get_all()) == len(rest) + 1
+    assert [record.message for record in caplog.records] == [
+        f"Failed to ingest '{paths['csvdir'] / 'bad.csv'}'"
+    ]
+    manifest = FileManifest(paths["manifest_path"])
+    assert len(manifest.ingested_hashes) == 1